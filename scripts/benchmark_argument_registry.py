@@ -0,0 +1,58 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Resolves the registered settings of every argument of every command in the command table and
+reports how long it takes.
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import timeit
+
+parser = argparse.ArgumentParser(description='Argument registry benchmark')
+parser.add_argument('--commands', metavar='N', nargs='+', help='Filter by command scope')
+parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs')
+args = parser.parse_args()
+sys.argv = sys.argv[:1]
+
+# pylint: disable=wrong-import-position
+from azure.cli.core.application import APPLICATION, Configuration
+import azure.cli.core.commands as commands
+
+config = Configuration([])
+APPLICATION.initialize(config)
+command_table = config.get_command_table()
+for command_name in command_table:
+    config.load_params(command_name)
+lookups = [(c, a) for c in sorted(command_table) for a in command_table[c].arguments
+           if not args.commands or c.split()[0] in args.commands]
+
+
+def resolve_all():
+    for command_name, argument_name in lookups:
+        commands._get_cli_argument(command_name, argument_name)  # pylint: disable=protected-access
+
+
+def forget_resolved():
+    # pylint: disable=protected-access
+    registry = commands._cli_argument_registry
+    registry._resolved.clear()
+    scopes = [registry.root]
+    while scopes:
+        scope = scopes.pop()
+        scope.merged.clear()
+        scopes.extend(scope.children.values())
+
+
+print('Resolving {} arguments of {} commands'.format(
+    len(lookups), len(set(c for c, _ in lookups))))
+cold = min(timeit.repeat(resolve_all, setup=forget_resolved, number=1, repeat=args.repeat))
+warm = min(timeit.repeat(resolve_all, number=1, repeat=args.repeat))
+for label, elapsed in (('cold', cold), ('warm', warm)):
+    print('{:<6} {:>8.2f}ms total {:>8.2f}us per argument'.format(
+        label, elapsed * 1000, elapsed * 1000000 / max(len(lookups), 1)))
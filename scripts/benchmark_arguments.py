@@ -0,0 +1,57 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Loads the arguments of every command with and without the argument spec cache and reports how
+long it takes.
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import timeit
+
+parser = argparse.ArgumentParser(description='Argument loading benchmark')
+parser.add_argument('--commands', metavar='N', nargs='+', help='Filter by command scope')
+args = parser.parse_args()
+sys.argv = sys.argv[:1]
+
+# pylint: disable=wrong-import-position
+from azure.cli.core.application import APPLICATION, Configuration
+import azure.cli.core.commands._introspection as introspection
+
+config = Configuration([])
+APPLICATION.initialize(config)
+command_table = config.get_command_table()
+commands = [c for c in sorted(command_table)
+            if command_table[c].arguments_loader and
+            (not args.commands or c.split()[0] in args.commands)]
+
+
+def load_all(use_cache):
+    for command in commands:
+        if not use_cache:
+            introspection._argument_spec_cache = {}  # pylint: disable=protected-access
+        command_table[command].arguments_loader()
+
+
+def run(label, use_cache):
+    elapsed = timeit.timeit(lambda: load_all(use_cache), number=1)
+    print('{:<10} {:>8.3f}s total {:>8.2f}ms per command'.format(
+        label, elapsed, elapsed * 1000 / max(len(commands), 1)))
+
+
+print('Loading arguments for {} commands'.format(len(commands)))
+# import every operation up front so neither run pays for it
+load_all(False)
+run('uncached', False)
+
+introspection._argument_spec_cache = {}  # pylint: disable=protected-access
+load_all(True)
+introspection.save_argument_spec_cache()
+# drop the in-memory copy so the cached run reads the cache from disk like a new process would
+introspection._argument_spec_cache = None  # pylint: disable=protected-access
+run('cached', True)
@@ -0,0 +1,80 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Submits a task collection from a JSON file to a Batch client stub that takes a fixed latency per
+add_collection request, as 'batch task create --json-file' does, and reports the throughput with
+one worker and with the default number of workers.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import timeit
+
+import azure.cli.command_modules.batch.custom as custom
+
+# pylint: disable=protected-access
+
+parser = argparse.ArgumentParser(description='Batch task collection benchmark')
+parser.add_argument('--tasks', type=int, default=100000, help='Number of tasks in the file')
+parser.add_argument('--latency', type=float, default=0.05, help='Seconds per request')
+args = parser.parse_args()
+
+
+class _Task(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, task_id):
+        self.id = task_id
+
+
+class _Result(object):  # pylint: disable=too-few-public-methods
+    status = 'success'
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+
+
+class _Added(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _TaskClient(object):
+
+    @staticmethod
+    def _deserialize(_, chunk):
+        return [_Task(t['id']) for t in chunk]
+
+    @staticmethod
+    def add_collection(job_id, value):  # pylint: disable=unused-argument
+        time.sleep(args.latency)
+        return _Added([_Result(t.id) for t in value])
+
+
+directory = tempfile.mkdtemp()
+try:
+    json_file = os.path.join(directory, 'tasks.json')
+    with open(json_file, 'w') as f:
+        json.dump([{'id': 'task{}'.format(i), 'commandLine': '/bin/bash -c "echo {}"'.format(i)}
+                   for i in range(args.tasks)], f)
+
+    def submit(workers):
+        with open(json_file) as f:
+            custom._add_task_collection(_TaskClient(), 'job', custom._iter_json_tasks(f),
+                                        max_workers=workers)
+
+    print('Adding {} tasks, {}s per request'.format(args.tasks, args.latency))
+    for workers in (1, custom.MAX_TASK_REQUEST_WORKERS):
+        elapsed = timeit.timeit(lambda: submit(workers), number=1)  # pylint: disable=cell-var-from-loop
+        print('{:>2} workers {:>10.0f} tasks/sec'.format(workers, args.tasks / elapsed))
+finally:
+    shutil.rmtree(directory)
@@ -0,0 +1,61 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Completes resource group names the way pressing TAB does, against a simulated subscription whose
+groups take a fixed latency to list, and reports how long the first (cold) and later (warm)
+completions take. The completion cache is kept in a temporary configuration directory.
+"""
+
+from __future__ import print_function
+
+import argparse
+import shutil
+import tempfile
+import time
+import timeit
+
+import mock
+
+from azure.cli.core.commands.parameters import get_resource_group_completion_list
+
+parser = argparse.ArgumentParser(description='Completion cache benchmark')
+parser.add_argument('--groups', type=int, default=5000, help='Number of resource groups')
+parser.add_argument('--latency', type=float, default=1.5, help='Seconds to list the groups')
+parser.add_argument('--repeat', type=int, default=20, help='Number of timed warm runs')
+args = parser.parse_args()
+
+
+class Group(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, name):
+        self.name = name
+
+
+def list_groups():
+    time.sleep(args.latency)
+    return [Group('group{}'.format(i)) for i in range(args.groups)]
+
+
+def complete():
+    return get_resource_group_completion_list('group12')
+
+
+config_dir = tempfile.mkdtemp()
+profile = mock.MagicMock()
+profile.return_value.get_subscription.return_value = {'id': 'sub'}
+try:
+    with mock.patch('azure.cli.core._environment.get_config_dir', return_value=config_dir), \
+            mock.patch('azure.cli.core._profile.Profile', profile), \
+            mock.patch('azure.cli.core.commands.parameters.get_resource_groups', list_groups):
+        print('Completing among {} resource groups listed in {}s'.format(args.groups,
+                                                                        args.latency))
+        cold = timeit.timeit(complete, number=1)
+        warm = min(timeit.repeat(complete, number=1, repeat=args.repeat))
+        print('{} matches'.format(len(complete())))
+        for label, elapsed in (('cold', cold), ('warm', warm)):
+            print('{:<6} {:>10.2f}ms'.format(label, elapsed * 1000))
+finally:
+    shutil.rmtree(config_dir)
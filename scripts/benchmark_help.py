@@ -0,0 +1,73 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Renders the help of every command in baseline_command_table.json and reports how long it takes
+with a cold and with a warm help cache.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+from six import StringIO
+
+from _common import get_repo_root
+
+parser = argparse.ArgumentParser(description='Help rendering benchmark')
+parser.add_argument('--commands', metavar='N', nargs='+', help='Filter by command scope')
+args = parser.parse_args()
+sys.argv = sys.argv[:1]
+
+# pylint: disable=wrong-import-position
+from azure.cli.core.application import APPLICATION, Configuration
+import azure.cli.core.help_files as help_files
+
+with open(os.path.join(get_repo_root(), 'baseline_command_table.json')) as f:
+    baseline_commands = sorted(c.strip() for c in json.load(f))
+if args.commands:
+    baseline_commands = [c for c in baseline_commands if c.split()[0] in args.commands]
+
+config = Configuration([])
+APPLICATION.initialize(config)
+command_table = config.get_command_table()
+for command in command_table:
+    config.load_params(command)
+APPLICATION.parser.load_command_table(command_table)
+commands = [c for c in baseline_commands if c in command_table]
+
+
+def render_all():
+    for command in commands:
+        stdout, sys.stdout = sys.stdout, StringIO()
+        try:
+            APPLICATION.parser.parse_args(command.split() + ['-h'])
+        except SystemExit:
+            pass
+        finally:
+            sys.stdout = stdout
+
+
+def run(label):
+    elapsed = timeit.timeit(render_all, number=1)
+    print('{:<6} {:>8.3f}s total {:>8.2f}ms per command'.format(
+        label, elapsed, elapsed * 1000 / max(len(commands), 1)))
+
+
+print('Rendering help for {} of {} baseline commands'.format(len(commands),
+                                                            len(baseline_commands)))
+try:
+    os.remove(help_files._get_help_cache_path())  # pylint: disable=protected-access
+except OSError:
+    pass
+help_files._help_cache = None  # pylint: disable=protected-access
+run('cold')
+# drop the in-memory copy so the warm run reads the cache from disk like a new process would
+help_files._help_cache = None  # pylint: disable=protected-access
+run('warm')
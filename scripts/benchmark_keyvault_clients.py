@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Reads secrets from a local HTTP server that answers as a vault does, challenging requests without
+a bearer token, with a fixed latency for each new connection (the TLS handshake of a real vault)
+and for each token acquired. Reports the wall time, connections opened and tokens acquired with a
+new client for every request, as before clients were kept, and with the client of the process.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import threading
+import time
+import timeit
+
+from six.moves import BaseHTTPServer, socketserver
+
+from azure.keyvault import KeyVaultAuthentication
+from azure.keyvault.generated import KeyVaultClient
+
+from azure.cli.command_modules.keyvault._client_factory import KeyVaultClientCache
+
+parser = argparse.ArgumentParser(description='Key Vault client reuse benchmark')
+parser.add_argument('--requests', type=int, default=50, help='Secrets read')
+parser.add_argument('--handshake', type=float, default=0.02,
+                    help='Seconds to open a connection')
+parser.add_argument('--token-latency', type=float, default=0.05,
+                    help='Seconds to acquire a token')
+args = parser.parse_args()
+
+CHALLENGE = 'Bearer authorization="https://login.windows.net/tenant", ' \
+            'resource="https://vault.azure.net"'
+
+connections = [0]
+tokens = [0]
+
+
+class VaultServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class VaultHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # answer with a single write, so responses on a kept connection aren't held by delayed acks
+    wbufsize = -1
+
+    def setup(self):
+        connections[0] += 1
+        time.sleep(args.handshake)
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if not self.headers.get('Authorization'):
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', CHALLENGE)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'value': 'secret', 'id': url + self.path.split('?')[0]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def retrieve_token(_):
+    tokens[0] += 1
+    time.sleep(args.token_latency)
+    return 'Bearer', 'token'
+
+
+def get_token(_, resource, __):
+    return retrieve_token(resource)
+
+
+def read_with_new_clients():
+    for _ in range(args.requests):
+        KeyVaultClient(KeyVaultAuthentication(get_token)).get_secret(url, 'mysecret', '')
+
+
+def read_with_kept_client():
+    cache = KeyVaultClientCache(retrieve_token)
+    for _ in range(args.requests):
+        cache.get_client(KeyVaultClient, url).get_secret(url, 'mysecret', '')
+
+
+server = VaultServer(('127.0.0.1', 0), VaultHandler)
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+try:
+    print('Reading {} secrets, {}s to connect, {}s to acquire a token'.format(
+        args.requests, args.handshake, args.token_latency))
+    print('{:<12} {:>10} {:>12} {:>8}'.format('clients', 'time', 'connections', 'tokens'))
+    for label, read in (('new', read_with_new_clients), ('kept', read_with_kept_client)):
+        connections[0] = tokens[0] = 0
+        elapsed = timeit.timeit(read, number=1)
+        print('{:<12} {:>8.2f}ms {:>12} {:>8}'.format(label, elapsed * 1000, connections[0],
+                                                      tokens[0]))
+finally:
+    server.shutdown()
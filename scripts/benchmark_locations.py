@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Converts location display names the way --location does, against a simulated subscription whose
+locations take a fixed latency to list, and reports how long a conversion takes with nothing kept
+yet, with the locations kept in the config directory (a new command) and kept in process. The
+locations are kept in a temporary configuration directory.
+"""
+
+from __future__ import print_function
+
+import argparse
+import shutil
+import tempfile
+import time
+import timeit
+
+import mock
+
+import azure.cli.core.commands._locations as locations
+from azure.cli.core.commands.parameters import get_one_of_subscription_locations, \
+    location_name_type
+
+parser = argparse.ArgumentParser(description='Location catalog benchmark')
+parser.add_argument('--latency', type=float, default=0.5, help='Seconds to list the locations')
+parser.add_argument('--repeat', type=int, default=20, help='Number of timed runs')
+args = parser.parse_args()
+
+
+class Location(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, name, display_name):
+        self.name = name
+        self.display_name = display_name
+
+
+def list_locations():
+    time.sleep(args.latency)
+    return [Location(n, d) for n, d in locations.KNOWN_LOCATIONS['AzureCloud']]
+
+
+def convert():
+    # a vm create both converts --location and looks for a default one
+    location_name_type('West Europe')
+    get_one_of_subscription_locations()
+
+
+def forget_in_process():
+    locations._locations.clear()  # pylint: disable=protected-access
+
+
+config_dir = tempfile.mkdtemp()
+profile = mock.MagicMock()
+profile.return_value.get_subscription.return_value = {'id': 'sub'}
+try:
+    with mock.patch('azure.cli.core._environment.get_config_dir', return_value=config_dir), \
+            mock.patch('azure.cli.core._profile.Profile', profile), \
+            mock.patch('azure.cli.core.commands.parameters.get_subscription_locations',
+                       list_locations):
+        print('Converting a location listed in {}s'.format(args.latency))
+        cold = timeit.timeit(convert, number=1)
+        disk = min(timeit.repeat(convert, setup=forget_in_process, number=1, repeat=args.repeat))
+        memory = min(timeit.repeat(convert, number=1, repeat=args.repeat))
+        for label, elapsed in (('cold', cold), ('disk', disk), ('memory', memory)):
+            print('{:<8} {:>10.2f}ms'.format(label, elapsed * 1000))
+finally:
+    shutil.rmtree(config_dir)
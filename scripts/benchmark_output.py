@@ -0,0 +1,71 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Writes a large synthetic list result as a table and as TSV, once read into a list first as list
+commands used to and once as the items are produced, and reports the time until the first row is
+written, the total time and the peak RSS of each. Every run is made in a process of its own so
+their peak RSS can be told apart. Needs the resource module, so it doesn't run on Windows.
+"""
+
+from __future__ import print_function
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser(description='Output benchmark')
+parser.add_argument('--count', type=int, default=200000, help='Number of rows in the result')
+parser.add_argument('--run', nargs=2, metavar=('FORMAT', 'MODE'), help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+
+def produce_items():
+    from collections import OrderedDict
+    for i in range(args.count):
+        yield OrderedDict([
+            ('id', '/subscriptions/sub/resourceGroups/group{}/providers/Microsoft.Compute/'
+                   'virtualMachines/vm{}'.format(i % 10, i)),
+            ('name', 'vm{}'.format(i)), ('location', 'westus'),
+            ('resourceGroup', 'group{}'.format(i % 10)), ('provisioningState', 'Succeeded'),
+            ('tags', {'environment': 'test'})])
+
+
+class TimedNullFile(object):
+
+    def __init__(self):
+        self.first_write = None
+
+    def write(self, _):
+        if self.first_write is None:
+            self.first_write = time.time()
+
+    def flush(self):
+        pass
+
+
+def run(output_format, mode):
+    from azure.cli.core._output import CommandResultItem, OutputProducer
+    start = time.time()
+    result = produce_items() if mode == 'streamed' else list(produce_items())
+    out = TimedNullFile()
+    OutputProducer(OutputProducer.get_formatter(output_format), out).out(CommandResultItem(result))
+    end = time.time()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+    print('{:<6} {:<9} first row {:>8.1f}ms  total {:>8.1f}ms  peak RSS {:>8.1f}MB'.format(
+        output_format, mode, (out.first_write - start) * 1000, (end - start) * 1000, peak_mb))
+
+
+if args.run:
+    run(*args.run)
+else:
+    print('Writing {} rows'.format(args.count))
+    for output_format in ('table', 'tsv'):
+        for mode in ('list', 'streamed'):
+            subprocess.check_call([sys.executable, __file__, '--count', str(args.count),
+                                   '--run', output_format, mode])
@@ -0,0 +1,64 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Applies queries to a large synthetic list result, once read into a list first as list commands
+used to and once as the items are produced, and reports the peak memory use, the time until the
+first queried value and the total time of each.
+"""
+
+from __future__ import print_function
+
+import argparse
+from collections import OrderedDict
+import time
+import tracemalloc
+
+from azure.cli.core.extensions.query import jmespath_type, search_query
+
+parser = argparse.ArgumentParser(description='Query benchmark')
+parser.add_argument('--count', type=int, default=200000, help='Number of items in the result')
+parser.add_argument('--query', nargs='+', help='Queries to apply',
+                    default=['[].name', "[?location=='westus'].{name:name, group:resourceGroup}"])
+args = parser.parse_args()
+
+
+def produce_items():
+    for i in range(args.count):
+        yield OrderedDict([
+            ('id', '/subscriptions/sub/resourceGroups/group{}/providers/Microsoft.Compute/'
+                   'virtualMachines/vm{}'.format(i % 10, i)),
+            ('name', 'vm{}'.format(i)), ('location', 'westus' if i % 2 else 'eastus'),
+            ('resourceGroup', 'group{}'.format(i % 10)), ('tags', {'environment': 'test'}),
+            ('hardwareProfile', {'vmSize': 'Standard_DS1_v2'})])
+
+
+def run(query_expression, get_items):
+    start = time.time()
+    first = None
+    for _ in search_query(query_expression, get_items()):
+        if first is None:
+            first = time.time() - start
+    total = time.time() - start
+    return first or total, total
+
+
+def measure(label, query_expression, get_items):
+    first, total = run(query_expression, get_items)
+    # tracing allocations slows everything down, so the memory use is measured in a second run
+    tracemalloc.start()
+    run(query_expression, get_items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{:<10} first value {:>8.1f}ms  total {:>8.1f}ms  peak memory {:>10.1f}KB'.format(
+        label, first * 1000, total * 1000, peak / 1024.0))
+
+
+print('Querying {} items'.format(args.count))
+for raw_query in args.query:
+    print(raw_query)
+    compiled = jmespath_type(raw_query)
+    measure('list', compiled, lambda: list(produce_items()))
+    measure('streamed', compiled, produce_items)
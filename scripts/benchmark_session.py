@@ -0,0 +1,81 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Makes the changes typical commands make to a profile with many subscriptions, one at a time as
+library code does and in a batch as az does, and reports how many times the file is written and
+how long the changes take, not counting loading the profile.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import timeit
+
+import mock
+
+from azure.cli.core._session import Session
+
+parser = argparse.ArgumentParser(description='Session benchmark')
+parser.add_argument('--subscriptions', type=int, default=200, help='Subscriptions in the profile')
+parser.add_argument('--repeat', type=int, default=20, help='Number of timed runs')
+args = parser.parse_args()
+
+subscriptions = [{'id': '{:08d}-0000-0000-0000-000000000000'.format(i), 'name': 'sub{}'.format(i),
+                  'state': 'Enabled', 'isDefault': i == 0, 'tenantId': 'tenant',
+                  'environmentName': 'AzureCloud',
+                  'user': {'name': 'user@example.com', 'type': 'user'}}
+                 for i in range(args.subscriptions)]
+
+
+def login(session):
+    session['subscriptions'] = subscriptions
+    session['installationId'] = 'installation'
+
+
+def account_set(session):
+    for s in session.get('subscriptions'):
+        s['isDefault'] = not s['isDefault']
+    session['subscriptions'] = session.get('subscriptions')
+
+
+def logout_login(session):
+    session['subscriptions'] = []
+    session['installationId'] = 'new installation'
+    session['subscriptions'] = subscriptions
+
+
+COMMANDS = [('login', login), ('account set', account_set), ('logout, login', logout_login)]
+
+directory = tempfile.mkdtemp()
+try:
+    path = os.path.join(directory, 'azureProfile.json')
+    session = Session()
+
+    def run(command, batched):
+        if batched:
+            with session:
+                command(session)
+        else:
+            command(session)
+
+    print('Profile with {} subscriptions'.format(args.subscriptions))
+    for name, command in COMMANDS:
+        login(Session())
+        for batched in (False, True):
+            session.load(path)
+            with mock.patch('json.dump', side_effect=json.dump) as dump:
+                run(command, batched)
+            elapsed = min(timeit.repeat(lambda: run(command, batched),
+                                        setup=lambda: session.load(path), number=1,
+                                        repeat=args.repeat))
+            print('{:<14} {:<10} {:>3} writes {:>8.2f}ms'.format(
+                name, 'batched' if batched else 'unbatched', dump.call_count, elapsed * 1000))
+finally:
+    shutil.rmtree(directory)
@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Converts a list of synthetic SDK models the way command results are converted, once with todict
+followed by the separate resource group pass it replaced and once in a single todict pass, and
+reports how long each takes. Both must produce the same JSON.
+"""
+
+from __future__ import print_function
+
+import argparse
+from datetime import datetime, timedelta
+from enum import Enum
+import json
+import timeit
+
+from azure.cli.core._util import todict, to_camel_case
+from azure.cli.core.extensions.transform import _add_resource_group
+
+parser = argparse.ArgumentParser(description='Result conversion benchmark')
+parser.add_argument('--count', type=int, default=10000, help='Number of models in the result')
+parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs')
+args = parser.parse_args()
+
+
+class PowerState(Enum):
+    running = 'VM running'
+
+
+class Model(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        self._attribute_map = {}
+
+
+def make_vm(i):
+    vm_id = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/group{}/' \
+            'providers/Microsoft.Compute/virtualMachines/vm{}'.format(i % 10, i)
+    return Model(
+        id=vm_id, name='vm{}'.format(i), location='westus', type='Microsoft.Compute/virtualMachines',
+        tags={'environment': 'test'}, provisioning_state='Succeeded', power_state=PowerState.running,
+        hardware_profile=Model(vm_size='Standard_DS1_v2'),
+        storage_profile=Model(
+            os_disk=Model(os_type='Linux', name='osdisk{}'.format(i), caching='ReadWrite',
+                          managed_disk=Model(id=vm_id + '/disks/osdisk', storage_account_type='Premium_LRS')),
+            data_disks=[Model(lun=lun, disk_size_gb=128, create_option='Empty') for lun in range(2)]),
+        network_profile=Model(network_interfaces=[Model(id=vm_id + '/nic', primary=True)]),
+        instance_view=Model(statuses=[Model(code='PowerState/running', time=datetime(2017, 1, 1))],
+                            boot_timeout=timedelta(minutes=5)))
+
+
+def reference_todict(obj):
+    if isinstance(obj, dict):
+        return {k: reference_todict(v) for (k, v) in obj.items()}
+    elif isinstance(obj, list):
+        return [reference_todict(a) for a in obj]
+    elif isinstance(obj, Enum):
+        return obj.value
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, timedelta):
+        return str(obj)
+    elif hasattr(obj, '_asdict'):
+        return reference_todict(obj._asdict())  # pylint: disable=protected-access
+    elif hasattr(obj, '__dict__'):
+        return dict([(to_camel_case(k), reference_todict(v)) for k, v in obj.__dict__.items()
+                     if not callable(v) and not k.startswith('_')])
+    return obj
+
+
+def two_passes():
+    converted = reference_todict(result)
+    _add_resource_group(converted)
+    return converted
+
+
+def single_pass():
+    return todict(result, add_resource_group=True)
+
+
+result = [make_vm(i) for i in range(args.count)]
+if json.dumps(two_passes()) != json.dumps(single_pass()):
+    raise SystemExit('The converted results differ')
+
+print('Converting {} models'.format(args.count))
+for label, convert in (('two passes', two_passes), ('one pass', single_pass)):
+    elapsed = min(timeit.repeat(convert, number=1, repeat=args.repeat))
+    print('{:<10} {:>8.2f}ms total {:>8.2f}us per model'.format(
+        label, elapsed * 1000, elapsed * 1000000 / max(args.count, 1)))
@@ -0,0 +1,62 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Validates the arguments of a 'vm create' against simulated ARM lookups that each take a fixed
+latency, once making the lookups as the validators ask for them and once prefetching them
+concurrently, and reports the wall time of each.
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+import timeit
+
+import mock
+
+import azure.cli.command_modules.vm._validators as validators
+
+parser = argparse.ArgumentParser(description='vm create validation benchmark')
+parser.add_argument('--latency', type=float, default=0.2, help='Seconds per ARM lookup')
+parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs')
+args = parser.parse_args()
+
+
+def with_latency(result):
+    def _lookup(*_):
+        time.sleep(args.latency)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return _lookup
+
+
+def validate():
+    namespace = argparse.Namespace(
+        resource_group_name='rg1', location=None, image='UbuntuLTS', managed_os_disk=None,
+        os_type=None, use_unmanaged_disk=True, storage_sku='Standard_LRS',
+        data_disk_sizes_gb=None, os_disk_name=None, storage_account='sa1', availability_set='as1',
+        vnet_name='vnet1', subnet='subnet1', nics=None, nsg='nsg1', public_ip_address='ip1',
+        authentication_type='password', admin_username='user12345',
+        admin_password='verySecret123', ssh_key_value=None, ssh_dest_key_path=None)
+    validators.process_vm_create_namespace(namespace)
+
+
+aliases = [{'urnAlias': 'UbuntuLTS', 'publisher': 'Canonical', 'offer': 'UbuntuServer',
+            'sku': '16.04-LTS', 'version': 'latest'}]
+with mock.patch.object(validators, 'get_subscription_id', return_value='sub1'), \
+        mock.patch.object(validators, 'check_existence', with_latency(True)), \
+        mock.patch.object(validators, '_get_resource_group_location', with_latency('westus')), \
+        mock.patch.object(validators, '_get_image', with_latency(IOError('not found'))), \
+        mock.patch('azure.cli.command_modules.vm._actions.load_images_from_aliases_doc',
+                   with_latency(aliases)):
+    prefetched = min(timeit.repeat(validate, number=1, repeat=args.repeat))
+    with mock.patch.object(validators, '_get_vm_create_lookups', return_value=[]):
+        sequential = min(timeit.repeat(validate, number=1, repeat=args.repeat))
+
+print('Validating vm create with {}s per lookup'.format(args.latency))
+for label, elapsed in (('sequential', sequential), ('prefetched', prefetched)):
+    print('{:<12} {:>10.2f}ms'.format(label, elapsed * 1000))
@@ -0,0 +1,96 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Streams and downloads the logs of several web apps from a local HTTP server that sends them in
+chunks, each after a fixed latency, as the scm sites do. Reports the wall time of streaming the
+web apps one at a time and together, and of downloading a log with 1 KB and 1 MB chunks.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import timeit
+
+import mock
+from six.moves import BaseHTTPServer, socketserver
+
+import azure.cli.command_modules.appservice.custom as custom
+
+# pylint: disable=protected-access
+
+parser = argparse.ArgumentParser(description='web app log streaming benchmark')
+parser.add_argument('--webs', type=int, default=8, help='Number of web apps')
+parser.add_argument('--lines', type=int, default=50, help='Log lines per web app')
+parser.add_argument('--latency', type=float, default=0.01, help='Seconds between log lines')
+parser.add_argument('--dump-mb', type=int, default=50, help='Size of the downloaded log in MB')
+args = parser.parse_args()
+
+DUMP = b'x' * (args.dump_mb * 1024 * 1024)
+
+
+class LogServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class LogHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path.endswith('/dump'):
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(DUMP)))
+            self.end_headers()
+            self.wfile.write(DUMP)
+            return
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for i in range(args.lines):
+            time.sleep(args.latency)
+            line = '{} {} log line\r\n'.format(self.path, i).encode('utf-8')
+            self.wfile.write('{:x}\r\n'.format(len(line)).encode('ascii') + line + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+
+server = LogServer(('127.0.0.1', 0), LogHandler)
+thread = threading.Thread(target=server.serve_forever)
+thread.daemon = True
+thread.start()
+url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+streams = [('web{}'.format(i), '{}/web{}/logstream'.format(url, i), 'user', 'secret')
+           for i in range(args.webs)]
+directory = tempfile.mkdtemp()
+
+try:
+    with open(os.devnull, 'w') as devnull, mock.patch('sys.stdout', devnull):
+        one_by_one = timeit.timeit(lambda: [custom._stream_traces([s]) for s in streams],
+                                   number=1)
+        together = timeit.timeit(lambda: custom._stream_traces(streams), number=1)
+    print('Streaming {} web apps, {} lines each, {}s apart'.format(args.webs, args.lines,
+                                                                   args.latency))
+    for label, elapsed in (('one by one', one_by_one), ('together', together)):
+        print('{:<12} {:>10.2f}ms'.format(label, elapsed * 1000))
+
+    log_file = os.path.join(directory, 'logs.zip')
+    print('Downloading a {} MB log'.format(args.dump_mb))
+    for label, chunk_size in (('1 KB chunks', 1024),
+                              ('1 MB chunks', custom.LOG_DOWNLOAD_CHUNK_SIZE)):
+        with mock.patch.object(custom, 'LOG_DOWNLOAD_CHUNK_SIZE', chunk_size):
+            elapsed = min(timeit.repeat(
+                lambda: custom._download_log(url, 'user', 'secret', log_file),
+                number=1, repeat=3))
+        print('{:<12} {:>10.2f}ms'.format(label, elapsed * 1000))
+finally:
+    server.shutdown()
+    shutil.rmtree(directory)
@@ -0,0 +1,59 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Advisory, cross-process file locking.
+
+The lock is held on a '<path>.lock' companion file so the locked file itself can be replaced or
+renamed while the lock is held. Only the Python Standard Library is used so the module can be
+imported by the telemetry uploader process.
+"""
+
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+
+    def _lock(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt  # pylint: disable=import-error
+
+    def _lock(lock_file):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)  # pylint: disable=no-member
+
+    def _unlock(lock_file):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)  # pylint: disable=no-member
+
+
+@contextmanager
+def file_lock(path, timeout=10, poll_interval=0.05):
+    """
+    Hold an exclusive lock for `path` while the block executes. Raises IOError or OSError if the
+    lock can't be acquired within `timeout` seconds.
+    """
+    lock_file = open(path + '.lock', 'a+')
+    try:
+        deadline = time.time() + timeout
+        while True:
+            try:
+                _lock(lock_file)
+                break
+            except (IOError, OSError):
+                if time.time() >= deadline:
+                    raise
+                time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(lock_file)
+    finally:
+        lock_file.close()
@@ -11,15 +11,22 @@ import platform
 import json
 import traceback
 from collections import OrderedDict
+from itertools import islice
+from types import GeneratorType
 from six import StringIO, text_type, u, string_types
 import colorama
 from tabulate import tabulate
 
+from azure.cli.core._config import az_config
 from azure.cli.core._util import CLIError
 import azure.cli.core.azlogging as azlogging
 
 logger = azlogging.get_az_logger(__name__)
 
+# The number of rows of a streamed table read before the widths of its columns are fixed. Tables
+# that are no longer are laid out over all their rows.
+TABLE_SAMPLE_SIZE = 1000
+
 
 def _decode_str(output):
     if not isinstance(output, text_type):
@@ -61,7 +68,25 @@ def format_text(obj):
         return ''
 
 
+def _table_output_unavailable():
+    logger.debug(traceback.format_exc())
+    return CLIError("Table output unavailable. "
+                    "Use the --query option to specify an appropriate query. "
+                    "Use --debug for more info.")
+
+
 def format_table(obj):
+    items = obj.streamed_result
+    if items is not None and not (obj.table_transformer and not obj.is_query_active):
+        sample_size = max(az_config.getint('core', 'table_sample', fallback=TABLE_SAMPLE_SIZE), 1)
+        # errors reading the items, such as for a page that failed, are the command's own
+        sample = list(islice(items, sample_size))
+        if len(sample) == sample_size:
+            try:
+                return TableOutput(not obj.is_query_active).stream(sample, items)
+            except Exception:  # pylint: disable=broad-except
+                raise _table_output_unavailable()
+        obj = CommandResultItem(sample, obj.table_transformer, obj.is_query_active)
     result = obj.result
     try:
         if obj.table_transformer and not obj.is_query_active:
@@ -71,13 +96,13 @@ def format_table(obj):
         to = TableOutput(should_sort_keys)
         return to.dump(result_list)
     except:
-        logger.debug(traceback.format_exc())
-        raise CLIError("Table output unavailable. "
-                       "Use the --query option to specify an appropriate query. "
-                       "Use --debug for more info.")
+        raise _table_output_unavailable()
 
 
 def format_tsv(obj):
+    items = obj.streamed_result
+    if items is not None:
+        return TsvOutput.stream(items)
     result = obj.result
     result_list = result if isinstance(result, list) else [result]
     return TsvOutput.dump(result_list)
@@ -86,10 +111,23 @@ def format_tsv(obj):
 class CommandResultItem(object):  # pylint: disable=too-few-public-methods
 
     def __init__(self, result, table_transformer=None, is_query_active=False):
-        self.result = result
+        self._result = result
         self.table_transformer = table_transformer
         self.is_query_active = is_query_active
 
+    @property
+    def result(self):
+        # the items of a paged result are read once something asks for the result
+        if isinstance(self._result, GeneratorType):
+            self._result = list(self._result)
+        return self._result
+
+    @property
+    def streamed_result(self):
+        """ The items of a list result that is still being produced, or None if the result is
+        complete. """
+        return self._result if isinstance(self._result, GeneratorType) else None
+
 
 class OutputProducer(object):  # pylint: disable=too-few-public-methods
 
@@ -109,16 +147,18 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
         if platform.system() == 'Windows':
             self.file = colorama.AnsiToWin32(self.file).stream
         output = self.formatter(obj)
-        try:
-            print(output, file=self.file, end='')
-        except IOError as ex:
-            if ex.errno == errno.EPIPE:
-                pass
-            else:
-                raise
-        except UnicodeEncodeError:
-            print(output.encode('ascii', 'ignore').decode('utf-8', 'ignore'),
-                  file=self.file, end='')
+        # formatters of streamed results produce their output piece by piece
+        for chunk in [output] if isinstance(output, string_types) else output:
+            try:
+                print(chunk, file=self.file, end='')
+            except IOError as ex:
+                if ex.errno == errno.EPIPE:
+                    return
+                else:
+                    raise
+            except UnicodeEncodeError:
+                print(chunk.encode('ascii', 'ignore').decode('utf-8', 'ignore'),
+                      file=self.file, end='')
 
     @staticmethod
     def get_formatter(format_type):
@@ -170,6 +210,70 @@ class TableOutput(object):  # pylint: disable=too-few-public-methods
             raise ValueError('Unable to extract fields for table.')
         return table_str + '\n'
 
+    def stream(self, sample, items):
+        """ Lays out the columns of a table over the sample, then writes the rows of the items
+        that follow it in those columns as they are produced. """
+        table_str = self.dump(sample)
+        sample_rows = self._auto_table(sample)
+        lines = table_str.split('\n', 2)
+        headers, rules = lines[0], lines[1]
+        columns = []
+        start = 0
+        for rule in rules.split('  '):
+            header = headers[start:start + len(rule)]
+            name = header.strip()
+            # tabulate right aligns the columns of numbers, their headers included, and lines up
+            # their decimal points
+            is_number = header.startswith(' ')
+            decimals = max([TableOutput._decimals(TableOutput._format_cell(row.get(name), True))
+                            for row in sample_rows]) if is_number else 0
+            columns.append((name, len(rule), is_number, decimals))
+            start += len(rule) + 2
+        return self._stream_rows(table_str, columns, items)
+
+    def _stream_rows(self, table_str, columns, items):
+        yield table_str
+        names = set(column[0] for column in columns)
+        warned = False
+        for item in items:
+            # only laying out the row is guarded, errors reading the items are the command's own
+            try:
+                row = self._auto_table_item(item)
+                line = TableOutput._format_row(row, columns)
+            except Exception:  # pylint: disable=broad-except
+                raise _table_output_unavailable()
+            if not warned and any(name not in names for name in row):
+                logger.warning("Some columns are not shown as they are missing in the first "
+                               "rows of the table. Set a larger 'table_sample' in the 'core' "
+                               "section of the configuration to look at more rows.")
+                warned = True
+            yield line
+
+    @staticmethod
+    def _format_row(row, columns):
+        cells = []
+        for name, width, is_number, decimals in columns:
+            text = TableOutput._format_cell(row.get(name), is_number)
+            if is_number:
+                text = (text + ' ' * (decimals - TableOutput._decimals(text))).rjust(width)
+            cells.append(text.ljust(width))
+        return '  '.join(cells).rstrip() + '\n'
+
+    @staticmethod
+    def _decimals(text):
+        return len(text) - text.index('.') if '.' in text else 0
+
+    @staticmethod
+    def _format_cell(value, is_number):
+        # the same text tabulate gives the value in a column of its type
+        if value is None:
+            return ''
+        elif isinstance(value, bool) and is_number:
+            return str(int(value))
+        elif isinstance(value, float):
+            return format(value, 'g')
+        return _decode_str(value)
+
 
 class TextOutput(object):
 
@@ -253,3 +357,12 @@ class TsvOutput(object):  # pylint: disable=too-few-public-methods
         result = io.getvalue()
         io.close()
         return result
+
+    @staticmethod
+    def stream(data):
+        """ Yields the rows of the items as they are produced. """
+        for item in data:
+            io = StringIO()
+            TsvOutput._dump_row(item, io)
+            yield io.getvalue()
+            io.close()
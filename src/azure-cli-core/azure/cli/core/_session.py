@@ -14,60 +14,116 @@ except ImportError:
 
 from codecs import open as codecs_open
 
+from azure.cli.core._file_lock import file_lock
+
 
 class Session(collections.MutableMapping):
     '''A simple dict-like class that is backed by a JSON file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    All direct modifications will save the file, or, inside a `with` block of the session, will be
+    saved together when the outermost block exits. Indirect modifications should be followed by a
+    call to `save_with_retry` or `save`.
+
+    Only the keys that were modified are written, over the keys in the file, under a lock, so
+    concurrent processes don't lose each other's changes to other keys. The file is replaced
+    rather than rewritten, so it is never seen half written.
     '''
 
     def __init__(self, encoding=None):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        self._batch_depth = 0
+        self._changed_keys = set()
+        self._deleted_keys = set()
+        # keys whose values were handed out, and may have been modified indirectly
+        self._shared_keys = set()
 
     def load(self, filename, max_age=0):
         self.filename = filename
         self.data = {}
+        self._changed_keys.clear()
+        self._deleted_keys.clear()
+        self._shared_keys.clear()
         try:
             if max_age > 0:
                 st = os.stat(self.filename)
-                if st.st_mtime + max_age < time.clock():
-                    self.save()
+                if st.st_mtime + max_age < time.time():
+                    self._save_changes(replace=True)
             with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
                 self.data = json.load(f)
         except (OSError, IOError):
-            self.save()
+            pass  # the file is created when something is saved
 
     def save(self):
-        if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+        self._changed_keys.update(key for key in self._shared_keys if key in self.data)
+        self._save_changes()
 
     def save_with_retry(self, retries=5):
+        Session._with_retry(self.save, retries)
+
+    @staticmethod
+    def _with_retry(func, retries):
         for _ in range(retries - 1):
             try:
-                self.save()
+                func()
                 break
-            except OSError:
+            except (OSError, IOError):
                 time.sleep(0.1)
         else:
-            self.save()
+            func()
+
+    def _read(self):
+        try:
+            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+                return json.load(f)
+        except (OSError, IOError, ValueError):
+            return {}
+
+    def _save_changes(self, replace=False):
+        if self._batch_depth or not self.filename or \
+                not (replace or self._changed_keys or self._deleted_keys):
+            return
+        with file_lock(self.filename):
+            data = {} if replace else self._read()
+            for key in self._deleted_keys:
+                data.pop(key, None)
+            for key in self._changed_keys:
+                data[key] = self.data[key]
+            temp_path = '{}.{}.tmp'.format(self.filename, os.getpid())
+            with codecs_open(temp_path, 'w', encoding=self._encoding) as f:
+                json.dump(data, f)
+            getattr(os, 'replace', os.rename)(temp_path, self.filename)
+        self._changed_keys.clear()
+        self._deleted_keys.clear()
+
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        Session._with_retry(self._save_changes, 5)
 
     def get(self, key, default=None):
+        self._shared_keys.add(key)
         return self.data.get(key, default)
 
     def __getitem__(self, key):
+        self._shared_keys.add(key)
         return self.data.setdefault(key, {})
 
     def __setitem__(self, key, value):
         self.data[key] = value
-        self.save_with_retry()
+        self._changed_keys.add(key)
+        self._deleted_keys.discard(key)
+        Session._with_retry(self._save_changes, 5)
 
     def __delitem__(self, key):
         del self.data[key]
-        self.save_with_retry()
+        self._changed_keys.discard(key)
+        self._deleted_keys.add(key)
+        Session._with_retry(self._save_changes, 5)
 
     def __iter__(self):
         return iter(self.data)
@@ -128,26 +128,98 @@ def read_file_content(file_path, allow_binary=False):
     raise CLIError('Failed to decode file {} - unknown decoding'.format(file_path))
 
 
-def todict(obj):  # pylint: disable=too-many-return-statements
-
+def open_private_file(file_path, mode='w'):
+    """ Opens a file for writing that only the current user can access, for files that hold
+    secrets or keys. An existing file is truncated and made private too. """
+    import os
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if 'b' in mode:
+        flags |= getattr(os, 'O_BINARY', 0)
+    fd = os.open(file_path, flags, 0o600)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o600)
+    return os.fdopen(fd, mode)
+
+
+# Conversions applied by todict, decided once per type of object converted
+_TODICT_DICT, _TODICT_LIST, _TODICT_ENUM, _TODICT_DATETIME, _TODICT_TIMEDELTA, _TODICT_NAMEDTUPLE, \
+    _TODICT_MODEL, _TODICT_VALUE = range(8)
+_todict_conversions = {}
+# Model attribute name to result key, or None for private attributes
+_todict_keys = {}
+
+
+def _get_todict_conversion(obj):
     if isinstance(obj, dict):
-        return {k: todict(v) for (k, v) in obj.items()}
+        conversion = _TODICT_DICT
     elif isinstance(obj, list):
-        return [todict(a) for a in obj]
+        conversion = _TODICT_LIST
     elif isinstance(obj, Enum):
-        return obj.value
+        conversion = _TODICT_ENUM
     elif isinstance(obj, datetime):
-        return obj.isoformat()
+        conversion = _TODICT_DATETIME
     elif isinstance(obj, timedelta):
-        return str(obj)
+        conversion = _TODICT_TIMEDELTA
     elif hasattr(obj, '_asdict'):
-        return todict(obj._asdict())
+        conversion = _TODICT_NAMEDTUPLE
     elif hasattr(obj, '__dict__'):
-        return dict([(to_camel_case(k), todict(v))
-                     for k, v in obj.__dict__.items()
-                     if not callable(v) and not k.startswith('_')])
+        conversion = _TODICT_MODEL
     else:
+        conversion = _TODICT_VALUE
+    _todict_conversions[type(obj)] = conversion
+    return conversion
+
+
+def _get_todict_key(name):
+    key = _todict_keys[name] = None if name.startswith('_') else to_camel_case(name)
+    return key
+
+
+def _add_resource_group(result):
+    """ Adds the resource group parsed from the resource id of a converted object, if it has one. """
+    if 'resourceGroup' not in result:
+        resource_id = result.get('id')
+        if resource_id and isinstance(resource_id, six.string_types):
+            parts = resource_id.split('/')
+            if len(parts) > 8 and parts[3] == 'resourceGroups':
+                result['resourceGroup'] = parts[4]
+
+
+def todict(obj, add_resource_group=False):  # pylint: disable=too-many-branches
+    """ Converts a result into dicts, lists and values that can be serialized, with the attributes
+    of models named in camelCase. With add_resource_group, every converted object whose 'id' is
+    the id of a resource in a resource group also gets a 'resourceGroup'. """
+    conversion = _todict_conversions.get(type(obj))
+    if conversion is None:
+        conversion = _get_todict_conversion(obj)
+
+    if conversion == _TODICT_MODEL:
+        result = {}
+        for name, value in obj.__dict__.items():
+            try:
+                key = _todict_keys[name]
+            except KeyError:
+                key = _get_todict_key(name)
+            if key is not None and not callable(value):
+                result[key] = todict(value, add_resource_group)
+    elif conversion == _TODICT_LIST:
+        return [todict(item, add_resource_group) for item in obj]
+    elif conversion == _TODICT_DICT:
+        result = {k: todict(v, add_resource_group) for k, v in obj.items()}
+    elif conversion == _TODICT_VALUE:
         return obj
+    elif conversion == _TODICT_ENUM:
+        return obj.value
+    elif conversion == _TODICT_DATETIME:
+        return obj.isoformat()
+    elif conversion == _TODICT_TIMEDELTA:
+        return str(obj)
+    else:
+        return todict(obj._asdict(), add_resource_group)  # pylint: disable=protected-access
+
+    if add_resource_group:
+        _add_resource_group(result)
+    return result
 
 
 KEYS_CAMELCASE_PATTERN = re.compile('(?!^)_([a-zA-Z])')
@@ -183,3 +255,21 @@ def random_string(length=16, force_lower=False, digits_only=False):
     if not digits_only:
         choice_set += ascii_lowercase if force_lower else ascii_letters
     return ''.join([choice(choice_set) for _ in range(length)])
+
+
+def retry_with_backoff(func, retry_on=lambda ex: True, attempts=10, delay=2, max_delay=30,
+                       on_retry=None):
+    """ Calls func until it returns, retrying the exceptions for which retry_on is true. Changes
+    to AAD and ARM take a while to propagate, so a resource just created may not be found yet.
+    The wait doubles after each attempt, up to max_delay seconds. on_retry(attempt, ex) is called
+    before each wait. The last exception is raised when the attempts run out. """
+    import time
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except Exception as ex:  # pylint: disable=broad-except
+            if attempt == attempts or not retry_on(ex):
+                raise
+            if on_retry:
+                on_retry(attempt, ex)
+            time.sleep(min(delay * 2 ** (attempt - 1), max_delay))
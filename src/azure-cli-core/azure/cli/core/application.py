@@ -6,8 +6,10 @@
 from collections import defaultdict
 import sys
 import os
+from types import GeneratorType
 import uuid
 import argparse
+import logging
 from azure.cli.core.parser import AzCliCommandParser, enable_autocomplete
 from azure.cli.core._output import CommandResultItem
 import azure.cli.core.extensions
@@ -15,6 +17,7 @@ import azure.cli.core._help as _help
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core._util import todict, truncate_text, CLIError, read_file_content
 from azure.cli.core._config import az_config
+from azure.cli.core.profiler import PROFILER, REPORT_FORMATS as PROFILE_REPORT_FORMATS
 
 import azure.cli.core.telemetry as telemetry
 
@@ -44,7 +47,9 @@ class Configuration(object):  # pylint: disable=too-few-public-methods
 
     def load_params(self, command):  # pylint: disable=no-self-use
         import azure.cli.core.commands as commands
+        from azure.cli.core.commands._introspection import save_argument_spec_cache
         commands.load_params(command)
+        save_argument_spec_cache()
 
 
 class Application(object):
@@ -88,9 +93,11 @@ class Application(object):
 
     def execute(self, unexpanded_argv):  # pylint: disable=too-many-statements
         argv = Application._expand_file_prefixed_files(unexpanded_argv)
-        command_table = self.configuration.get_command_table()
+        with PROFILER.phase('command_table_load'):
+            command_table = self.configuration.get_command_table()
         self.raise_event(self.COMMAND_TABLE_LOADED, command_table=command_table)
-        self.parser.load_command_table(command_table)
+        with PROFILER.phase('parser_build'):
+            self.parser.load_command_table(command_table)
         self.raise_event(self.COMMAND_PARSER_LOADED, parser=self.parser)
 
         if len(argv) == 0:
@@ -119,21 +126,25 @@ class Application(object):
         command = ' '.join(nouns)
 
         if argv[-1] in ('--help', '-h') or command in command_table:
-            self.configuration.load_params(command)
+            with PROFILER.phase('argument_load'):
+                self.configuration.load_params(command)
             self.raise_event(self.COMMAND_TABLE_PARAMS_LOADED, command_table=command_table)
-            self.parser.load_command_table(command_table)
+            with PROFILER.phase('parser_build'):
+                self.parser.load_command_table(command_table)
 
         if self.session['completer_active']:
             enable_autocomplete(self.parser)
 
-        args = self.parser.parse_args(argv)
+        with PROFILER.phase('parse'):
+            args = self.parser.parse_args(argv)
 
         self.raise_event(self.COMMAND_PARSER_PARSED, command=args.command, args=args)
         results = []
         for expanded_arg in _explode_list_args(args):
             self.session['command'] = expanded_arg.command
             try:
-                _validate_arguments(expanded_arg)
+                with PROFILER.phase('validators'):
+                    _validate_arguments(expanded_arg)
             except CLIError:
                 raise
             except:  # pylint: disable=bare-except
@@ -154,16 +165,30 @@ class Application(object):
                                           self.configuration.output_format,
                                           [p for p in unexpanded_argv if p.startswith('-')])
 
-            result = expanded_arg.func(params)
-            result = todict(result)
+            with PROFILER.phase('command'):
+                result = expanded_arg.func(params)
+            if expanded_arg.command.split()[-1] in ('create', 'delete'):
+                from azure.cli.core.commands._completion_cache import \
+                    invalidate_command_completions
+                invalidate_command_completions(command_table[expanded_arg.command])
+            with PROFILER.phase('todict'):
+                if isinstance(result, GeneratorType):
+                    # the items of a paged result are converted as they are read
+                    result = (todict(item, add_resource_group=True) for item in result)
+                else:
+                    result = todict(result, add_resource_group=True)
             results.append(result)
 
         if len(results) == 1:
             results = results[0]
+        else:
+            results = [list(r) if isinstance(r, GeneratorType) else r for r in results]
 
         event_data = {'result': results}
-        self.raise_event(self.TRANSFORM_RESULT, event_data=event_data)
-        self.raise_event(self.FILTER_RESULT, event_data=event_data)
+        with PROFILER.phase('transform'):
+            self.raise_event(self.TRANSFORM_RESULT, event_data=event_data)
+        with PROFILER.phase('query'):
+            self.raise_event(self.FILTER_RESULT, event_data=event_data)
 
         return CommandResultItem(event_data['result'],
                                  table_transformer=command_table[args.command].table_transformer,
@@ -172,8 +197,10 @@ class Application(object):
     def raise_event(self, name, **kwargs):
         '''Raise the event `name`.
         '''
-        data = truncate_text(str(kwargs), width=500)
-        logger.debug("Application event '%s' with event data %s", name, data)
+        if logger.isEnabledFor(logging.DEBUG):
+            # formatting the event data walks the whole result, so only do it when it is logged
+            data = truncate_text(str(kwargs), width=500)
+            logger.debug("Application event '%s' with event data %s", name, data)
         for func in list(self._event_handlers[name]):  # Make copy in case handler modifies the list
             func(**kwargs)
 
@@ -214,6 +241,13 @@ class Application(object):
                                   help='Increase logging verbosity. Use --debug for full debug logs.')  # pylint: disable=line-too-long
         global_group.add_argument('--debug', dest='_log_verbosity_debug', action='store_true',
                                   help='Increase logging verbosity to show all debug logs.')
+        # Like verbosity, --profile is consumed before argparse runs and is only added for help.
+        global_group.add_argument('--profile', dest='_profile', nargs='?', const='json',
+                                  choices=PROFILE_REPORT_FORMATS,
+                                  help='Write a timing profile of the command to stderr. '
+                                       'Use --profile folded for flame graph tools. As --profile '
+                                       'is taken by the profiler, arguments such as --profile-name '
+                                       'must be given in full.')
 
     @staticmethod
     def _maybe_load_file(arg):
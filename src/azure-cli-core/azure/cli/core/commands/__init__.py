@@ -21,9 +21,10 @@ from azure.cli.core._util import CLIError
 from azure.cli.core.application import APPLICATION
 from azure.cli.core.prompting import prompt_y_n, NoTTYException
 from azure.cli.core._config import az_config
+from azure.cli.core.profiler import PROFILER
 
-from ._introspection import (extract_args_from_signature,
-                             extract_full_summary_from_signature)
+from ._introspection import (extract_args_from_operation,
+                             extract_full_summary_from_operation)
 
 logger = azlogging.get_az_logger(__name__)
 
@@ -239,7 +240,8 @@ def get_command_table(module_name=None):
     loaded = False
     if module_name and module_name != 'acs' and module_name not in BLACKLISTED_MODS:
         try:
-            import_module('azure.cli.command_modules.' + module_name).load_commands()
+            with PROFILER.phase(module_name):
+                import_module('azure.cli.command_modules.' + module_name).load_commands()
             logger.debug("Successfully loaded command table from module '%s'.", module_name)
             loaded = True
         except ImportError:
@@ -260,7 +262,8 @@ def get_command_table(module_name=None):
         for mod in installed_command_modules:
             try:
                 start_time = timeit.default_timer()
-                import_module('azure.cli.command_modules.' + mod).load_commands()
+                with PROFILER.phase(mod):
+                    import_module('azure.cli.command_modules.' + mod).load_commands()
                 elapsed_time = timeit.default_timer() - start_time
                 logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
                 cumulative_elapsed_time += elapsed_time
@@ -319,6 +322,41 @@ def create_command(module_name, name, operation,
     if not isinstance(operation, string_types):
         raise ValueError("Operation must be a string. Got '{}'".format(operation))
 
+    def _handle_exception(ex):
+        from msrest.exceptions import ClientException
+        from azure.common import AzureException
+
+        if isinstance(ex, ClientException):
+            fault_type = name.replace(' ', '-') + '-client-error'
+            telemetry.set_exception(ex, fault_type=fault_type,
+                                    summary='Unexpected client exception during command creation')
+            message = getattr(ex, 'message', ex)
+            raise _polish_rp_not_registerd_error(CLIError(message))
+        elif isinstance(ex, AzureException):
+            fault_type = name.replace(' ', '-') + '-service-error'
+            telemetry.set_exception(ex, fault_type=fault_type,
+                                    summary='Unexpected azure exception during command creation')
+            message = re.search(r"([A-Za-z\t .])+", str(ex))
+            raise CLIError('\n{}'.format(message.group(0) if message else str(ex)))
+        elif isinstance(ex, ValueError):
+            fault_type = name.replace(' ', '-') + '-value-error'
+            telemetry.set_exception(ex, fault_type=fault_type,
+                                    summary='Unexpected value exception during command creation')
+            raise CLIError(ex)
+        else:
+            raise _polish_rp_not_registerd_error(ex)
+
+    def _iter_paged(result):
+        from msrest.exceptions import ClientException
+        from azure.common import AzureException
+
+        # pages are requested as the items are read, which is after the command has returned
+        try:
+            for item in result:
+                yield item
+        except (ClientException, AzureException, ValueError, CLIError) as ex:
+            _handle_exception(ex)
+
     def _execute_command(kwargs):
         from msrest.paging import Paged
         from msrest.exceptions import ClientException
@@ -353,37 +391,20 @@ def create_command(module_name, name, operation,
             if isinstance(result, AzureOperationPoller):
                 return LongRunningOperation('Starting {}'.format(name))(result)
             elif isinstance(result, Paged):
-                return list(result)
+                return _iter_paged(result)
             else:
                 return result
-        except ClientException as client_exception:
-            fault_type = name.replace(' ', '-') + '-client-error'
-            telemetry.set_exception(client_exception, fault_type=fault_type,
-                                    summary='Unexpected client exception during command creation')
-            message = getattr(client_exception, 'message', client_exception)
-            raise _polish_rp_not_registerd_error(CLIError(message))
-        except AzureException as azure_exception:
-            fault_type = name.replace(' ', '-') + '-service-error'
-            telemetry.set_exception(azure_exception, fault_type=fault_type,
-                                    summary='Unexpected azure exception during command creation')
-            message = re.search(r"([A-Za-z\t .])+", str(azure_exception))
-            raise CLIError('\n{}'.format(message.group(0) if message else str(azure_exception)))
-        except ValueError as value_error:
-            fault_type = name.replace(' ', '-') + '-value-error'
-            telemetry.set_exception(value_error, fault_type=fault_type,
-                                    summary='Unexpected value exception during command creation')
-            raise CLIError(value_error)
-        except CLIError as cli_error:
-            raise _polish_rp_not_registerd_error(cli_error)
+        except (ClientException, AzureException, ValueError, CLIError) as ex:
+            _handle_exception(ex)
 
     command_module_map[name] = module_name
     name = ' '.join(name.split())
 
     def arguments_loader():
-        return extract_args_from_signature(get_op_handler(operation), no_wait_param=no_wait_param)
+        return extract_args_from_operation(operation, no_wait_param=no_wait_param)
 
     def description_loader():
-        return extract_full_summary_from_signature(get_op_handler(operation))
+        return extract_full_summary_from_operation(operation)
 
     cmd = CliCommand(name, _execute_command, table_transformer=table_transformer,
                      arguments_loader=arguments_loader, description_loader=description_loader)
@@ -436,24 +457,77 @@ def _get_cli_extra_arguments(command):
     return _cli_extra_argument_registry[command].items()
 
 
+class _ArgumentScope(object):
+    __slots__ = ('children', 'arguments', 'merged')
+
+    def __init__(self):
+        self.children = {}
+        self.arguments = {}
+        self.merged = {}
+
+
 class _ArgumentRegistry(object):
+    """ Keeps the registered arguments in a trie of scopes keyed by command word, so resolving an
+    argument of a command walks its words once instead of probing every prefix. The settings merged
+    down to each scope and the results per command are memoized until an argument with the same
+    name is registered for an enclosing scope. """
+
     def __init__(self):
-        self.arguments = defaultdict(lambda: {})
+        self.root = _ArgumentScope()
+        self._resolved = defaultdict(dict)
 
     def register_cli_argument(self, scope, dest, argtype, **kwargs):
         argument = CliArgumentType(overrides=argtype,
                                    **kwargs)
-        self.arguments[scope][dest] = argument
+        parts = scope.split()
+        node = self.root
+        for part in parts:
+            node = node.children.setdefault(part, _ArgumentScope())
+        node.arguments[dest] = argument
+        self._invalidate(node, parts, dest)
+
+    def _invalidate(self, node, parts, name):
+        if name not in self._resolved:
+            return  # never resolved, so nothing is memoized for it
+        resolved = self._resolved[name]
+        for command in [c for c in resolved if c.split()[:len(parts)] == parts]:
+            del resolved[command]
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            node.merged.pop(name, None)
+            pending.extend(node.children.values())
 
-    def get_cli_argument(self, command, name):
-        parts = command.split()
-        result = CliArgumentType()
-        for index in range(0, len(parts) + 1):
-            probe = ' '.join(parts[0:index])
-            override = self.arguments.get(probe, {}).get(name, None)
+    @staticmethod
+    def _merge(node, name, settings):
+        try:
+            return node.merged[name]
+        except KeyError:
+            override = node.arguments.get(name)
             if override:
-                result.update(override)
-        return result
+                settings = dict(settings)
+                settings.update(override.settings)
+            node.merged[name] = settings
+            return settings
+
+    def _resolve(self, command, name):
+        node = self.root
+        settings = self._merge(node, name, {})
+        for part in command.split():
+            node = node.children.get(part)
+            if node is None:
+                break
+            settings = self._merge(node, name, settings)
+        return settings
+
+    def get_cli_argument(self, command, name):
+        """ The result is shared between calls, so callers must copy rather than change it. """
+        resolved = self._resolved[name]
+        try:
+            return resolved[command]
+        except KeyError:
+            result = resolved[command] = CliArgumentType(**self._resolve(command, name))
+            return result
 
 
 _cli_argument_registry = _ArgumentRegistry()
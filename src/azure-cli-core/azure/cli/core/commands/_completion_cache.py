@@ -0,0 +1,158 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Caches the values offered by shell completion for resource groups and resource names, per
+subscription, so pressing TAB doesn't list them from ARM every time. Values older than the TTL are
+still offered while a background process lists them again, and create and delete commands drop the
+values of the resource types they complete. Locations are kept apart, by _locations.
+
+Cache keys are 'resourceGroups', 'resources/<type>' for the resources of a type in the
+subscription and 'resources/<type>:<resource group>' for those in a resource group, where the type
+is '*' for resources of any type. Neither types, which may be nested as in
+'Microsoft.Compute/virtualMachines/extensions', nor resource group names can contain a ':'.
+"""
+
+import bisect
+import os
+import sys
+import time
+
+COMPLETION_CACHE_DIR_NAME = 'completionCache'
+COMPLETION_CACHE_TTL = 300
+RESOURCES_KEY_PREFIX = 'resources/'
+RESOURCE_GROUP_SEPARATOR = ':'
+
+
+def get_resources_key(resource_type=None, resource_group_name=None):
+    key = RESOURCES_KEY_PREFIX + (resource_type or '*').lower()
+    if resource_group_name:
+        key += RESOURCE_GROUP_SEPARATOR + resource_group_name.lower()
+    return key
+
+
+def _get_ttl():
+    from azure.cli.core._config import az_config
+    return az_config.getint('core', 'completion_cache_ttl', fallback=COMPLETION_CACHE_TTL)
+
+
+def _get_cache(create=True):
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._profile import Profile
+    from azure.cli.core._session import Session
+    from azure.cli.core._util import CLIError
+
+    try:
+        subscription_id = Profile().get_subscription()['id']
+    except CLIError:
+        if create:
+            raise
+        return None  # nothing can have been cached without an account
+    directory = os.path.join(get_config_dir(), COMPLETION_CACHE_DIR_NAME)
+    path = os.path.join(directory, '{}.json'.format(subscription_id))
+    if not os.path.isfile(path):
+        if not create:
+            return None
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+    cache = Session()
+    cache.load(path)
+    return cache
+
+
+def _list_values(key):
+    from azure.cli.core.commands.parameters import (get_resource_groups,
+                                                    get_resources_in_resource_group,
+                                                    get_resources_in_subscription)
+    if key == 'resourceGroups':
+        return [g.name for g in get_resource_groups()]
+    resource_type, _, resource_group_name = \
+        key[len(RESOURCES_KEY_PREFIX):].partition(RESOURCE_GROUP_SEPARATOR)
+    resource_type = None if resource_type == '*' else resource_type
+    if resource_group_name:
+        return [r.name for r in get_resources_in_resource_group(resource_group_name,
+                                                                resource_type=resource_type)]
+    return [r.name for r in get_resources_in_subscription(resource_type=resource_type)]
+
+
+def _store(cache, key, values):
+    values = sorted(set(values), key=lambda v: (v.lower(), v))
+    entry = {'time': time.time(), 'keys': [v.lower() for v in values], 'values': values}
+    cache[key] = entry
+    return entry
+
+
+def _refresh_in_background(key):
+    import subprocess
+    with open(os.devnull, 'w') as devnull:
+        subprocess.Popen([sys.executable, '-m', __name__, key],
+                         stdin=devnull, stdout=devnull, stderr=devnull)
+
+
+def get_completions(key, prefix=None):
+    """ The values for a cache key that start with the prefix, ignoring case. They are listed when
+    they aren't cached yet, and listed again in the background once they are older than the
+    TTL. """
+    cache = _get_cache()
+    entry = cache.get(key)
+    now = time.time()
+    if not entry:
+        entry = _store(cache, key, _list_values(key))
+    elif now - entry['time'] > _get_ttl() and now - entry.get('refreshed', 0) > _get_ttl():
+        entry['refreshed'] = now
+        cache.save_with_retry()
+        _refresh_in_background(key)
+
+    keys = entry['keys']
+    prefix = (prefix or '').lower()
+    start = end = bisect.bisect_left(keys, prefix)
+    while end < len(keys) and keys[end].startswith(prefix):
+        end += 1
+    return entry['values'][start:end]
+
+
+def invalidate_completions(keys):
+    """ Drops the cached values of the keys, and of the keys under them: 'resources' drops those of
+    every resource and 'resources/<type>' those of the resources of a type, and of its child
+    types, in any resource group.
+    """
+    cache = _get_cache(create=False)
+    if cache is None:
+        return
+    keys = tuple(keys)
+    prefixes = tuple(k + s for k in keys for s in ('/', RESOURCE_GROUP_SEPARATOR))
+    with cache:
+        for key in [k for k in cache if k in keys or k.startswith(prefixes)]:
+            del cache[key]
+
+
+def invalidate_command_completions(command):
+    """ Drops the cached values a create or delete command may have changed. Those are the resources
+    of the types its arguments complete, or every resource group and resource for the commands of
+    resource groups. """
+    if command.name.split()[0] == 'group':
+        keys = set(['resourceGroups', RESOURCES_KEY_PREFIX.rstrip('/')])
+    else:
+        keys = set(getattr(argument.completer, 'completion_cache_key', None)
+                   for argument in command.arguments.values())
+        keys.discard(None)
+        if keys:
+            # the resources of any type include the resources of these types
+            keys.add(get_resources_key())
+    if keys:
+        invalidate_completions(keys)
+
+
+def _refresh(key):
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import ACCOUNT, CONFIG
+
+    ACCOUNT.load(os.path.join(get_config_dir(), 'azureProfile.json'))
+    CONFIG.load(os.path.join(get_config_dir(), 'az.json'))
+    _store(_get_cache(), key, _list_values(key))
+
+
+if __name__ == '__main__':
+    _refresh(sys.argv[1])
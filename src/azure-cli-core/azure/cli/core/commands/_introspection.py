@@ -4,7 +4,22 @@
 # --------------------------------------------------------------------------------------------
 
 import inspect
+import marshal
+import os
 import re
+import sys
+
+# Extracted summaries and arguments are cached on disk per operation, so handlers only have to be
+# imported and introspected again when the file defining them changes. The cache is dropped when
+# the core version changes, as the extraction logic may have changed with it. Bump the version
+# when the cache layout changes.
+ARGUMENT_SPEC_CACHE_VERSION = 2
+ARGUMENT_SPEC_CACHE_FILE_NAME = 'argSpecCache.{}.{}{}.marshal'.format(ARGUMENT_SPEC_CACHE_VERSION,
+                                                                     *sys.version_info[:2])
+
+_argument_spec_cache = None
+_argument_spec_cache_dirty = False
+_source_mtimes = {}
 
 
 def extract_full_summary_from_signature(operation):
@@ -121,3 +136,101 @@ def extract_args_from_signature(operation, no_wait_param=None):
     if no_wait_param and not found_no_wait_param:
         raise ValueError("Command authoring error: unable to enable no-wait option. Operation '{}' "
                          "does not have a '{}' parameter.".format(operation, no_wait_param))
+
+
+def _get_argument_spec_cache_path():
+    from azure.cli.core._environment import get_config_dir
+    return os.path.join(get_config_dir(), ARGUMENT_SPEC_CACHE_FILE_NAME)
+
+
+def _load_argument_spec_cache():
+    global _argument_spec_cache  # pylint: disable=global-statement
+    if _argument_spec_cache is None:
+        from azure.cli.core import __version__ as core_version
+        try:
+            with open(_get_argument_spec_cache_path(), 'rb') as f:
+                stored = marshal.loads(f.read())
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            stored = None
+        if isinstance(stored, dict) and stored.get('coreVersion') == core_version:
+            _argument_spec_cache = stored['operations']
+        else:
+            _argument_spec_cache = {}
+    return _argument_spec_cache
+
+
+def save_argument_spec_cache():
+    """ Persists the specs extracted by this process, if any. """
+    global _argument_spec_cache_dirty  # pylint: disable=global-statement
+    if not _argument_spec_cache_dirty:
+        return
+    _argument_spec_cache_dirty = False
+    from azure.cli.core import __version__ as core_version
+    path = _get_argument_spec_cache_path()
+    try:
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            marshal.dump({'coreVersion': core_version, 'operations': _argument_spec_cache}, f)
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except (IOError, OSError):
+        pass  # the cache is an optimization only
+
+
+def _get_source_mtime(path):
+    # many operations share a source file, which won't change while the CLI runs
+    if path not in _source_mtimes:
+        try:
+            _source_mtimes[path] = os.path.getmtime(path)
+        except (OSError, TypeError):
+            _source_mtimes[path] = None
+    return _source_mtimes[path]
+
+
+def _get_operation_spec(operation):
+    """ Returns the cached spec of an operation such as 'package.module#Class.method' and its
+    handler, which is only imported when the spec is missing or the handler's file has changed. """
+    global _argument_spec_cache_dirty  # pylint: disable=global-statement
+    cache = _load_argument_spec_cache()
+    spec = cache.get(operation)
+    if spec and _get_source_mtime(spec['source']) == spec['mtime']:
+        return spec, None
+    from azure.cli.core.commands import get_op_handler
+    handler = get_op_handler(operation)
+    source = getattr(sys.modules.get(getattr(handler, '__module__', None)), '__file__', None)
+    spec = {'source': source,
+            'mtime': _get_source_mtime(source),
+            'summary': extract_full_summary_from_signature(handler),
+            'arguments': {}}
+    if spec['mtime'] is not None:
+        cache[operation] = spec
+        _argument_spec_cache_dirty = True
+    return spec, handler
+
+
+def extract_full_summary_from_operation(operation):
+    """ Same as extract_full_summary_from_signature for the handler of an operation string, but
+    served from the argument spec cache when possible. """
+    return _get_operation_spec(operation)[0]['summary']
+
+
+def extract_args_from_operation(operation, no_wait_param=None):
+    """ Same as extract_args_from_signature for the handler of an operation string, but served from
+    the argument spec cache when possible. """
+    from azure.cli.core.commands import CliCommandArgument, get_op_handler
+    global _argument_spec_cache_dirty  # pylint: disable=global-statement
+    spec, handler = _get_operation_spec(operation)
+    key = no_wait_param or ''
+    arguments = spec['arguments'].get(key)
+    if arguments is not None:
+        return [(name, CliCommandArgument(**settings)) for name, settings in arguments]
+
+    handler = handler or get_op_handler(operation)
+    extracted = list(extract_args_from_signature(handler, no_wait_param=no_wait_param))
+    arguments = [(name, dict(argument.type.settings)) for name, argument in extracted]
+    try:
+        marshal.dumps(arguments)
+    except ValueError:
+        return extracted  # defaults such as enum members can't be cached
+    spec['arguments'][key] = arguments
+    _argument_spec_cache_dirty = True
+    return extracted
@@ -0,0 +1,114 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Keeps the names and display names of the locations of each subscription, in process and in the
+config directory, so location arguments don't list them from ARM on every command. Locations
+change rarely: they are listed again only when they are older than the TTL or a display name isn't
+among them. The locations of the known clouds are bundled, so display names of those can be
+converted without an account or a network.
+"""
+
+import os
+import time
+
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+LOCATIONS_FILE_NAME = 'locations.json'
+LOCATIONS_TTL = 7 * 24 * 3600
+
+# (name, display name) of the locations of the known clouds
+KNOWN_LOCATIONS = {
+    'AzureCloud': [
+        ('australiaeast', 'Australia East'), ('australiasoutheast', 'Australia Southeast'),
+        ('brazilsouth', 'Brazil South'), ('canadacentral', 'Canada Central'),
+        ('canadaeast', 'Canada East'), ('centralindia', 'Central India'),
+        ('centralus', 'Central US'), ('eastasia', 'East Asia'), ('eastus', 'East US'),
+        ('eastus2', 'East US 2'), ('japaneast', 'Japan East'), ('japanwest', 'Japan West'),
+        ('koreacentral', 'Korea Central'), ('koreasouth', 'Korea South'),
+        ('northcentralus', 'North Central US'), ('northeurope', 'North Europe'),
+        ('southcentralus', 'South Central US'), ('southeastasia', 'Southeast Asia'),
+        ('southindia', 'South India'), ('uksouth', 'UK South'), ('ukwest', 'UK West'),
+        ('westcentralus', 'West Central US'), ('westeurope', 'West Europe'),
+        ('westindia', 'West India'), ('westus', 'West US'), ('westus2', 'West US 2')],
+    'AzureChinaCloud': [('chinaeast', 'China East'), ('chinanorth', 'China North')],
+    'AzureUSGovernment': [('usgoviowa', 'USGov Iowa'), ('usgovvirginia', 'USGov Virginia')],
+    'AzureGermanCloud': [('germanycentral', 'Germany Central'),
+                         ('germanynortheast', 'Germany Northeast')]
+}
+
+_locations = {}
+
+
+def _get_ttl():
+    from azure.cli.core._config import az_config
+    return az_config.getint('core', 'location_cache_ttl', fallback=LOCATIONS_TTL)
+
+
+def _get_key():
+    from azure.cli.core._profile import Profile
+    from azure.cli.core.cloud import get_active_cloud_name
+    return '{}/{}'.format(get_active_cloud_name(), Profile().get_subscription()['id'])
+
+
+def _get_cache():
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import Session
+    cache = Session()
+    cache.load(os.path.join(get_config_dir(), LOCATIONS_FILE_NAME))
+    return cache
+
+
+def _get_kept(key):
+    entry = _locations.get(key) or _get_cache().get(key)
+    if entry and time.time() - entry['time'] <= _get_ttl():
+        _locations[key] = entry
+        return entry
+    return None
+
+
+def _list(key):
+    from azure.cli.core.commands.parameters import get_subscription_locations
+    entry = {'time': time.time(),
+             'locations': [[l.name, l.display_name] for l in get_subscription_locations()]}
+    _get_cache()[key] = entry
+    _locations[key] = entry
+    return entry
+
+
+def get_locations():
+    """ The (name, display name) of the locations of the current subscription. They are listed
+    when they aren't kept yet or are older than the TTL. """
+    key = _get_key()
+    entry = _get_kept(key) or _list(key)
+    return [tuple(l) for l in entry['locations']]
+
+
+def get_location_name(display_name):
+    """ The name of the location with a display name, ignoring case, or None. The bundled locations
+    are searched before listing those of the subscription. """
+    from azure.cli.core._util import CLIError
+    from azure.cli.core.cloud import get_active_cloud_name
+    display_name = display_name.lower()
+    known = KNOWN_LOCATIONS.get(get_active_cloud_name(), [])
+
+    def _find(locations):
+        return next((n for n, d in locations if d.lower() == display_name), None)
+
+    try:
+        key = _get_key()
+    except CLIError:
+        return _find(known)
+    entry = _get_kept(key)
+    name = (_find(entry['locations']) if entry else None) or _find(known)
+    if name is None:
+        # a location may have been added since they were listed
+        try:
+            name = _find(_list(key)['locations'])
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug("Unable to list the locations: %s", ex)
+    return name
@@ -12,7 +12,7 @@ from azure.cli.core.commands import (CliCommand,
                                      get_op_handler,
                                      command_table as main_command_table,
                                      command_module_map as main_command_module_map)
-from azure.cli.core.commands._introspection import extract_args_from_signature
+from azure.cli.core.commands._introspection import extract_args_from_operation
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.application import APPLICATION, IterateValue
 import azure.cli.core.azlogging as azlogging
@@ -220,14 +220,13 @@ def cli_generic_update_command(module_name, name, getter_op, setter_op, factory=
             custom_function_op))
 
     def get_arguments_loader():
-        return dict(extract_args_from_signature(get_op_handler(getter_op)))
+        return dict(extract_args_from_operation(getter_op))
 
     def set_arguments_loader():
-        return dict(extract_args_from_signature(get_op_handler(setter_op),
-                                                no_wait_param=no_wait_param))
+        return dict(extract_args_from_operation(setter_op, no_wait_param=no_wait_param))
 
     def function_arguments_loader():
-        return dict(extract_args_from_signature(get_op_handler(custom_function_op))) \
+        return dict(extract_args_from_operation(custom_function_op)) \
             if custom_function_op else {}
 
     def arguments_loader():
@@ -362,7 +361,7 @@ def cli_generic_wait_command(module_name, name, getter_op, factory=None):
         raise ValueError("Getter operation must be a string. Got '{}'".format(type(getter_op)))
 
     def get_arguments_loader():
-        return dict(extract_args_from_signature(get_op_handler(getter_op)))
+        return dict(extract_args_from_operation(getter_op))
 
     def arguments_loader():
         arguments = {}
@@ -10,6 +10,7 @@ import azure.cli.core._debug as _debug
 import azure.cli.core.azlogging as azlogging
 from azure.cli.core._util import CLIError
 from azure.cli.core.application import APPLICATION
+from azure.cli.core.profiler import PROFILER
 from azure.storage._error import _ERROR_STORAGE_MISSING_INFO
 
 logger = azlogging.get_az_logger(__name__)
@@ -19,13 +20,15 @@ ENV_ADDITIONAL_USER_AGENT = 'AZURE_HTTP_USER_AGENT'
 
 
 def get_mgmt_service_client(client_type, subscription_id=None, api_version=None):
-    client, _ = _get_mgmt_service_client(client_type, subscription_id=subscription_id,
-                                         api_version=api_version)
+    with PROFILER.phase('client_creation'):
+        client, _ = _get_mgmt_service_client(client_type, subscription_id=subscription_id,
+                                             api_version=api_version)
     return client
 
 
 def get_subscription_service_client(client_type):
-    return _get_mgmt_service_client(client_type, False)
+    with PROFILER.phase('client_creation'):
+        return _get_mgmt_service_client(client_type, False)
 
 
 def configure_common_settings(client):
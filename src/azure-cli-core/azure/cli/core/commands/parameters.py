@@ -8,6 +8,7 @@ import argparse
 import platform
 
 from azure.cli.core.commands import CliArgumentType, register_cli_argument
+from azure.cli.core.commands._completion_cache import get_completions, get_resources_key
 from azure.cli.core.commands.validators import validate_tag, validate_tags
 from azure.cli.core._util import CLIError
 from azure.cli.core.commands.validators import generate_deployment_name
@@ -21,8 +22,8 @@ def get_subscription_locations():
 
 
 def get_location_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
-    result = get_subscription_locations()
-    return [l.name for l in result]
+    from azure.cli.core.commands._locations import get_locations
+    return [name for name, _ in get_locations() if name.startswith(prefix.lower())]
 
 
 def file_type(path):
@@ -33,15 +34,16 @@ def file_type(path):
 def location_name_type(name):
     if ' ' in name:
         # if display name is provided, attempt to convert to short form name
-        name = next((l.name for l in get_subscription_locations()
-                     if l.display_name.lower() == name.lower()), name)
+        from azure.cli.core.commands._locations import get_location_name
+        name = get_location_name(name) or name
     return name
 
 
 def get_one_of_subscription_locations():
-    result = get_subscription_locations()
+    from azure.cli.core.commands._locations import get_locations
+    result = [name for name, _ in get_locations()]
     if result:
-        return next((r.name for r in result if r.name.lower() == 'westus'), result[0].name)
+        return next((name for name in result if name.lower() == 'westus'), result[0])
     else:
         raise CLIError('Current subscription does not have valid location list')
 
@@ -54,8 +56,7 @@ def get_resource_groups():
 
 
 def get_resource_group_completion_list(prefix, **kwargs):  # pylint: disable=unused-argument
-    result = get_resource_groups()
-    return [l.name for l in result]
+    return get_completions('resourceGroups', prefix)
 
 
 def get_resources_in_resource_group(resource_group_name, resource_type=None):
@@ -76,11 +77,10 @@ def get_resources_in_subscription(resource_type=None):
 
 def get_resource_name_completion_list(resource_type=None):
     def completer(prefix, action, parsed_args, **kwargs):  # pylint: disable=unused-argument
-        if getattr(parsed_args, 'resource_group_name', None):
-            rg = parsed_args.resource_group_name
-            return [r.name for r in get_resources_in_resource_group(rg, resource_type=resource_type)]
-        else:
-            return [r.name for r in get_resources_in_subscription(resource_type=resource_type)]
+        rg = getattr(parsed_args, 'resource_group_name', None)
+        return get_completions(get_resources_key(resource_type, rg), prefix)
+    # lets create and delete commands find the cached names they change
+    completer.completion_cache_key = get_resources_key(resource_type)
     return completer
 
 
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Registers the resource providers a command needs with the current subscription. The providers are
+checked and registered concurrently, and registration is waited for, as a provider can't be used
+until it's registered. The providers found registered are kept in the config directory, so they
+are only checked again when they are older than the TTL.
+"""
+
+import os
+import time
+
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+PROVIDERS_FILE_NAME = 'providers.json'
+PROVIDERS_TTL = 24 * 3600
+REGISTRATION_TIMEOUT = 300
+REGISTERED = 'Registered'
+
+
+def _get_providers_client():
+    from azure.mgmt.resource.resources import ResourceManagementClient
+    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    return get_mgmt_service_client(ResourceManagementClient).providers
+
+
+def _get_cache():
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import Session
+    cache = Session()
+    cache.load(os.path.join(get_config_dir(), PROVIDERS_FILE_NAME))
+    return cache
+
+
+def _get_key(providers):
+    from azure.cli.core.cloud import get_active_cloud_name
+    return '{}/{}'.format(get_active_cloud_name(), providers.config.subscription_id)
+
+
+def _register(providers, namespace, timeout):
+    state = providers.get(namespace).registration_state
+    if state == REGISTERED:
+        logger.info('%s is already registered', namespace)
+        return state
+    if state != 'Registering':
+        logger.info('registering %s', namespace)
+        providers.register(namespace)
+    deadline = time.time() + timeout
+    delay = 1
+    while time.time() < deadline:
+        time.sleep(min(delay, max(deadline - time.time(), 0)))
+        delay = min(delay * 2, 30)
+        state = providers.get(namespace).registration_state
+        if state == REGISTERED:
+            return state
+    logger.warning("Registering %s is still on-going. You can monitor using "
+                   "'az provider show -n %s'", namespace, namespace)
+    return state
+
+
+def register_providers(namespaces, providers=None, timeout=REGISTRATION_TIMEOUT):
+    """ Registers the providers with the current subscription, waiting up to timeout seconds for
+    them to be registered. Returns the registration state of each. """
+    from concurrent.futures import ThreadPoolExecutor
+    providers = providers or _get_providers_client()
+    cache = _get_cache()
+    key = _get_key(providers)
+    kept = dict((n, t) for n, t in cache.get(key, {}).items()
+                if time.time() - t <= PROVIDERS_TTL)
+    states = dict((n, REGISTERED) for n in namespaces if n in kept)
+    unknown = [n for n in namespaces if n not in kept]
+    if unknown:
+        with ThreadPoolExecutor(max_workers=len(unknown)) as executor:
+            states.update(zip(unknown, executor.map(lambda n: _register(providers, n, timeout),
+                                                    unknown)))
+        kept.update((n, time.time()) for n in unknown if states[n] == REGISTERED)
+        cache[key] = kept
+    return states
+
+
+def forget_provider_registration(namespace, providers=None):
+    """ Checks the registration of the provider again the next time it's needed. """
+    providers = providers or _get_providers_client()
+    cache = _get_cache()
+    key = _get_key(providers)
+    kept = cache.get(key, {})
+    if namespace in kept:
+        del kept[namespace]
+        cache[key] = kept
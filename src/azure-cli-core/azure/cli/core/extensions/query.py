@@ -4,6 +4,53 @@
 # --------------------------------------------------------------------------------------------
 
 import collections
+import marshal
+import os
+import sys
+from types import GeneratorType
+
+# Parsed queries are cached on disk, so scripts that run the same queries over and over don't
+# parse them every time. Bump the version when the cache layout changes.
+QUERY_CACHE_VERSION = 1
+QUERY_CACHE_MAX_SIZE = 500
+
+_query_cache = None
+_query_cache_dirty = False
+
+
+def _get_query_cache_path():
+    from jmespath import __version__ as jmespath_version
+    from azure.cli.core._environment import get_config_dir
+    # the parsed form of a query is specific to the JMESPath version that parsed it
+    return os.path.join(get_config_dir(), 'queryCache.{}.{}.{}{}.marshal'.format(
+        QUERY_CACHE_VERSION, jmespath_version, *sys.version_info[:2]))
+
+
+def _load_query_cache():
+    global _query_cache  # pylint: disable=global-statement
+    if _query_cache is None:
+        try:
+            with open(_get_query_cache_path(), 'rb') as f:
+                _query_cache = marshal.loads(f.read())
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            _query_cache = {}
+    return _query_cache
+
+
+def save_query_cache():
+    """ Persists the queries parsed by this process, if any. """
+    global _query_cache_dirty  # pylint: disable=global-statement
+    if not _query_cache_dirty:
+        return
+    _query_cache_dirty = False
+    path = _get_query_cache_path()
+    try:
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            marshal.dump(_query_cache, f)
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except (IOError, OSError):
+        pass  # the cache is an optimization only
 
 
 def jmespath_type(raw_query):
@@ -12,12 +59,56 @@ def jmespath_type(raw_query):
        In addition though, JMESPath can raise a KeyError.
        ValueErrors are caught by argparse so argument errors can be generated.
     '''
+    global _query_cache_dirty  # pylint: disable=global-statement
+    from jmespath.parser import ParsedResult
+    cache = _load_query_cache()
+    parsed = cache.get(raw_query)
+    if parsed is not None:
+        return ParsedResult(raw_query, parsed)
+
     from jmespath import compile as compile_jmespath
     try:
-        return compile_jmespath(raw_query)
+        compiled = compile_jmespath(raw_query)
     except KeyError:
         # Raise a ValueError which argparse can handle
         raise ValueError
+    try:
+        marshal.dumps(compiled.parsed)
+    except ValueError:
+        return compiled
+    if len(cache) >= QUERY_CACHE_MAX_SIZE:
+        cache.clear()
+    cache[raw_query] = compiled.parsed
+    _query_cache_dirty = True
+    return compiled
+
+
+def _is_element_wise(parsed):
+    """ Whether a query applies to each item of a list result on its own and collects what isn't
+    null, like '[].name', '[*].{name:name}' and "[?location=='westus']" do. """
+    if parsed['type'] not in ('projection', 'filter_projection'):
+        return False
+    base = parsed['children'][0]
+    if base['type'] == 'flatten':
+        base = base['children'][0]
+    return base['type'] == 'identity'
+
+
+def search_query(query_expression, result):
+    """ Applies a compiled query to a result. A result that is still being produced, such as the
+    pages of a list command, is only read as the output asks for it if the query allows that. """
+    from jmespath import Options
+    options = Options(collections.OrderedDict)
+    if isinstance(result, GeneratorType):
+        if _is_element_wise(query_expression.parsed):
+            # the query of a list with one item is the query of that item, so the queries of the
+            # items one by one add up to the query of the whole list
+            from jmespath.visitor import TreeInterpreter
+            interpreter = TreeInterpreter(options)
+            return (value for item in result
+                    for value in interpreter.visit(query_expression.parsed, [item]))
+        result = list(result)
+    return query_expression.search(result, options)
 
 
 def _register_global_parameter(global_group):
@@ -38,12 +129,12 @@ def register(application):
         del args._jmespath_query
         if query_expression:
             def filter_output(**kwargs):
-                from jmespath import search, Options
-                kwargs['event_data']['result'] = query_expression.search(
-                    kwargs['event_data']['result'], Options(collections.OrderedDict))
+                kwargs['event_data']['result'] = search_query(query_expression,
+                                                              kwargs['event_data']['result'])
                 application.remove(application.FILTER_RESULT, filter_output)
             application.register(application.FILTER_RESULT, filter_output)
             application.session['query_active'] = True
+            save_query_cache()
 
     application.register(application.GLOBAL_PARSER_CREATED, _register_global_parameter)
     application.register(application.COMMAND_PARSER_PARSED, handle_query_parameter)
@@ -5,9 +5,8 @@
 
 import re
 
-
-def register(application):
-    application.register(application.TRANSFORM_RESULT, _resource_group_transform)
+# Command results get their resource groups while todict converts them, in the same pass. These
+# helpers do the same for results that are already plain dicts and lists.
 
 
 def _parse_id(strid):
@@ -34,7 +33,3 @@ def _add_resource_group(obj):
             pass
         for item_key in obj:
             _add_resource_group(obj[item_key])
-
-
-def _resource_group_transform(**kwargs):
-    _add_resource_group(kwargs['event_data']['result'])
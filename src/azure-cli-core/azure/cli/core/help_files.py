@@ -3,14 +3,108 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import hashlib
+import marshal
+import os
+import sys
+
 
 # modules should add entries to helps in the form: "group command": "YAML help"
 helps = {}
 
+# Parsed help is cached on disk keyed by a digest of its YAML text, so entries are only parsed
+# again when their text changes. Bump the version when the cache layout changes.
+HELP_CACHE_VERSION = 1
+HELP_CACHE_FILE_NAME = 'helpCache.{}.{}{}.marshal'.format(HELP_CACHE_VERSION, *sys.version_info[:2])
 
-def _load_help_file(delimiters):
+_help_cache = None
+# parsed help that marshal can't store (such as YAML dates), kept for this process only
+_uncached_helps = {}
+
+
+def _get_help_cache_path():
+    from azure.cli.core._environment import get_config_dir
+    return os.path.join(get_config_dir(), HELP_CACHE_FILE_NAME)
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _parse_help_yaml(text):
     import yaml
-    if delimiters in helps:
-        return yaml.load(helps[delimiters])
-    else:
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
+
+
+def _load_help_cache():
+    global _help_cache  # pylint: disable=global-statement
+    if _help_cache is None:
+        try:
+            with open(_get_help_cache_path(), 'rb') as f:
+                _help_cache = marshal.load(f)
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            _help_cache = {}
+    return _help_cache
+
+
+def _save_help_cache(cache):
+    path = _get_help_cache_path()
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(temp_path, 'wb') as f:
+            marshal.dump(cache, f)
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except (IOError, OSError, ValueError):
+        # the cache is an optimization only
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _get_compiled_help(cache, delimiters):
+    return cache.get(delimiters) or _uncached_helps.get(delimiters)
+
+
+def _compile_helps(cache):
+    """
+    Parses every registered help entry that is missing from, or stale in, the cache. Entries that
+    marshal can't store are kept out of the cache, so they don't keep the others from being saved.
+    """
+    from yaml import YAMLError
+    stale = False
+    for delimiters, text in helps.items():
+        digest = _digest(text)
+        entry = _get_compiled_help(cache, delimiters)
+        if entry is not None and entry[0] == digest:
+            continue
+        try:
+            parsed = _parse_help_yaml(text)
+        except YAMLError:
+            continue  # reported when this entry itself is rendered
+        try:
+            marshal.dumps(parsed)
+        except ValueError:
+            _uncached_helps[delimiters] = (digest, parsed)
+            stale = cache.pop(delimiters, None) is not None or stale
+            continue
+        cache[delimiters] = (digest, parsed)
+        _uncached_helps.pop(delimiters, None)
+        stale = True
+    if stale:
+        _save_help_cache(cache)
+
+
+def _load_help_file(delimiters):
+    if delimiters not in helps:
         return None
+    cache = _load_help_cache()
+    entry = _get_compiled_help(cache, delimiters)
+    digest = _digest(helps[delimiters])
+    if entry is None or entry[0] != digest:
+        _compile_helps(cache)
+        entry = _get_compiled_help(cache, delimiters)
+        if entry is None or entry[0] != digest:
+            return _parse_help_yaml(helps[delimiters])
+    return entry[1]
@@ -0,0 +1,218 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Per-phase profiling of a CLI invocation, enabled with the --profile global argument.
+
+Phases are nested, e.g. az;execute;command;client_creation, and record wall time, CPU time and
+(where tracemalloc is available) the net memory allocated. HTTP requests made through requests
+are counted with their latency and payload sizes. The report is written to stderr either as JSON
+or as folded stacks that flame graph tools (flamegraph.pl, speedscope) accept.
+
+Only the Python Standard Library is imported here so the profiler can be enabled before the rest
+of the CLI is imported.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import threading
+import time
+
+PROFILE_FLAG = '--profile'
+REPORT_FORMATS = ['json', 'folded']
+
+_cpu_time = getattr(time, 'process_time', None) or time.clock  # pylint: disable=no-member
+
+
+def _allocated_memory():
+    try:
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    except ImportError:
+        return None
+
+
+class _PhaseNode(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.allocated = None
+        self.children = OrderedDict()
+
+    def child(self, name):
+        try:
+            return self.children[name]
+        except KeyError:
+            node = self.children[name] = _PhaseNode(name)
+            return node
+
+    def to_dict(self):
+        result = OrderedDict([('name', self.name),
+                              ('count', self.count),
+                              ('wallSeconds', round(self.wall, 6)),
+                              ('cpuSeconds', round(self.cpu, 6))])
+        if self.allocated is not None:
+            result['allocatedBytes'] = self.allocated
+        if self.children:
+            result['phases'] = [c.to_dict() for c in self.children.values()]
+        return result
+
+    def folded(self, prefix=''):
+        stack = prefix + self.name
+        own_time = self.wall - sum(c.wall for c in self.children.values())
+        lines = ['{} {}'.format(stack, max(int(own_time * 1000000), 0))]
+        for c in self.children.values():
+            lines.extend(c.folded(stack + ';'))
+        return lines
+
+
+class Profiler(object):
+    """ Collects the phase timings and HTTP statistics of the current invocation. Phases entered
+    on threads other than the one that enabled the profiler are not recorded, but their HTTP
+    requests are.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_format = 'json'
+        self._root = _PhaseNode('az')
+        self._stack = []
+        self._thread = None
+        self._lock = threading.Lock()
+        self.http_requests = []
+
+    def enable(self, report_format='json'):
+        if self.enabled:
+            return
+        try:
+            import tracemalloc
+            tracemalloc.start()
+        except ImportError:
+            pass
+        self.enabled = True
+        self.report_format = report_format
+        self._thread = threading.current_thread()
+        self._stack = [(self._root, time.time(), _cpu_time(), _allocated_memory())]
+
+    def begin(self, name):
+        if not self.enabled or threading.current_thread() is not self._thread:
+            return
+        node = self._stack[-1][0].child(name)
+        self._stack.append((node, time.time(), _cpu_time(), _allocated_memory()))
+
+    def end(self):
+        if not self.enabled or threading.current_thread() is not self._thread \
+                or len(self._stack) < 2:
+            return
+        self._close(*self._stack.pop())
+
+    @staticmethod
+    def _close(node, wall_start, cpu_start, allocated_start):
+        node.count += 1
+        node.wall += time.time() - wall_start
+        node.cpu += _cpu_time() - cpu_start
+        allocated = _allocated_memory()
+        if allocated is not None and allocated_start is not None:
+            node.allocated = (node.allocated or 0) + allocated - allocated_start
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def record_http_request(self, method, url, status_code, elapsed, bytes_sent, bytes_received):  # pylint: disable=too-many-arguments
+        with self._lock:
+            self.http_requests.append(OrderedDict([('method', method),
+                                                   ('url', url.split('?', 1)[0]),
+                                                   ('statusCode', status_code),
+                                                   ('latencySeconds', round(elapsed, 6)),
+                                                   ('bytesSent', bytes_sent),
+                                                   ('bytesReceived', bytes_received)]))
+
+    def _snapshot(self):
+        # close a copy of the root so the report can be taken while phases are still open
+        _, wall_start, cpu_start, allocated_start = self._stack[0]
+        root = _PhaseNode(self._root.name)
+        root.children = self._root.children
+        self._close(root, wall_start, cpu_start, allocated_start)
+        return root
+
+    def report(self):
+        with self._lock:
+            http_requests = list(self.http_requests)
+        return OrderedDict([
+            ('phases', [self._snapshot().to_dict()]),
+            ('http', OrderedDict([
+                ('count', len(http_requests)),
+                ('latencySeconds', round(sum(r['latencySeconds'] for r in http_requests), 6)),
+                ('bytesSent', sum(r['bytesSent'] for r in http_requests)),
+                ('bytesReceived', sum(r['bytesReceived'] for r in http_requests)),
+                ('requests', http_requests)]))])
+
+    def write_report(self, file):  # pylint: disable=redefined-builtin
+        if self.report_format == 'folded':
+            file.write('\n'.join(self._snapshot().folded()) + '\n')
+        else:
+            json.dump(self.report(), file, indent=2)
+            file.write('\n')
+
+
+PROFILER = Profiler()
+
+
+def _instrument_requests():
+    try:
+        import requests
+    except ImportError:
+        return
+    original_send = requests.Session.send
+    if getattr(original_send, 'is_profiled', False):
+        return
+
+    def send(session, request, **kwargs):
+        start = time.time()
+        response = original_send(session, request, **kwargs)
+        elapsed = time.time() - start
+        try:
+            sent = len(request.body or b'')
+        except TypeError:
+            sent = 0  # streamed upload
+        received = response.headers.get('Content-Length')
+        if received is None and not kwargs.get('stream'):
+            received = len(response.content or b'')
+        PROFILER.record_http_request(request.method, request.url, response.status_code, elapsed,
+                                     sent, int(received or 0))
+        return response
+    send.is_profiled = True
+    requests.Session.send = send
+
+
+def configure_profiling(argv):
+    """ Consume --profile, --profile FORMAT or --profile=FORMAT from argv and enable the profiler
+    if it was given. """
+    report_format = None
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == PROFILE_FLAG:
+            argv.pop(i)
+            report_format = argv.pop(i) if i < len(argv) and argv[i] in REPORT_FORMATS else 'json'
+        elif arg.startswith(PROFILE_FLAG + '='):
+            argv.pop(i)
+            report_format = arg.split('=', 1)[1]
+        else:
+            i += 1
+
+    if report_format and not PROFILER.enabled:
+        PROFILER.enable(report_format if report_format in REPORT_FORMATS else 'json')
+        _instrument_requests()
+    return PROFILER.enabled
@@ -206,8 +206,10 @@ def conclude():
 
     payload = _session.generate_payload()
     if payload:
-        import subprocess
-        subprocess.Popen([sys.executable, os.path.realpath(telemetry_core.__file__), payload])
+        spool_dir = telemetry_core.get_spool_dir()
+        if telemetry_core.spool(payload, spool_dir):
+            import subprocess
+            subprocess.Popen([sys.executable, os.path.realpath(telemetry_core.__file__), spool_dir])
 
 
 @decorators.suppress_all_exceptions(raise_in_diagnostics=True)
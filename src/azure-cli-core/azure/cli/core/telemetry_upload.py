@@ -6,11 +6,27 @@
 import os
 import sys
 import json
+import time
+import uuid
 import azure.cli.core.decorators as decorators
+from azure.cli.core._environment import get_config_dir
+from azure.cli.core._file_lock import file_lock
 
 DIAGNOSTICS_TELEMETRY_ENV_NAME = 'AZURE_CLI_DIAGNOSTICS_TELEMETRY'
 INSTRUMENTATION_KEY = 'c4395b75-49cc-422c-bc95-c7d51aef5d46'
 
+# Payloads are appended to the spool file, one '<timestamp> <payload>' line per invocation. Once
+# the spool is large or old enough it is renamed to a batch file and a single uploader process
+# sends every pending batch.
+SPOOL_DIR_NAME = 'telemetry'
+SPOOL_FILE_NAME = 'spool'
+BATCH_FILE_PREFIX = 'batch-'
+UPLOADING_FILE_PREFIX = 'uploading-'
+SPOOL_MAX_SIZE = 64 * 1024
+SPOOL_MAX_AGE = 60 * 60
+# Batches beyond this count (e.g. while offline) are dropped, oldest first
+MAX_PENDING_BATCHES = 20
+
 
 def in_diagnostic_mode():
     """
@@ -20,7 +36,88 @@ def in_diagnostic_mode():
     return bool(os.environ.get(DIAGNOSTICS_TELEMETRY_ENV_NAME, False))
 
 
+def get_spool_dir():
+    return os.path.join(get_config_dir(), SPOOL_DIR_NAME)
+
+
+def spool(payload, spool_dir):
+    """
+    Append the payload to the spool. When the spool reaches the size or age threshold it is rotated
+    into a batch file. Returns True when there is a batch ready to be uploaded.
+    """
+    if not os.path.isdir(spool_dir):
+        os.makedirs(spool_dir)
+    spool_path = os.path.join(spool_dir, SPOOL_FILE_NAME)
+
+    with file_lock(spool_path):
+        with open(spool_path, 'a+') as f:
+            f.write('{:.0f} {}\n'.format(time.time(), payload))
+            size = f.tell()
+            f.seek(0)
+            try:
+                started = float(f.readline().split(' ', 1)[0])
+            except ValueError:
+                started = 0  # a damaged spool is rotated right away
+
+        if size < SPOOL_MAX_SIZE and time.time() - started < SPOOL_MAX_AGE and \
+                not in_diagnostic_mode():
+            return False
+
+        # microseconds keep batches rotated within the same second in order
+        batch_name = '{}{:.6f}-{}'.format(BATCH_FILE_PREFIX, time.time(), uuid.uuid4())
+        os.rename(spool_path, os.path.join(spool_dir, batch_name))
+        return True
+
+
+def _claim_batches(spool_dir):
+    """ Rename pending batches so that concurrent uploaders never send the same batch twice. """
+    batches = sorted(n for n in os.listdir(spool_dir) if n.startswith(BATCH_FILE_PREFIX))
+    for name in batches[:-MAX_PENDING_BATCHES]:
+        os.remove(os.path.join(spool_dir, name))
+
+    claimed = []
+    for name in batches[-MAX_PENDING_BATCHES:]:
+        claimed_path = os.path.join(spool_dir, UPLOADING_FILE_PREFIX + name)
+        try:
+            os.rename(os.path.join(spool_dir, name), claimed_path)
+        except OSError:
+            continue  # claimed by another uploader
+        claimed.append(claimed_path)
+    return claimed
+
+
+def _read_batch(batch_path):
+    records = []
+    with open(batch_path, 'r') as f:
+        for line in f:
+            try:
+                records.extend(json.loads(line.split(' ', 1)[1].replace("'", '"')))
+            except (IndexError, ValueError) as err:
+                if in_diagnostic_mode():
+                    sys.stdout.write('{}\n'.format(str(err)))
+                    sys.stdout.write('Raw [{}]\n'.format(line))
+    return records
+
+
 @decorators.suppress_all_exceptions(raise_in_diagnostics=True)
+def upload_spool(spool_dir):
+    batches = _claim_batches(spool_dir)
+    if not batches:
+        return
+
+    try:
+        upload([record for batch_path in batches for record in _read_batch(batch_path)])
+    except Exception:  # pylint: disable=broad-except
+        # put the batches back so a later uploader retries them
+        for batch_path in batches:
+            os.rename(batch_path, os.path.join(
+                spool_dir, os.path.basename(batch_path)[len(UPLOADING_FILE_PREFIX):]))
+        raise
+
+    for batch_path in batches:
+        os.remove(batch_path)
+
+
 def upload(data_to_save):
     from applicationinsights import TelemetryClient
     from applicationinsights.exceptions import enable
@@ -31,13 +128,6 @@ def upload(data_to_save):
     if in_diagnostic_mode():
         sys.stdout.write('Telemetry upload begins\n')
 
-    try:
-        data_to_save = json.loads(data_to_save.replace("'", '"'))
-    except Exception as err:  # pylint: disable=broad-except
-        if in_diagnostic_mode():
-            sys.stdout.write('{}/n'.format(str(err)))
-            sys.stdout.write('Raw [{}]/n'.format(data_to_save))
-
     for record in data_to_save:
         client.track_event(record['name'], record['properties'])
 
@@ -52,4 +142,4 @@ if __name__ == '__main__':
     # If user doesn't agree to upload telemetry, this scripts won't be executed. The caller should
     # control.
     decorators.is_diagnostics_mode = in_diagnostic_mode
-    upload(sys.argv[1])
+    upload_spool(sys.argv[1])
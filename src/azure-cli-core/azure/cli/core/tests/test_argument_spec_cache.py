@@ -0,0 +1,118 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import azure.cli.core.commands._introspection as introspection
+from azure.cli.core.commands._introspection import (extract_args_from_operation,
+                                                    extract_full_summary_from_operation,
+                                                    save_argument_spec_cache)
+
+OPERATION = '{}#sample_operation'.format(__name__)
+
+
+def sample_operation(resource_group_name, vm_name, opt_param=None, raw=False):  # pylint: disable=unused-argument
+    """
+    Get a virtual machine.
+
+    :param resource_group_name: The name of the resource group.
+    :param vm_name: The name of the virtual machine.
+    :param opt_param: Used to verify reflection correctly
+    identifies optional params.
+    """
+
+
+def sample_operation_with_object_default(name, option=object()):  # pylint: disable=unused-argument
+    pass
+
+
+class TestArgumentSpecCache(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        patches = [mock.patch.object(introspection, '_argument_spec_cache', None),
+                   mock.patch.object(introspection, '_argument_spec_cache_dirty', False),
+                   mock.patch.object(introspection, '_source_mtimes', {}),
+                   mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    @staticmethod
+    def _settings(arguments):
+        return [(name, argument.type.settings) for name, argument in arguments]
+
+    def test_cached_arguments_match_introspection(self):
+        extracted = extract_args_from_operation(OPERATION, no_wait_param='raw')
+        self.assertEqual(['resource_group_name', 'vm_name', 'opt_param', 'raw'],
+                         [name for name, _ in extracted])
+        self.assertEqual('Get a virtual machine.', extract_full_summary_from_operation(OPERATION))
+
+        with mock.patch('azure.cli.core.commands.get_op_handler') as get_op_handler:
+            cached = extract_args_from_operation(OPERATION, no_wait_param='raw')
+            self.assertEqual('Get a virtual machine.',
+                             extract_full_summary_from_operation(OPERATION))
+            self.assertFalse(get_op_handler.called)
+        self.assertEqual(self._settings(extracted), self._settings(cached))
+        self.assertEqual('Used to verify reflection correctly identifies optional params.',
+                         cached[2][1].type.settings['help'])
+        self.assertEqual(['--no-wait'], cached[3][1].options_list)
+
+        # without a no-wait parameter 'raw' stays excluded, so those arguments are cached apart
+        self.assertNotIn('raw', dict(extract_args_from_operation(OPERATION)))
+
+    def test_cache_is_persisted_and_invalidated_by_source_changes(self):
+        extract_args_from_operation(OPERATION)
+        save_argument_spec_cache()
+        self.assertTrue(os.path.isfile(introspection._get_argument_spec_cache_path()))
+
+        introspection._argument_spec_cache = None
+        with mock.patch('azure.cli.core.commands.get_op_handler') as get_op_handler:
+            extract_args_from_operation(OPERATION)
+            self.assertFalse(get_op_handler.called)
+
+        introspection._source_mtimes[__file__] = -1
+        with mock.patch('azure.cli.core.commands.get_op_handler',
+                        return_value=sample_operation) as get_op_handler:
+            extract_args_from_operation(OPERATION)
+            self.assertTrue(get_op_handler.called)
+
+    def test_cache_is_dropped_when_core_is_upgraded(self):
+        extract_args_from_operation(OPERATION)
+        save_argument_spec_cache()
+
+        introspection._argument_spec_cache = None
+        with mock.patch('azure.cli.core.__version__', '99.0.0'), \
+                mock.patch('azure.cli.core.commands.get_op_handler',
+                           return_value=sample_operation) as get_op_handler:
+            extract_args_from_operation(OPERATION)
+            self.assertTrue(get_op_handler.called)
+
+    def test_cached_arguments_are_independent_of_loaded_ones(self):
+        arguments = dict(extract_args_from_operation(OPERATION))
+        arguments['vm_name'].type.settings['help'] = 'changed'
+        self.assertEqual('The name of the virtual machine.',
+                         dict(extract_args_from_operation(OPERATION))['vm_name'].options['help'])
+
+    def test_uncacheable_defaults_are_introspected_every_time(self):
+        operation = '{}#sample_operation_with_object_default'.format(__name__)
+        self.assertEqual(['name', 'option'],
+                         [name for name, _ in extract_args_from_operation(operation)])
+        self.assertEqual({}, introspection._argument_spec_cache[operation]['arguments'])
+        save_argument_spec_cache()
+
+
+if __name__ == '__main__':
+    unittest.main()
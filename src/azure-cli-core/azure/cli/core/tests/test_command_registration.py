@@ -7,7 +7,11 @@ import sys
 import logging
 import unittest
 
-from azure.cli.core.commands import _update_command_definitions
+from msrest.exceptions import ClientException
+from msrest.paging import Paged
+
+from azure.cli.core.commands import _update_command_definitions, _ArgumentRegistry
+from azure.cli.core._util import CLIError
 from azure.cli.core.commands import (
     command_table,
     CliArgumentType,
@@ -17,6 +21,30 @@ from azure.cli.core.commands import (
     register_extra_cli_argument)
 
 
+class _SamplePaged(Paged):
+
+    def __init__(self, pages):
+        super(_SamplePaged, self).__init__(None, {})
+        self.pages = pages
+
+    def advance_page(self):
+        if not self.pages:
+            raise StopIteration('End of paging')
+        page = self.pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        self.current_page = page
+        self._current_page_iter_index = 0
+        return page
+
+
+SAMPLE_PAGES = []
+
+
+def sample_list():
+    return _SamplePaged(SAMPLE_PAGES)
+
+
 class Test_command_registration(unittest.TestCase):
 
     @classmethod
@@ -282,6 +310,63 @@ class Test_command_registration(unittest.TestCase):
         self.assertFalse('required' in cmd_arg.options)
         self.assertFalse('help' in cmd_arg.options)
 
+    def test_argument_registry_merges_enclosing_scopes(self):
+        registry = _ArgumentRegistry()
+        registry.register_cli_argument('', 'name', None, help='global', metavar='NAME')
+        registry.register_cli_argument('vm', 'name', None, help='vm')
+        registry.register_cli_argument('vm  create', 'name', None, options_list=('-n',))
+        registry.register_cli_argument('vm create', 'image', None, help='image')
+
+        self.assertEqual({'help': 'vm', 'metavar': 'NAME', 'options_list': ('-n',)},
+                         registry.get_cli_argument('vm create', 'name').settings)
+        self.assertEqual({'help': 'vm', 'metavar': 'NAME'},
+                         registry.get_cli_argument('vm delete', 'name').settings)
+        self.assertEqual({'help': 'global', 'metavar': 'NAME'},
+                         registry.get_cli_argument('vmss create', 'name').settings)
+        self.assertEqual({}, registry.get_cli_argument('vm delete', 'image').settings)
+
+    def test_argument_registry_invalidates_resolved_arguments(self):
+        registry = _ArgumentRegistry()
+        registry.register_cli_argument('vm', 'name', None, help='vm')
+        vm_create = registry.get_cli_argument('vm create', 'name')
+        vmss_create = registry.get_cli_argument('vmss create', 'name')
+        self.assertIs(vm_create, registry.get_cli_argument('vm create', 'name'))
+
+        registry.register_cli_argument('vm create', 'name', None, help='vm create')
+        registry.register_cli_argument('vm', 'image', None, help='image')
+        self.assertEqual('vm create', registry.get_cli_argument('vm create', 'name').settings['help'])
+        self.assertIs(vmss_create, registry.get_cli_argument('vmss create', 'name'))
+
+        registry.register_cli_argument('', 'name', None, metavar='NAME')
+        self.assertEqual({'metavar': 'NAME'},
+                         registry.get_cli_argument('vmss create', 'name').settings)
+        registry.register_cli_argument('', 'name', None, metavar='VM_NAME')
+        self.assertEqual({'help': 'vm create', 'metavar': 'VM_NAME'},
+                         registry.get_cli_argument('vm create', 'name').settings)
+        self.assertEqual({'metavar': 'VM_NAME'},
+                         registry.get_cli_argument('vmss create', 'name').settings)
+
+        registry = _ArgumentRegistry()
+        registry.get_cli_argument('vm create', 'name')
+        registry.register_cli_argument('vm', 'name', None, help='vm')
+        registry.register_cli_argument('', 'name', None, help='global')
+        self.assertEqual({'help': 'global'},
+                         registry.get_cli_argument('vmss create', 'name').settings)
+
+    def test_paged_results_are_read_lazily(self):
+        command_table.clear()
+        cli_command(None, 'test list', '{}#sample_list'.format(__name__))
+        SAMPLE_PAGES[:] = [[1, 2], [3], ClientException('The resource group was not found.')]
+
+        result = command_table['test list'].handler({})
+        self.assertEqual(3, len(SAMPLE_PAGES))
+        self.assertEqual([1, 2], [next(result), next(result)])
+        self.assertEqual(2, len(SAMPLE_PAGES))
+        self.assertEqual(3, next(result))
+        with self.assertRaises(CLIError) as context:
+            next(result)
+        self.assertEqual('The resource group was not found.', str(context.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,120 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+import azure.cli.core.commands._completion_cache as completion_cache
+from azure.cli.core.commands import CliCommand
+from azure.cli.core.commands._completion_cache import (get_completions, get_resources_key,
+                                                       invalidate_command_completions)
+from azure.cli.core.commands.parameters import get_resource_name_completion_list
+
+_list_values = completion_cache._list_values
+
+
+class TestCompletionCache(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.values = {
+            'resourceGroups': ['web', 'Data', 'db-backup', 'dbs'],
+            'resources/microsoft.compute/virtualmachines': ['vm1'],
+            'resources/microsoft.compute/virtualmachines:web': ['vm1'],
+            'resources/microsoft.compute/virtualmachinescalesets': ['ss1'],
+            'resources/*': ['vm1', 'ss1']
+        }
+        profile = mock.MagicMock()
+        profile.return_value.get_subscription.return_value = {'id': 'sub1'}
+        patches = [mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir),
+                   mock.patch('azure.cli.core._profile.Profile', profile),
+                   mock.patch.object(completion_cache, '_get_ttl', return_value=300),
+                   mock.patch.object(completion_cache, '_list_values',
+                                     side_effect=lambda key: self.values[key])]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.list_values = completion_cache._list_values
+
+    def test_values_are_listed_once_and_matched_by_prefix(self):
+        self.assertEqual(['Data', 'db-backup', 'dbs', 'web'], get_completions('resourceGroups'))
+        self.assertEqual(['db-backup', 'dbs'], get_completions('resourceGroups', 'DB'))
+        self.assertEqual(['Data'], get_completions('resourceGroups', 'da'))
+        self.assertEqual([], get_completions('resourceGroups', 'x'))
+        self.assertEqual(1, self.list_values.call_count)
+
+    def test_expired_values_are_refreshed_once_in_the_background(self):
+        get_completions('resourceGroups')
+        with mock.patch.object(completion_cache, '_refresh_in_background') as refresh:
+            with mock.patch('time.time', return_value=time.time() + 301):
+                self.assertEqual(['web'], get_completions('resourceGroups', 'w'))
+                self.assertEqual(['web'], get_completions('resourceGroups', 'w'))
+            refresh.assert_called_once_with('resourceGroups')
+        self.assertEqual(1, self.list_values.call_count)
+
+    def test_resource_name_completer_keys(self):
+        completer = get_resource_name_completion_list('Microsoft.Compute/virtualMachines')
+        self.assertEqual('resources/microsoft.compute/virtualmachines',
+                         completer.completion_cache_key)
+        self.assertEqual('resources/microsoft.compute/virtualmachines:mygroup',
+                         get_resources_key('Microsoft.Compute/virtualMachines', 'MyGroup'))
+        self.values['resources/microsoft.compute/virtualmachines:mygroup'] = ['vm2']
+        parsed_args = mock.MagicMock(resource_group_name='MyGroup')
+        self.assertEqual(['vm2'], completer('', None, parsed_args))
+
+    @mock.patch('azure.cli.core.commands.parameters.get_resources_in_subscription')
+    @mock.patch('azure.cli.core.commands.parameters.get_resources_in_resource_group')
+    def test_keys_are_listed_by_type_and_resource_group(self, in_group, in_subscription):
+        extensions = 'Microsoft.Compute/virtualMachines/extensions'
+        for key, resource_group_name, resource_type in (
+                (get_resources_key(extensions), None, extensions.lower()),
+                (get_resources_key(extensions, 'extensions'), 'extensions', extensions.lower()),
+                (get_resources_key(None, 'my.group(1)'), 'my.group(1)', None),
+                (get_resources_key(), None, None)):
+            in_group.reset_mock()
+            in_subscription.reset_mock()
+            _list_values(key)
+            if resource_group_name:
+                in_group.assert_called_once_with(resource_group_name, resource_type=resource_type)
+                self.assertFalse(in_subscription.called)
+            else:
+                in_subscription.assert_called_once_with(resource_type=resource_type)
+                self.assertFalse(in_group.called)
+
+    def _command(self, name, completers):
+        command = CliCommand(name, lambda: None)
+        for i, completer in enumerate(completers):
+            command.add_argument('arg{}'.format(i), '--arg{}'.format(i), completer=completer)
+        return command
+
+    def test_create_and_delete_drop_the_values_of_their_resource_types(self):
+        for key in self.values:
+            get_completions(key)
+        vm_completer = get_resource_name_completion_list('Microsoft.Compute/virtualMachines')
+        invalidate_command_completions(self._command('vm delete', [vm_completer]))
+        for key in self.values:
+            get_completions(key)
+        listed = self.list_values.call_args_list[len(self.values):]
+        self.assertEqual(['resources/*', 'resources/microsoft.compute/virtualmachines',
+                          'resources/microsoft.compute/virtualmachines:web'],
+                         sorted(c[0][0] for c in listed))
+
+        self.list_values.reset_mock()
+        invalidate_command_completions(self._command('group create', []))
+        for key in self.values:
+            get_completions(key)
+        self.assertEqual(sorted(self.values),
+                         sorted(c[0][0] for c in self.list_values.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,27 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+from collections import OrderedDict
+from types import GeneratorType
+import json
+import shutil
+import tempfile
 import unittest
 
-from azure.cli.core.extensions.query import jmespath_type
+import jmespath
+import mock
+
+import azure.cli.core.extensions.query as query
+from azure.cli.core.extensions.query import jmespath_type, save_query_cache, search_query
+
+
+def _sample_resources(count):
+    return [OrderedDict([('name', 'vm{}'.format(i)),
+                         ('location', 'westus' if i % 3 else 'eastus'),
+                         ('resourceGroup', 'group{}'.format(i % 7)),
+                         ('tags', {'env': 'prod'} if i % 2 else None),
+                         ('disks', [{'size': i % 5}, {'size': 128}] if i % 4 else [])])
+            for i in range(count)]
 
 
 class TestQuery(unittest.TestCase):
@@ -56,5 +74,60 @@ class TestQuery(unittest.TestCase):
             jmespath_type(query)
 
 
+class TestQuerySearch(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        patches = [mock.patch.object(query, '_query_cache', None),
+                   mock.patch.object(query, '_query_cache_dirty', False),
+                   mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_parsed_queries_are_cached(self):
+        raw_query = "[?location=='westus'].{name:name, group:resourceGroup}"
+        compiled = jmespath_type(raw_query)
+        save_query_cache()
+
+        query._query_cache = None
+        with mock.patch('jmespath.compile') as compile_jmespath:
+            cached = jmespath_type(raw_query)
+            self.assertFalse(compile_jmespath.called)
+        self.assertEqual(compiled.parsed, cached.parsed)
+        resources = _sample_resources(10)
+        self.assertEqual(compiled.search(resources), cached.search(resources))
+
+    def test_streamed_results_match_search(self):
+        resources = _sample_resources(5000)
+        for raw_query in ['[].name', '[*].{name:name, group:resourceGroup}', '[].tags',
+                          "[?location=='westus'].name", "[?tags.env=='prod']", '[].disks[].size',
+                          '[].disks', '[]', '[0]', 'length(@)', '[].name | [0]',
+                          'sort_by(@, &name)[-1].name', "[?location=='westus'] | length(@)"]:
+            expected = jmespath.search(raw_query, resources, jmespath.Options(OrderedDict))
+            actual = search_query(jmespath_type(raw_query), (r for r in resources))
+            if isinstance(actual, GeneratorType):
+                actual = list(actual)
+            self.assertEqual(json.dumps(expected), json.dumps(actual), raw_query)
+
+    def test_streamed_results_are_read_as_needed(self):
+        read = []
+
+        def _resources():
+            for resource in _sample_resources(100):
+                read.append(resource)
+                yield resource
+
+        result = search_query(jmespath_type("[?location=='westus'].name"), _resources())
+        self.assertEqual([], read)
+        self.assertEqual('vm1', next(result))
+        self.assertEqual(2, len(read))
+
+        self.assertEqual(100, search_query(jmespath_type('length(@)'), _resources()))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import azure.cli.core.help_files as help_files
+
+GROUP_HELP = """
+    type: group
+    short-summary: Manage the things.
+"""
+
+COMMAND_HELP = """
+    type: command
+    short-summary: Create a thing.
+    examples:
+        - name: Create a thing.
+          text: az things create -n MyThing
+"""
+
+
+class TestHelpCache(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        patches = [mock.patch.dict(help_files.helps, {'things': GROUP_HELP,
+                                                      'things create': COMMAND_HELP}, clear=True),
+                   mock.patch.object(help_files, '_help_cache', None),
+                   mock.patch.dict(help_files._uncached_helps, clear=True),
+                   mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def test_help_entries_are_compiled_once(self):
+        with mock.patch.object(help_files, '_parse_help_yaml',
+                               wraps=help_files._parse_help_yaml) as parse:
+            self.assertEqual('Manage the things.',
+                             help_files._load_help_file('things')['short-summary'])
+            self.assertEqual('az things create -n MyThing',
+                             help_files._load_help_file('things create')['examples'][0]['text'])
+            self.assertEqual(2, parse.call_count)
+        self.assertIsNone(help_files._load_help_file('things delete'))
+        self.assertTrue(os.path.isfile(help_files._get_help_cache_path()))
+
+    def test_help_cache_is_reused_across_processes_until_text_changes(self):
+        help_files._load_help_file('things')
+        help_files._help_cache = None
+
+        with mock.patch.object(help_files, '_parse_help_yaml',
+                               wraps=help_files._parse_help_yaml) as parse:
+            help_files._load_help_file('things create')
+            self.assertFalse(parse.called)
+
+            help_files.helps['things'] = GROUP_HELP.replace('Manage', 'Handle')
+            self.assertEqual('Handle the things.',
+                             help_files._load_help_file('things')['short-summary'])
+            self.assertEqual(1, parse.call_count)
+
+    def test_invalid_entries_do_not_break_other_help(self):
+        help_files.helps['broken'] = 'type: [group'
+        self.assertEqual('group', help_files._load_help_file('things')['type'])
+        with self.assertRaises(Exception):
+            help_files._load_help_file('broken')
+
+    def test_help_that_cannot_be_cached_is_still_shown(self):
+        help_files.helps['dated'] = GROUP_HELP + '    released: 2017-03-01\n'
+        with mock.patch.object(help_files, '_parse_help_yaml',
+                               wraps=help_files._parse_help_yaml) as parse:
+            self.assertEqual('Manage the things.',
+                             help_files._load_help_file('dated')['short-summary'])
+            self.assertEqual('2017-03-01',
+                             str(help_files._load_help_file('dated')['released']))
+            self.assertEqual(3, parse.call_count)
+        # the other entries are still saved
+        help_files._help_cache = None
+        self.assertEqual(['things', 'things create'],
+                         sorted(help_files._load_help_cache()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+import azure.cli.core.commands._locations as locations
+from azure.cli.core.commands._locations import get_location_name, get_locations
+from azure.cli.core.commands.parameters import (get_one_of_subscription_locations,
+                                                location_name_type)
+from azure.cli.core._util import CLIError
+
+
+class _Location(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, name, display_name):
+        self.name = name
+        self.display_name = display_name
+
+
+class TestLocations(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.profile = mock.MagicMock()
+        self.profile.return_value.get_subscription.return_value = {'id': 'sub1'}
+        self.list_locations = mock.MagicMock(return_value=[_Location('eastus', 'East US'),
+                                                           _Location('westus', 'West US')])
+        patches = [mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir),
+                   mock.patch('azure.cli.core._profile.Profile', self.profile),
+                   mock.patch('azure.cli.core.cloud.get_active_cloud_name',
+                              return_value='AzureCloud'),
+                   mock.patch('azure.cli.core.commands.parameters.get_subscription_locations',
+                              self.list_locations),
+                   mock.patch.object(locations, '_get_ttl', return_value=3600),
+                   mock.patch.dict(locations._locations, clear=True)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_locations_are_listed_once_per_subscription(self):
+        expected = [('eastus', 'East US'), ('westus', 'West US')]
+        self.assertEqual(expected, get_locations())
+        self.assertEqual('westus', get_one_of_subscription_locations())
+
+        # a new process reads them from the config directory
+        locations._locations.clear()
+        self.assertEqual(expected, get_locations())
+        self.assertEqual(1, self.list_locations.call_count)
+
+        self.profile.return_value.get_subscription.return_value = {'id': 'sub2'}
+        get_locations()
+        self.assertEqual(2, self.list_locations.call_count)
+
+        with mock.patch('time.time', return_value=time.time() + 3601):
+            get_locations()
+        self.assertEqual(3, self.list_locations.call_count)
+
+    def test_display_names_are_converted_without_listing_known_locations(self):
+        self.assertEqual('westus2', location_name_type('west us 2'))
+        self.assertEqual('westus', location_name_type('westus'))
+        self.profile.return_value.get_subscription.side_effect = CLIError('not logged in')
+        self.assertEqual('northeurope', location_name_type('North Europe'))
+        self.assertFalse(self.list_locations.called)
+
+    def test_unknown_display_names_list_the_locations_again(self):
+        get_locations()
+        self.list_locations.return_value.append(_Location('newregion', 'New Region'))
+        self.assertEqual('newregion', get_location_name('New Region'))
+        self.assertEqual('newregion', get_location_name('New Region'))
+        self.assertEqual(2, self.list_locations.call_count)
+
+        self.list_locations.side_effect = IOError('offline')
+        self.assertIsNone(get_location_name('Nowhere'))
+        self.assertEqual('Nowhere', location_name_type('Nowhere'))
+
+
+if __name__ == '__main__':
+    unittest.main()
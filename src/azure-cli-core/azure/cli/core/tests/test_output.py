@@ -8,10 +8,12 @@ from __future__ import print_function
 import unittest
 from collections import OrderedDict
 from six import StringIO
+import mock
 
 from azure.cli.core._output import (OutputProducer, format_json, format_table,
                                     format_tsv, CommandResultItem)
 import azure.cli.core._util as util
+from azure.cli.core._util import CLIError
 
 
 class TestOutput(unittest.TestCase):
@@ -177,6 +179,106 @@ qwerty  0b1f6472qwerty         1  0b1f6472
         result = format_tsv(CommandResultItem([obj1, obj2]))
         self.assertEqual(result, '1\t2\n3\t4\n')
 
+    # Streamed output tests
+
+    @staticmethod
+    def _streamed_rows(count, read=None, active=True):
+        for i in range(count):
+            if read is not None:
+                read.append(i)
+            row = OrderedDict([('name', 'vm{}'.format(i ** 4)), ('count', i * 11),
+                               ('ratio', i / 4.0)])
+            if active:
+                row['active'] = i % 2 == 1
+            yield row
+
+    def _out(self, formatter, result, is_query_active=False):
+        io = StringIO()
+        OutputProducer(formatter=formatter, file=io).out(
+            CommandResultItem(result, is_query_active=is_query_active))
+        return io.getvalue()
+
+    def test_out_streamed_same_as_list(self):
+        for count in (0, 1, 5):
+            for formatter in (format_table, format_tsv, format_json):
+                self.assertEqual(self._out(formatter, list(self._streamed_rows(count))),
+                                 self._out(formatter, self._streamed_rows(count)))
+
+    @mock.patch('azure.cli.core._output.TABLE_SAMPLE_SIZE', 3)
+    def test_out_table_streamed_past_sample(self):
+        for count in (3, 5):
+            self.assertEqual(self._out(format_table, list(self._streamed_rows(count))),
+                             self._out(format_table, self._streamed_rows(count)))
+
+        # rows after the sample keep its columns, even when their values are wider
+        self.assertEqual(util.normalize_newlines(self._out(format_table,
+                                                           self._streamed_rows(12, active=False))),
+                         util.normalize_newlines(
+            """Name      Count    Ratio
+------  -------  -------
+vm0
+vm1          11     0.25
+vm16         22     0.5
+vm81         33     0.75
+vm256        44     1
+vm625        55     1.25
+vm1296       66     1.5
+vm2401       77     1.75
+vm4096       88     2
+vm6561       99     2.25
+vm10000      110     2.5
+vm14641      121     2.75
+"""))
+
+    @mock.patch('azure.cli.core._output.TABLE_SAMPLE_SIZE', 3)
+    def test_out_streamed_rows_are_written_as_they_are_read(self):
+        for formatter in (format_table, format_tsv):
+            read = []
+            writes = []
+            io = mock.MagicMock()
+            io.write.side_effect = lambda text, read=read: writes.append(len(read))
+            OutputProducer(formatter=formatter, file=io).out(
+                CommandResultItem(self._streamed_rows(10, read)))
+            self.assertEqual(10, len(read))
+            self.assertLess(writes[0], 10)
+
+    @mock.patch('azure.cli.core._output.TABLE_SAMPLE_SIZE', 3)
+    def test_out_table_streamed_row_errors_are_reported(self):
+        class _Unreadable(object):  # pylint: disable=too-few-public-methods
+            @staticmethod
+            def keys():
+                return ['name']
+
+            def __getitem__(self, key):
+                raise ValueError(key)
+
+        def _rows():
+            for row in self._streamed_rows(5):
+                yield row
+            yield _Unreadable()
+
+        with self.assertRaisesRegex(CLIError, 'Table output unavailable'):
+            self._out(format_table, _rows())
+
+    @mock.patch('azure.cli.core._output.TABLE_SAMPLE_SIZE', 3)
+    def test_out_table_streamed_paging_errors_are_kept(self):
+        def _rows(count):
+            for row in self._streamed_rows(count):
+                yield row
+            raise CLIError('AuthorizationFailed: no access to the next page.')
+
+        # a page failing within the sample and after it
+        for count in (1, 5):
+            with self.assertRaisesRegex(CLIError, '^AuthorizationFailed'):
+                self._out(format_table, _rows(count))
+
+    @mock.patch('azure.cli.core._output.TABLE_SAMPLE_SIZE', 0)
+    def test_out_table_streamed_with_at_least_one_sample_row(self):
+        # the columns are those of the first row, which only has a name
+        lines = self._out(format_table, self._streamed_rows(5)).splitlines()
+        self.assertEqual(['Name', '------', 'vm0', 'vm1', 'vm16', 'vm81', 'vm256'],
+                         [line.strip() for line in lines])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import threading
+import unittest
+
+import mock
+from six import StringIO
+
+from azure.cli.core.profiler import Profiler, configure_profiling
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+        with profiler.phase('execute'):
+            pass
+        self.assertEqual({}, dict(profiler._root.children))  # pylint: disable=protected-access
+
+    def test_nested_phases_are_aggregated(self):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.phase('execute'):
+            for _ in range(2):
+                with profiler.phase('command'):
+                    with profiler.phase('client_creation'):
+                        pass
+            with profiler.phase('todict'):
+                pass
+
+        az = profiler.report()['phases'][0]
+        self.assertEqual('az', az['name'])
+        execute = az['phases'][0]
+        self.assertEqual(('execute', 1), (execute['name'], execute['count']))
+        command, todict = execute['phases']
+        self.assertEqual(('command', 2), (command['name'], command['count']))
+        self.assertEqual(('client_creation', 2),
+                         (command['phases'][0]['name'], command['phases'][0]['count']))
+        self.assertEqual('todict', todict['name'])
+        self.assertGreaterEqual(az['wallSeconds'], execute['wallSeconds'])
+
+    def test_phases_on_other_threads_are_ignored(self):
+        profiler = Profiler()
+        profiler.enable()
+
+        def _work():
+            with profiler.phase('worker'):
+                profiler.record_http_request('GET', 'https://host/path?sig=secret', 200, 0.5, 0, 10)
+
+        with profiler.phase('command'):
+            worker = threading.Thread(target=_work)
+            worker.start()
+            worker.join()
+
+        report = profiler.report()
+        self.assertNotIn('phases', report['phases'][0]['phases'][0])
+        self.assertEqual(1, report['http']['count'])
+        self.assertEqual(10, report['http']['bytesReceived'])
+        self.assertEqual('https://host/path', report['http']['requests'][0]['url'])
+
+    def test_write_report_formats(self):
+        profiler = Profiler()
+        profiler.enable('folded')
+        with profiler.phase('execute'):
+            with profiler.phase('command'):
+                pass
+
+        output = StringIO()
+        profiler.write_report(output)
+        stacks = [line.rsplit(' ', 1)[0] for line in output.getvalue().splitlines()]
+        self.assertEqual(['az', 'az;execute', 'az;execute;command'], stacks)
+
+        profiler.report_format = 'json'
+        output = StringIO()
+        profiler.write_report(output)
+        self.assertEqual('az', json.loads(output.getvalue())['phases'][0]['name'])
+
+    @mock.patch('azure.cli.core.profiler._instrument_requests')
+    def test_configure_profiling_consumes_argument(self, _):
+        with mock.patch('azure.cli.core.profiler.PROFILER', Profiler()) as profiler:
+            argv = ['vm', 'list']
+            self.assertFalse(configure_profiling(argv))
+            self.assertEqual(['vm', 'list'], argv)
+
+            argv = ['vm', '--profile=folded', 'list']
+            self.assertTrue(configure_profiling(argv))
+            self.assertEqual(['vm', 'list'], argv)
+            self.assertEqual('folded', profiler.report_format)
+
+        cases = (('vm list --profile folded', 'vm list', 'folded'),
+                 ('vm list --profile -o table', 'vm list -o table', 'json'),
+                 ('vm list --profile', 'vm list', 'json'))
+        for args, remaining, report_format in cases:
+            with mock.patch('azure.cli.core.profiler.PROFILER', Profiler()) as profiler:
+                argv = args.split()
+                self.assertTrue(configure_profiling(argv))
+                self.assertEqual(remaining.split(), argv)
+                self.assertEqual(report_format, profiler.report_format)
+
+
+if __name__ == '__main__':
+    unittest.main()
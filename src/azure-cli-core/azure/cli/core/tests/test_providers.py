@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core.commands.providers import register_providers, forget_provider_registration
+
+
+class _Provider(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, registration_state):
+        self.registration_state = registration_state
+
+
+class _Clock(object):
+    """ Time that passes only when slept. """
+
+    def __init__(self):
+        self.now = 0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _StubProviders(object):
+    """ Providers of a subscription, each registered after being polled a number of times. """
+
+    def __init__(self, states, polls_to_register=2):
+        self.config = mock.MagicMock(subscription_id='sub1')
+        self.states = dict(states)
+        self.polls_to_register = polls_to_register
+        self.polls = dict((n, 0) for n in states)
+        self.registered = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, namespace):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)  # the real time, for the calls to overlap
+        with self.lock:
+            self.in_flight -= 1
+            if self.states[namespace] == 'Registering':
+                self.polls[namespace] += 1
+                if self.polls[namespace] >= self.polls_to_register:
+                    self.states[namespace] = 'Registered'
+            return _Provider(self.states[namespace])
+
+    def register(self, namespace):
+        self.registered.append(namespace)
+        self.states[namespace] = 'Registering'
+
+
+class TestProviders(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        patches = [mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir),
+                   mock.patch('azure.cli.core.cloud.get_active_cloud_name',
+                              return_value='AzureCloud'),
+                   mock.patch('azure.cli.core.commands.providers.time', self.clock)]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_providers_are_registered_concurrently_and_waited_for(self):
+        providers = _StubProviders({'Microsoft.Network': 'Registered',
+                                    'Microsoft.Compute': 'NotRegistered',
+                                    'Microsoft.Storage': 'Registering'})
+        states = register_providers(sorted(providers.states), providers)
+        self.assertEqual(dict((n, 'Registered') for n in providers.states), states)
+        self.assertEqual(['Microsoft.Compute'], providers.registered)
+        self.assertEqual(3, providers.max_in_flight)
+
+        # registered providers are kept, until they are unregistered
+        providers.get = mock.MagicMock(side_effect=providers.get)
+        self.assertEqual(states, register_providers(sorted(states), providers))
+        self.assertFalse(providers.get.called)
+        forget_provider_registration('Microsoft.Compute', providers)
+        register_providers(sorted(states), providers)
+        providers.get.assert_called_once_with('Microsoft.Compute')
+
+    def test_registration_is_waited_for_until_the_timeout(self):
+        providers = _StubProviders({'Microsoft.Compute': 'NotRegistered'}, polls_to_register=100)
+        states = register_providers(['Microsoft.Compute'], providers, timeout=60)
+        self.assertEqual({'Microsoft.Compute': 'Registering'}, states)
+        # polled after 1, 3, 7, 15, 31 and 60 seconds
+        self.assertEqual(60, self.clock.now)
+        self.assertEqual(6, providers.polls['Microsoft.Compute'])
+
+        # a provider still registering is checked again the next time
+        providers.polls_to_register = 0
+        self.assertEqual({'Microsoft.Compute': 'Registered'},
+                         register_providers(['Microsoft.Compute'], providers))
+        self.assertEqual(['Microsoft.Compute'], providers.registered)
+
+
+if __name__ == '__main__':
+    unittest.main()
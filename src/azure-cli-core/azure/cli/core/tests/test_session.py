@@ -0,0 +1,102 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+
+
+def _update_session(path, writer, count):
+    session = Session()
+    for i in range(count):
+        session.load(path)
+        if i % 2:
+            with session:
+                session[writer] = i
+                session['last'] = writer
+        else:
+            session[writer] = i
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'az.json')
+
+    def _read(self):
+        with open(self.path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8-sig'))
+
+    def test_changes_in_a_batch_are_saved_once(self):
+        session = Session()
+        session.load(self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+        with mock.patch('json.dump', side_effect=json.dump) as dump:
+            with session:
+                session['a'] = 1
+                with session:
+                    session['b'] = {'c': 2}
+                    del session['a']
+                self.assertFalse(os.path.exists(self.path))
+            self.assertEqual(1, dump.call_count)
+            self.assertEqual({'b': {'c': 2}}, self._read())
+
+            session['d'] = 3
+            self.assertEqual(2, dump.call_count)
+        self.assertEqual({'b': {'c': 2}, 'd': 3}, self._read())
+
+    def test_only_changed_keys_are_written(self):
+        first, second = Session(), Session()
+        first.load(self.path)
+        second.load(self.path)
+        first['a'] = 1
+        second['b'] = 2
+        self.assertEqual({'a': 1, 'b': 2}, self._read())
+
+        # values that were handed out are written by save, as they may have been modified
+        first['c'].setdefault('d', []).append(4)
+        first.get('a')
+        first.save_with_retry()
+        self.assertEqual({'a': 1, 'b': 2, 'c': {'d': [4]}}, self._read())
+
+    def test_expired_session_is_cleared(self):
+        session = Session()
+        session.load(self.path)
+        session['a'] = 1
+        os.utime(self.path, (time.time() - 7200, time.time() - 7200))
+        session.load(self.path, max_age=3600)
+        self.assertEqual({}, session.data)
+        self.assertEqual({}, self._read())
+
+    def test_concurrent_writers_keep_each_others_changes(self):
+        writers = ['writer{}'.format(i) for i in range(8)]
+        processes = [multiprocessing.Process(target=_update_session, args=(self.path, writer, 25))
+                     for writer in writers]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(0, process.exitcode)
+
+        data = self._read()
+        self.assertEqual(dict((writer, 24) for writer in writers),
+                         dict((k, v) for k, v in data.items() if k != 'last'))
+        self.assertIn(data['last'], writers)
+        self.assertEqual(['az.json', 'az.json.lock'], sorted(os.listdir(self.directory)))
+
+
+if __name__ == '__main__':
+    unittest.main()
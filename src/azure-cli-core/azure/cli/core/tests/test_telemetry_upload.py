@@ -0,0 +1,74 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+import azure.cli.core.telemetry_upload as telemetry_upload
+
+
+def _payload(name):
+    return json.dumps([{'name': name, 'properties': {'key': 'value'}}])
+
+
+class TestTelemetrySpool(unittest.TestCase):
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir)
+
+    def _files(self, prefix):
+        return [n for n in os.listdir(self.spool_dir) if n.startswith(prefix)]
+
+    def test_spool_appends_until_size_threshold(self):
+        with mock.patch.object(telemetry_upload, 'SPOOL_MAX_SIZE', 200):
+            self.assertFalse(telemetry_upload.spool(_payload('first'), self.spool_dir))
+            self.assertEqual([], self._files(telemetry_upload.BATCH_FILE_PREFIX))
+            while not telemetry_upload.spool(_payload('more'), self.spool_dir):
+                pass
+
+        self.assertEqual(1, len(self._files(telemetry_upload.BATCH_FILE_PREFIX)))
+        self.assertFalse(os.path.exists(os.path.join(self.spool_dir,
+                                                     telemetry_upload.SPOOL_FILE_NAME)))
+
+    def test_spool_rotates_on_age_threshold(self):
+        with mock.patch('time.time', return_value=1000):
+            self.assertFalse(telemetry_upload.spool(_payload('old'), self.spool_dir))
+        self.assertTrue(telemetry_upload.spool(_payload('new'), self.spool_dir))
+
+    @mock.patch('azure.cli.core.telemetry_upload.upload')
+    def test_upload_spool_sends_all_batches_once(self, upload):
+        with mock.patch.object(telemetry_upload, 'SPOOL_MAX_SIZE', 0):
+            telemetry_upload.spool(_payload('first'), self.spool_dir)
+            telemetry_upload.spool(_payload('second'), self.spool_dir)
+
+        telemetry_upload.upload_spool(self.spool_dir)
+        telemetry_upload.upload_spool(self.spool_dir)
+
+        upload.assert_called_once_with([
+            {'name': 'first', 'properties': {'key': 'value'}},
+            {'name': 'second', 'properties': {'key': 'value'}}])
+        self.assertEqual([], self._files(telemetry_upload.BATCH_FILE_PREFIX))
+        self.assertEqual([], self._files(telemetry_upload.UPLOADING_FILE_PREFIX))
+
+    @mock.patch('azure.cli.core.telemetry_upload.upload', side_effect=IOError)
+    def test_failed_upload_keeps_batches(self, _):
+        with mock.patch.object(telemetry_upload, 'SPOOL_MAX_SIZE', 0):
+            telemetry_upload.spool(_payload('first'), self.spool_dir)
+
+        telemetry_upload.upload_spool(self.spool_dir)
+
+        self.assertEqual(1, len(self._files(telemetry_upload.BATCH_FILE_PREFIX)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,56 @@
 
 # pylint: disable=line-too-long
 from collections import namedtuple
+from datetime import datetime, timedelta
+from enum import Enum
+import json
+import os
+import shutil
+import stat
 import unittest
 import tempfile
 
-from azure.cli.core._util import get_file_json, todict, to_snake_case, truncate_text
+import mock
+
+from azure.cli.core._util import (get_file_json, todict, to_camel_case, to_snake_case,
+                                  truncate_text, retry_with_backoff, open_private_file)
+from azure.cli.core.extensions.transform import _add_resource_group
+
+
+class _Color(Enum):
+    red = 'Red'
+
+
+class _Model(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        self._private = 'hidden'
+        self.callback = lambda: None
+
+
+def _reference_todict(obj):
+    """ todict and the resource group transform as two separate passes, as they used to be. """
+    def _todict(obj):
+        if isinstance(obj, dict):
+            return {k: _todict(v) for (k, v) in obj.items()}
+        elif isinstance(obj, list):
+            return [_todict(a) for a in obj]
+        elif isinstance(obj, Enum):
+            return obj.value
+        elif isinstance(obj, datetime):
+            return obj.isoformat()
+        elif isinstance(obj, timedelta):
+            return str(obj)
+        elif hasattr(obj, '_asdict'):
+            return _todict(obj._asdict())
+        elif hasattr(obj, '__dict__'):
+            return dict([(to_camel_case(k), _todict(v)) for k, v in obj.__dict__.items()
+                         if not callable(v) and not k.startswith('_')])
+        return obj
+    result = _todict(obj)
+    _add_resource_group(result)
+    return result
 
 
 class TestUtils(unittest.TestCase):
@@ -52,6 +98,28 @@ class TestUtils(unittest.TestCase):
         expected = {'a': {'a': 'x', 'b': 'y'}}
         self.assertEqual(actual, expected)
 
+    def test_application_todict_add_resource_group(self):
+        rg_id = '/subscriptions/sub/resourceGroups/myRG/providers/Microsoft.Compute/virtualMachines/vm1'
+        Identity = namedtuple('Identity', 'id principal_id')
+        the_input = [
+            _Model(id=rg_id, vm_size='Standard_A1', color=_Color.red, created=datetime(2017, 1, 2),
+                   timeout=timedelta(minutes=5), tags={'a': 'b'}, identity=Identity(rg_id, 'p'),
+                   network_profile=_Model(network_interfaces=[_Model(id=rg_id + '/nic', primary=True)]),
+                   disks=[{'id': rg_id, 'resourceGroup': 'other'}, {'id': None}, {'id': 42}]),
+            _Model(id='/subscriptions/sub/providers/Microsoft.Features/features/f1', name='f1'),
+            _Model(id='/subscriptions/sub/resourceGroups/myRG', name='myRG'),
+            {'id': rg_id, 'values': ({'id': rg_id},)},
+            'text', 1, None]
+
+        actual = todict(the_input, add_resource_group=True)
+        self.assertEqual(json.dumps(_reference_todict(the_input)), json.dumps(actual))
+        self.assertEqual('myRG', actual[0]['resourceGroup'])
+        self.assertEqual('myRG', actual[0]['networkProfile']['networkInterfaces'][0]['resourceGroup'])
+        self.assertEqual('other', actual[0]['disks'][0]['resourceGroup'])
+        self.assertNotIn('resourceGroup', actual[1])
+        self.assertNotIn('resourceGroup', actual[2])
+        self.assertNotIn('resourceGroup', todict(the_input)[0])
+
     def test_load_json_from_file(self):
         _, pathname = tempfile.mkstemp()
 
@@ -107,6 +175,37 @@ class TestUtils(unittest.TestCase):
         with self.assertRaises(ValueError):
             truncate_text('string to shorten', width=-1)
 
+    @mock.patch('time.sleep')
+    def test_retry_with_backoff(self, sleep):
+        func = mock.MagicMock(side_effect=[KeyError('not yet'), KeyError('not yet'), 'done'])
+        on_retry = mock.MagicMock()
+        self.assertEqual('done', retry_with_backoff(func, delay=2, max_delay=3, on_retry=on_retry))
+        self.assertEqual([mock.call(2), mock.call(3)], sleep.call_args_list)
+        self.assertEqual([1, 2], [c[0][0] for c in on_retry.call_args_list])
+
+        func = mock.MagicMock(side_effect=[KeyError('not yet'), ValueError('bad')])
+        with self.assertRaises(ValueError):
+            retry_with_backoff(func, lambda ex: isinstance(ex, KeyError))
+
+        func = mock.MagicMock(side_effect=KeyError('never'))
+        with self.assertRaises(KeyError):
+            retry_with_backoff(func, attempts=3)
+        self.assertEqual(3, func.call_count)
+
+    @unittest.skipIf(os.name == 'nt', 'file modes are not enforced on Windows')
+    def test_open_private_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'secret.json')
+        with open(path, 'w') as f:
+            f.write('previously public content')
+        os.chmod(path, 0o644)
+        with open_private_file(path) as f:
+            f.write('{}')
+        with open(path) as f:
+            self.assertEqual('{}', f.read())
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,8 +6,13 @@
 import sys
 import os
 
-import azure.cli.main
-import azure.cli.core.telemetry as telemetry
+from azure.cli.core.profiler import PROFILER, configure_profiling
+
+# Enable the profiler, if requested, before anything else is imported so imports are included
+configure_profiling(sys.argv)
+with PROFILER.phase('imports'):
+    import azure.cli.main
+    import azure.cli.core.telemetry as telemetry
 
 try:
     telemetry.start()
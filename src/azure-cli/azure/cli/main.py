@@ -8,6 +8,7 @@ import sys
 
 from azure.cli.core.application import APPLICATION, Configuration
 import azure.cli.core.azlogging as azlogging
+from azure.cli.core.profiler import PROFILER, configure_profiling
 from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
 from azure.cli.core._util import (show_version_info_exit, handle_exception)
 from azure.cli.core._environment import get_config_dir
@@ -18,6 +19,7 @@ logger = azlogging.get_az_logger(__name__)
 
 def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
     azlogging.configure_logging(args)
+    configure_profiling(args)
     logger.debug('Command arguments %s', args)
 
     if len(args) > 0 and args[0] == '--version':
@@ -26,22 +28,29 @@ def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
     azure_folder = get_config_dir()
     if not os.path.exists(azure_folder):
         os.makedirs(azure_folder)
-    ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
-    CONFIG.load(os.path.join(azure_folder, 'az.json'))
-    SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+    with PROFILER.phase('session_load'):
+        ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
+        CONFIG.load(os.path.join(azure_folder, 'az.json'))
+        SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
 
     config = Configuration(args)
     APPLICATION.initialize(config)
 
     try:
-        cmd_result = APPLICATION.execute(args)
+        # the changes a command makes to the session files are saved together once it's done
+        with ACCOUNT, CONFIG, SESSION:
+            with PROFILER.phase('execute'):
+                cmd_result = APPLICATION.execute(args)
 
-        # Commands can return a dictionary/list of results
-        # If they do, we print the results.
-        if cmd_result and cmd_result.result is not None:
-            from azure.cli.core._output import OutputProducer
-            formatter = OutputProducer.get_formatter(APPLICATION.configuration.output_format)
-            OutputProducer(formatter=formatter, file=file).out(cmd_result)
+            # Commands can return a dictionary/list of results
+            # If they do, we print the results.
+            if cmd_result and (cmd_result.streamed_result is not None or
+                               cmd_result.result is not None):
+                from azure.cli.core._output import OutputProducer
+                with PROFILER.phase('format'):
+                    output_format = APPLICATION.configuration.output_format
+                    formatter = OutputProducer.get_formatter(output_format)
+                    OutputProducer(formatter=formatter, file=file).out(cmd_result)
 
     except Exception as ex:  # pylint: disable=broad-except
 
@@ -52,3 +61,6 @@ def main(args, file=sys.stdout):  # pylint: disable=redefined-builtin
 
         error_code = handle_exception(ex)
         return error_code
+    finally:
+        if PROFILER.enabled:
+            PROFILER.write_report(sys.stderr)
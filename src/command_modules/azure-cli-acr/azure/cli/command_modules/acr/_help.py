@@ -81,6 +81,17 @@ helps['acr repository show-tags'] = """
                     az acr repository show-tags -n MyRegistry --repository MyRepository
             """
 
+helps['acr repository list-tags'] = """
+            type: command
+            examples:
+                - name: List the tags of every repository in a given container registry.
+                  text:
+                    az acr repository list-tags -n MyRegistry
+                - name: List the tags of the given repositories in a given container registry.
+                  text:
+                    az acr repository list-tags -n MyRegistry --repositories MyRepository1 MyRepository2
+            """
+
 helps['acr credential show'] = """
     type: command
     examples:
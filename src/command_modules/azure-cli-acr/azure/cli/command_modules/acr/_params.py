@@ -47,3 +47,6 @@ register_cli_argument('acr create', 'registry_name', completer=None,
 register_cli_argument('acr create', 'resource_group_name',
                       validator=validate_resource_group_name)
 register_cli_argument('acr check-name', 'registry_name', completer=None)
+register_cli_argument('acr repository list-tags', 'repositories',
+                      nargs='+',
+                      help='Space separated repositories to obtain tags from. Defaults to all repositories')
@@ -30,3 +30,4 @@ cli_generic_update_command(__name__,
 
 cli_command(__name__, 'acr repository list', 'azure.cli.command_modules.acr.repository#acr_repository_list')
 cli_command(__name__, 'acr repository show-tags', 'azure.cli.command_modules.acr.repository#acr_repository_show_tags')
+cli_command(__name__, 'acr repository list-tags', 'azure.cli.command_modules.acr.repository#acr_repository_list_tags')
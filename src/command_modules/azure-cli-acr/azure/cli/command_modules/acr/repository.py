@@ -14,55 +14,88 @@ from ._utils import (
 )
 from .credential import acr_credential_show
 
-def _obtain_data_from_registry(login_server, path, resultIndex, username, password):
-    registryEndpoint = 'https://' + login_server
-    resultList = []
-    executeNextHttpCall = True
-
-    while executeNextHttpCall:
-        executeNextHttpCall = False
-        response = requests.get(
-            registryEndpoint + path,
-            auth=requests.auth.HTTPBasicAuth(
-                username,
-                password
-            )
-        )
-
-        if response.status_code == 200:
-            resultList += response.json()[resultIndex]
-            if 'link' in response.headers and response.headers['link']:
-                linkHeader = response.headers['link']
-                # The registry is telling us there's more items in the list,
-                # and another call is needed. The link header looks something
-                # like `Link: </v2/_catalog?last=hello-world&n=1>; rel="next"`
-                # we should follow the next path indicated in the link header
-                path = linkHeader[(linkHeader.index('<')+1):linkHeader.index('>')]
-                executeNextHttpCall = True
-        elif response.status_code == 401:
-            raise CLIError('Invalid username or password specified.')
-        else:
-            raise CLIError(json.loads(response.text)['errors'][0]['message'])
-
-    return resultList
-
-def _validate_user_credentials(registry_name, path, resultIndex, username=None, password=None):
-    registry, _ = get_registry_by_name(registry_name)
+# Number of items requested per page from the registry
+PAGE_SIZE = 1000
+# Number of repositories whose tags are fetched concurrently
+MAX_WORKERS = 10
+
+class RegistryCrawler(object):
+    '''Pages through the v2 API of a container registry, reusing one keep-alive session
+    for every request.
+    '''
+    def __init__(self, login_server, username, password, max_workers=MAX_WORKERS):
+        self.registry_endpoint = 'https://' + login_server
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.auth = requests.auth.HTTPBasicAuth(username, password)
+        # allow one pooled connection per worker
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=max_workers))
+
+    def get(self, path, resultIndex):
+        '''Returns every item of a paged registry listing.
+        :param str path: The path of the listing, e.g. /v2/_catalog
+        :param str resultIndex: The key of the items in each page
+        '''
+        path = '{}{}n={}'.format(path, '&' if '?' in path else '?', PAGE_SIZE)
+        resultList = []
+
+        while path:
+            response = self.session.get(self.registry_endpoint + path)
+
+            if response.status_code == 200:
+                resultList += response.json()[resultIndex] or []
+                path = None
+                if 'link' in response.headers and response.headers['link']:
+                    linkHeader = response.headers['link']
+                    # The registry is telling us there's more items in the list,
+                    # and another call is needed. The link header looks something
+                    # like `Link: </v2/_catalog?last=hello-world&n=1>; rel="next"`
+                    # we should follow the next path indicated in the link header
+                    path = linkHeader[(linkHeader.index('<')+1):linkHeader.index('>')]
+            elif response.status_code == 401:
+                raise CLIError('Invalid username or password specified.')
+            else:
+                raise CLIError(json.loads(response.text)['errors'][0]['message'])
+
+        return resultList
+
+    def get_tags(self, repository):
+        return self.get('/v2/' + repository + '/tags/list', 'tags')
+
+    def iter_tags(self, repositories):
+        '''Fetches the tags of the repositories concurrently, yielding the tags of each
+        repository as soon as they are complete.
+        :param list repositories: The repositories to obtain tags from
+        '''
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tasks = {executor.submit(self.get_tags, r): r for r in repositories}
+            for t in as_completed(tasks):
+                yield {'name': tasks[t], 'tags': t.result()}
+
+def _get_registry_crawler(registry_name, path, resultIndex, username=None, password=None,
+                          resource_group_name=None):
+    '''Returns a crawler with valid credentials for the container registry, together with
+    the data obtained from path while validating those credentials.
+    '''
+    registry, resource_group_name = get_registry_by_name(registry_name, resource_group_name)
     login_server = registry.login_server #pylint: disable=no-member
 
+    def _crawl(username, password):
+        crawler = RegistryCrawler(login_server, username, password)
+        return crawler, crawler.get(path, resultIndex)
+
     if username:
         if not password:
             try:
                 password = prompt_pass(msg='Password: ')
             except NoTTYException:
                 raise CLIError('Please specify both username and password in non-interactive mode.')
-        return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+        return _crawl(username, password)
 
     try:
-        cred = acr_credential_show(registry_name)
-        username = cred.username
-        password = cred.password
-        return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+        cred = acr_credential_show(registry_name, resource_group_name)
+        return _crawl(cred.username, cred.password)
     except: #pylint: disable=bare-except
         pass
 
@@ -73,23 +106,56 @@ def _validate_user_credentials(registry_name, path, resultIndex, username=None,
         raise CLIError(
             'Unable to authenticate using admin login credentials or admin is not enabled. ' +
             'Please specify both username and password in non-interactive mode.')
-    return _obtain_data_from_registry(login_server, path, resultIndex, username, password)
+    return _crawl(username, password)
 
-def acr_repository_list(registry_name, username=None, password=None):
+def _validate_user_credentials(registry_name, path, resultIndex, username=None, password=None,
+                               resource_group_name=None):
+    _, result = _get_registry_crawler(registry_name, path, resultIndex, username, password,
+                                      resource_group_name)
+    return result
+
+def acr_repository_list(registry_name, resource_group_name=None, username=None, password=None):
     '''Lists repositories in the specified container registry.
     :param str registry_name: The name of container registry
+    :param str resource_group_name: The name of resource group
     :param str username: The username used to log into the container registry
     :param str password: The password used to log into the container registry
     '''
     path = '/v2/_catalog'
-    return _validate_user_credentials(registry_name, path, 'repositories', username, password)
+    return _validate_user_credentials(registry_name, path, 'repositories', username, password,
+                                      resource_group_name)
 
-def acr_repository_show_tags(registry_name, repository, username=None, password=None):
+def acr_repository_show_tags(registry_name, repository, resource_group_name=None,
+                             username=None, password=None):
     '''Shows tags of a given repository in the specified container registry.
     :param str registry_name: The name of container registry
     :param str repository: The repository to obtain tags from
+    :param str resource_group_name: The name of resource group
     :param str username: The username used to log into the container registry
     :param str password: The password used to log into the container registry
     '''
     path = '/v2/' + repository + '/tags/list'
-    return _validate_user_credentials(registry_name, path, 'tags', username, password)
+    return _validate_user_credentials(registry_name, path, 'tags', username, password,
+                                      resource_group_name)
+
+def acr_repository_list_tags(registry_name, repositories=None, resource_group_name=None, #pylint: disable=too-many-arguments
+                             username=None, password=None):
+    '''Lists tags of all, or of the given, repositories in the specified container registry.
+    :param str registry_name: The name of container registry
+    :param list repositories: The repositories to obtain tags from. Defaults to all repositories
+    :param str resource_group_name: The name of resource group
+    :param str username: The username used to log into the container registry
+    :param str password: The password used to log into the container registry
+    '''
+    if repositories:
+        # validate the credentials with the first repository, then crawl the rest
+        crawler, tags = _get_registry_crawler(registry_name, '/v2/' + repositories[0] + '/tags/list',
+                                              'tags', username, password, resource_group_name)
+        result = [{'name': repositories[0], 'tags': tags}]
+        repositories = repositories[1:]
+    else:
+        crawler, repositories = _get_registry_crawler(registry_name, '/v2/_catalog', 'repositories',
+                                                      username, password, resource_group_name)
+        result = []
+    result.extend(crawler.iter_tags(repositories))
+    return sorted(result, key=lambda r: r['name'])
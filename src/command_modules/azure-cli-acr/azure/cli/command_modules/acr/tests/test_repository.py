@@ -0,0 +1,50 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+
+from azure.cli.command_modules.acr.repository import RegistryCrawler
+
+
+def _response(body, link=None):
+    response = mock.MagicMock()
+    response.status_code = 200
+    response.json.return_value = body
+    response.headers = {'link': link} if link else {}
+    return response
+
+
+class TestRegistryCrawler(unittest.TestCase):
+
+    def test_get_follows_link_header_with_page_size(self):
+        crawler = RegistryCrawler('myregistry.azurecr.io', 'user', 'pass')
+        crawler.session = mock.MagicMock()
+        crawler.session.get.side_effect = [
+            _response({'repositories': ['a', 'b']}, '</v2/_catalog?last=b&n=1000>; rel="next"'),
+            _response({'repositories': ['c']})
+        ]
+
+        self.assertEqual(['a', 'b', 'c'], crawler.get('/v2/_catalog', 'repositories'))
+        self.assertEqual(
+            [mock.call('https://myregistry.azurecr.io/v2/_catalog?n=1000'),
+             mock.call('https://myregistry.azurecr.io/v2/_catalog?last=b&n=1000')],
+            crawler.session.get.call_args_list)
+
+    def test_iter_tags_returns_tags_per_repository(self):
+        crawler = RegistryCrawler('myregistry.azurecr.io', 'user', 'pass')
+        crawler.session = mock.MagicMock()
+        crawler.session.get.side_effect = lambda url: _response(
+            {'tags': None if 'empty' in url else ['latest']})
+
+        result = sorted(crawler.iter_tags(['repo', 'empty']), key=lambda r: r['name'])
+
+        self.assertEqual([{'name': 'empty', 'tags': []}, {'name': 'repo', 'tags': ['latest']}],
+                         result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,7 +34,7 @@ from azure.cli.command_modules.vm._validators import _is_valid_ssh_rsa_public_ke
 from azure.cli.command_modules.acs.mgmt_acs.lib import \
     AcsCreationClient as ACSClient
 # pylint: disable=too-few-public-methods,too-many-arguments,no-self-use,line-too-long
-from azure.cli.core._util import CLIError
+from azure.cli.core._util import CLIError, retry_with_backoff
 from azure.cli.core._profile import Profile
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core._environment import get_config_dir
@@ -77,16 +77,8 @@ def cf_providers():
 
 
 def register_providers():
-    providers = cf_providers()
-
-    namespaces = ['Microsoft.Network', 'Microsoft.Compute', 'Microsoft.Storage']
-    for namespace in namespaces:
-        state = providers.get(resource_provider_namespace=namespace)
-        if state.registration_state != 'Registered':  # pylint: disable=no-member
-            logger.info('registering %s', namespace)
-            providers.register(resource_provider_namespace=namespace)
-        else:
-            logger.info('%s is already registered', namespace)
+    from azure.cli.core.commands.providers import register_providers as _register_providers
+    _register_providers(['Microsoft.Network', 'Microsoft.Compute', 'Microsoft.Storage'], cf_providers())
 
 
 def wait_then_open(url):
@@ -304,14 +296,13 @@ def _build_service_principal(client, name, url, client_secret):
     sys.stdout.write('creating service principal')
     result = create_application(client.applications, name, url, [url], password=client_secret)
     service_principal = result.app_id  # pylint: disable=no-member
-    for x in range(0, 10):
-        try:
-            create_service_principal(service_principal)
-        # TODO figure out what exception AAD throws here sometimes.
-        except:  # pylint: disable=bare-except
-            sys.stdout.write('.')
-            sys.stdout.flush()
-            time.sleep(2 + 2 * x)
+
+    def _progress(*_):
+        sys.stdout.write('.')
+        sys.stdout.flush()
+
+    # TODO figure out what exception AAD throws here sometimes.
+    retry_with_backoff(lambda: create_service_principal(service_principal), on_retry=_progress)
     print('done')
     return service_principal
 
@@ -320,21 +311,22 @@ def _add_role_assignment(role, service_principal, delay=2, output=True):
     # AAD can have delays in propagating data, so sleep and retry
     if output:
         sys.stdout.write('waiting for AAD role to propagate.')
-    for x in range(0, 10):
+
+    def _create():
         try:
-            # TODO: break this out into a shared utility library
             create_role_assignment(role, service_principal)
-            break
         except CloudError as ex:
-            if ex.message == 'The role assignment already exists.':
-                break
-            logger.info('%s', ex.message)
-        except:  # pylint: disable=bare-except
-            pass
+            if ex.message != 'The role assignment already exists.':
+                raise
+
+    def _progress(_, ex):
+        logger.info('%s', getattr(ex, 'message', ex))
         if output:
             sys.stdout.write('.')
-            time.sleep(delay + delay * x)
-    else:
+
+    try:
+        retry_with_backoff(_create, delay=delay, on_retry=_progress)
+    except Exception:  # pylint: disable=broad-except
         return False
     if output:
         print('done')
@@ -104,6 +104,16 @@ helps['appservice web config ssl bind'] = """
     short-summary: Bind an SSL certificate to a web app.
 """
 
+helps['appservice web config ssl bind-batch'] = """
+    type: command
+    short-summary: Bind the SSL certificates of a resource group to the host names of many web apps.
+    long-summary: Every host name of the web apps that a certificate is for, including by a wildcard, is bound to it. The web apps are updated concurrently, once each.
+    examples:
+        - name: Bind a certificate to the host names it is for, across all the web apps of a resource group.
+          text: >
+            az appservice web config ssl bind-batch -g MyResourceGroup --certificate-thumbprints DB2BA6898D0B330A93E7F69FF505C61EF39921B6 --ssl-type SNI
+"""
+
 helps['appservice web config ssl unbind'] = """
     type: command
     short-summary: Unbind an SSL certificate from a web app.
@@ -139,6 +149,25 @@ helps['appservice web log config'] = """
     short-summary: Configure web app logs.
 """
 
+helps['appservice web log tail'] = """
+    type: command
+    short-summary: Stream the live logs of one or more web apps.
+    long-summary: With several web apps, the logs of all of them are streamed together, each line prefixed with the web app and slot it comes from.
+    examples:
+        - name: Stream the application logs of a web app and its staging slot, showing only the errors.
+          text: >
+            az appservice web log tail -g MyResourceGroup -n MyWebApp MyWebApp/staging --provider application --filter "ERROR"
+"""
+
+helps['appservice web log download'] = """
+    type: command
+    short-summary: Download the historical logs of one or more web apps as zip files.
+    examples:
+        - name: Download the logs of two web apps, to webapp_logs-MyWebApp.zip and webapp_logs-MyOtherWebApp.zip.
+          text: >
+            az appservice web log download -g MyResourceGroup -n MyWebApp MyOtherWebApp
+"""
+
 helps['appservice web deployment'] = """
     type: group
     short-summary: Manage web application deployments.
@@ -334,6 +363,55 @@ helps['appservice web browse'] = """
     short-summary: Open the web app in a browser.
 """
 
+helps['appservice web fleet'] = """
+    type: group
+    short-summary: Manage many web apps at once.
+    long-summary: The web apps are selected by --ids, or by resource group and tag. They are operated on in waves of --batch-size web apps at a time, pausing --pause seconds between waves. A wave with a failed web app stops the rollout, unless --continue-on-error. The result of each web app is returned.
+"""
+
+helps['appservice web fleet start'] = """
+    type: command
+    short-summary: Start many web apps.
+"""
+
+helps['appservice web fleet stop'] = """
+    type: command
+    short-summary: Stop many web apps.
+"""
+
+helps['appservice web fleet restart'] = """
+    type: command
+    short-summary: Restart many web apps.
+    examples:
+        - name: Restart the web apps tagged env=prod, 5 at a time, a minute apart.
+          text: >
+            az appservice web fleet restart --tag env=prod --batch-size 5 --pause 60 -o table
+"""
+
+helps['appservice web fleet config'] = """
+    type: group
+    short-summary: Configure many web apps.
+"""
+
+helps['appservice web fleet config update'] = """
+    type: command
+    short-summary: Update the configuration of many web apps.
+"""
+
+helps['appservice web fleet config appsettings'] = """
+    type: group
+    short-summary: Configure the application settings of many web apps.
+"""
+
+helps['appservice web fleet config appsettings update'] = """
+    type: command
+    short-summary: Create or update application settings of many web apps.
+    examples:
+        - name: Set a setting on all the web apps of a resource group, continuing past failures.
+          text: >
+            az appservice web fleet config appsettings update -g MyResourceGroup --settings FEATURE_X=on --continue-on-error
+"""
+
 helps['appservice web create'] = """
     type: command
     short-summary: Create a web app.
@@ -9,7 +9,8 @@ from azure.cli.core.commands import register_cli_argument
 
 from azure.cli.core.commands.parameters import (resource_group_name_type, location_type,
                                                 get_resource_name_completion_list, file_type,
-                                                CliArgumentType, ignore_type, enum_choice_list)
+                                                CliArgumentType, ignore_type, enum_choice_list,
+                                                tag_type)
 
 from azure.mgmt.web.models import DatabaseType
 
@@ -81,10 +82,15 @@ register_cli_argument('appservice web log config', 'level', help='logging level'
 server_log_switch_options = ['off', 'storage', 'filesystem']
 register_cli_argument('appservice web log config', 'web_server_logging', help='configure Web server logging', **enum_choice_list(server_log_switch_options))
 
+for scope in ['appservice web log tail', 'appservice web log download']:
+    register_cli_argument(scope, 'name', arg_type=name_arg_type, nargs='+', completer=get_resource_name_completion_list('Microsoft.Web/sites'), id_part='name',
+                          help="space separated names of the webs. Use NAME/SLOT for a slot other than the one of --slot")
 register_cli_argument('appservice web log tail', 'provider', help="scope the live traces to certain providers/folders, for example:'application', 'http' for server log, 'kudu/trace', etc")
-register_cli_argument('appservice web log download', 'log_file', default='webapp_logs.zip', type=file_type, completer=FilesCompleter(), help='the downloaded zipped log file path')
+register_cli_argument('appservice web log tail', 'filter_pattern', options_list=('--filter',), help='only show the lines matching this regular expression')
+register_cli_argument('appservice web log download', 'log_file', default='webapp_logs.zip', type=file_type, completer=FilesCompleter(), help='the downloaded zipped log file path. With several webs, the name of each is added to it')
 
-register_cli_argument('appservice web config appsettings', 'settings', nargs='+', help="space separated app settings in a format of <name>=<value>")
+for scope in ['appservice web config appsettings', 'appservice web fleet config appsettings']:
+    register_cli_argument(scope, 'settings', nargs='+', help="space separated app settings in a format of <name>=<value>")
 register_cli_argument('appservice web config appsettings', 'setting_names', nargs='+', help="space separated app setting names")
 
 register_cli_argument('appservice web config container', 'docker_registry_server_url', options_list=('--docker-registry-server-url', '-r'), help='the container registry server url')
@@ -92,24 +98,30 @@ register_cli_argument('appservice web config container', 'docker_custom_image_na
 register_cli_argument('appservice web config container', 'docker_registry_server_user', options_list=('--docker-registry-server-user', '-u'), help='the container registry server username')
 register_cli_argument('appservice web config container', 'docker_registry_server_password', options_list=('--docker-registry-server-password', '-p'), help='the container registry server password')
 
-register_cli_argument('appservice web config update', 'remote_debugging_enabled', help='enable or disable remote debugging', **enum_choice_list(two_states_switch))
-register_cli_argument('appservice web config update', 'web_sockets_enabled', help='enable or disable web sockets', **enum_choice_list(two_states_switch))
-register_cli_argument('appservice web config update', 'always_on', help='ensure webapp gets loaded all the time, rather unloaded after been idle. Recommended when you have continuous web jobs running', **enum_choice_list(two_states_switch))
-register_cli_argument('appservice web config update', 'auto_heal_enabled', help='enable or disable auto heal', **enum_choice_list(two_states_switch))
-register_cli_argument('appservice web config update', 'use32_bit_worker_process', options_list=('--use-32bit-worker-process',), help='use 32 bits worker process or not', **enum_choice_list(two_states_switch))
-register_cli_argument('appservice web config update', 'node_version', help='The version used to run your web app if using node, e.g., 4.4.7, 4.5.0, 6.2.2, 6.6.0')
-register_cli_argument('appservice web config update', 'php_version', help='The version used to run your web app if using PHP, e.g., 5.5, 5.6, 7.0')
-register_cli_argument('appservice web config update', 'python_version', help='The version used to run your web app if using Python, e.g., 2.7, 3.4')
-register_cli_argument('appservice web config update', 'net_framework_version', help="The version used to run your web app if using .NET Framework, e.g., 'v4.0' for .NET 4.6 and 'v3.0' for .NET 3.5")
-register_cli_argument('appservice web config update', 'java_version', help="The version used to run your web app if using Java, e.g., '1.7' for Java 7, '1.8' for Java 8")
-register_cli_argument('appservice web config update', 'java_container', help="The java container, e.g., Tomcat, Jetty")
-register_cli_argument('appservice web config update', 'java_container_version', help="The version of the java container, e.g., '8.0.23' for Tomcat")
-register_cli_argument('appservice web config update', 'app_command_line', options_list=('--startup-file',), help="The startup file for linux hosted web apps, e.g. 'process.json' for Node.js web")
-
-register_cli_argument('appservice web config ssl bind', 'ssl_type', help='The ssl cert type', **enum_choice_list(['SNI', 'IP']))
+for scope in ['appservice web config update', 'appservice web fleet config update']:
+    register_cli_argument(scope, 'remote_debugging_enabled', help='enable or disable remote debugging', **enum_choice_list(two_states_switch))
+    register_cli_argument(scope, 'web_sockets_enabled', help='enable or disable web sockets', **enum_choice_list(two_states_switch))
+    register_cli_argument(scope, 'always_on', help='ensure webapp gets loaded all the time, rather unloaded after been idle. Recommended when you have continuous web jobs running', **enum_choice_list(two_states_switch))
+    register_cli_argument(scope, 'auto_heal_enabled', help='enable or disable auto heal', **enum_choice_list(two_states_switch))
+    register_cli_argument(scope, 'use32_bit_worker_process', options_list=('--use-32bit-worker-process',), help='use 32 bits worker process or not', **enum_choice_list(two_states_switch))
+    register_cli_argument(scope, 'node_version', help='The version used to run your web app if using node, e.g., 4.4.7, 4.5.0, 6.2.2, 6.6.0')
+    register_cli_argument(scope, 'php_version', help='The version used to run your web app if using PHP, e.g., 5.5, 5.6, 7.0')
+    register_cli_argument(scope, 'python_version', help='The version used to run your web app if using Python, e.g., 2.7, 3.4')
+    register_cli_argument(scope, 'net_framework_version', help="The version used to run your web app if using .NET Framework, e.g., 'v4.0' for .NET 4.6 and 'v3.0' for .NET 3.5")
+    register_cli_argument(scope, 'java_version', help="The version used to run your web app if using Java, e.g., '1.7' for Java 7, '1.8' for Java 8")
+    register_cli_argument(scope, 'java_container', help="The java container, e.g., Tomcat, Jetty")
+    register_cli_argument(scope, 'java_container_version', help="The version of the java container, e.g., '8.0.23' for Tomcat")
+    register_cli_argument(scope, 'app_command_line', options_list=('--startup-file',), help="The startup file for linux hosted web apps, e.g. 'process.json' for Node.js web")
+
+for scope in ['appservice web config ssl bind', 'appservice web config ssl bind-batch']:
+    register_cli_argument(scope, 'ssl_type', help='The ssl cert type', **enum_choice_list(['SNI', 'IP']))
 register_cli_argument('appservice web config ssl upload', 'certificate_password', help='The ssl cert password')
 register_cli_argument('appservice web config ssl upload', 'certificate_file', type=file_type, help='The filepath for the .pfx file')
 register_cli_argument('appservice web config ssl', 'certificate_thumbprint', help='The ssl cert thumbprint')
+register_cli_argument('appservice web config ssl bind-batch', 'names', nargs='+', completer=get_resource_name_completion_list('Microsoft.Web/sites'),
+                      help='space separated names of the webs. Default to all the webs of the resource group')
+register_cli_argument('appservice web config ssl bind-batch', 'certificate_thumbprints', nargs='+',
+                      help='space separated thumbprints of the ssl certs to bind. Default to all the ssl certs of the resource group')
 
 register_cli_argument('appservice web config hostname', 'webapp_name', help="webapp name", completer=get_resource_name_completion_list('Microsoft.Web/sites'), id_part='name')
 register_cli_argument('appservice web config hostname', 'name', arg_type=name_arg_type, completer=get_hostname_completion_list, help="hostname assigned to the site, such as custom domains", id_part='child_name')
@@ -137,3 +149,12 @@ register_cli_argument('appservice web source-control', 'branch', help='the branc
 register_cli_argument('appservice web source-control', 'repository_type', help='repository type', default='git', **enum_choice_list(['git', 'mercurial']))
 register_cli_argument('appservice web source-control', 'git_token', help='git access token required for auto sync')
 
+register_cli_argument('appservice web fleet', 'resource_group_name', arg_type=resource_group_name_type, arg_group='Webs',
+                      help='the resource group of the webs. Default to all the resource groups with --tag')
+register_cli_argument('appservice web fleet', 'ids', options_list=('--ids',), nargs='+', metavar='RESOURCE_ID', arg_group='Webs',
+                      help='space separated resource IDs of the webs or of their slots')
+register_cli_argument('appservice web fleet', 'tag', tag_type, arg_group='Webs', help="only the webs with a tag in 'key[=value]' format")
+register_cli_argument('appservice web fleet', 'batch_size', type=int, arg_group='Rollout', help='the number of webs in each wave, run concurrently')
+register_cli_argument('appservice web fleet', 'pause', type=int, arg_group='Rollout', help='seconds to wait between waves')
+register_cli_argument('appservice web fleet', 'continue_on_error', action='store_true', arg_group='Rollout',
+                      help='run the waves after one with a failed web, rather than stopping')
@@ -33,6 +33,7 @@ cli_command(__name__, 'appservice web config container show', 'azure.cli.command
 cli_command(__name__, 'appservice web config ssl upload', 'azure.cli.command_modules.appservice.custom#upload_ssl_cert')
 cli_command(__name__, 'appservice web config ssl list', 'azure.cli.command_modules.appservice.custom#list_ssl_certs')
 cli_command(__name__, 'appservice web config ssl bind', 'azure.cli.command_modules.appservice.custom#bind_ssl_cert')
+cli_command(__name__, 'appservice web config ssl bind-batch', 'azure.cli.command_modules.appservice.custom#bind_ssl_cert_batch')
 cli_command(__name__, 'appservice web config ssl unbind', 'azure.cli.command_modules.appservice.custom#unbind_ssl_cert')
 cli_command(__name__, 'appservice web config ssl delete', 'azure.cli.command_modules.appservice.custom#delete_ssl_cert')
 
@@ -56,6 +57,12 @@ cli_command(__name__, 'appservice web log download', 'azure.cli.command_modules.
 cli_command(__name__, 'appservice web log config', 'azure.cli.command_modules.appservice.custom#config_diagnostics')
 cli_command(__name__, 'appservice web browse', 'azure.cli.command_modules.appservice.custom#view_in_browser')
 
+cli_command(__name__, 'appservice web fleet start', 'azure.cli.command_modules.appservice.custom#fleet_start_webapps')
+cli_command(__name__, 'appservice web fleet stop', 'azure.cli.command_modules.appservice.custom#fleet_stop_webapps')
+cli_command(__name__, 'appservice web fleet restart', 'azure.cli.command_modules.appservice.custom#fleet_restart_webapps')
+cli_command(__name__, 'appservice web fleet config update', 'azure.cli.command_modules.appservice.custom#fleet_update_site_configs')
+cli_command(__name__, 'appservice web fleet config appsettings update', 'azure.cli.command_modules.appservice.custom#fleet_update_app_settings')
+
 cli_command(__name__, 'appservice web deployment slot list', 'azure.mgmt.web.operations.web_apps_operations#WebAppsOperations.list_slots', factory)
 cli_command(__name__, 'appservice web deployment slot delete', 'azure.cli.command_modules.appservice.custom#delete_slot')
 cli_command(__name__, 'appservice web deployment slot auto-swap', 'azure.cli.command_modules.appservice.custom#config_slot_auto_swap')
@@ -129,7 +129,7 @@ def update_site_configs(resource_group_name, name, slot=None,
     #and no simple functional replacement for this deprecating method for 3.5
     args, _, _, values = inspect.getargvalues(frame) #pylint: disable=deprecated-method
     for arg in args[3:]:
-        if arg is not None:
+        if values[arg] is not None:
             setattr(configs, arg, values[arg] if arg not in bool_flags else values[arg] == 'true')
 
     return _generic_site_operation(resource_group_name, name, 'update_configuration', slot, configs)
@@ -155,6 +155,130 @@ def delete_app_settings(resource_group_name, name, setting_names, slot=None):
     return _generic_site_operation(resource_group_name, name, 'update_application_settings',
                                    slot, app_settings)
 
+FLEET_MAX_WORKERS = 16
+
+
+def fleet_start_webapps(resource_group_name=None, ids=None, tag=None, slot=None, batch_size=10,
+                        pause=0, continue_on_error=False):
+    return _run_fleet_operation(
+        _get_fleet_targets(resource_group_name, ids, tag, slot),
+        _fleet_site_operation('start'),
+        batch_size, pause, continue_on_error)
+
+
+def fleet_stop_webapps(resource_group_name=None, ids=None, tag=None, slot=None, batch_size=10,
+                       pause=0, continue_on_error=False):
+    return _run_fleet_operation(
+        _get_fleet_targets(resource_group_name, ids, tag, slot),
+        _fleet_site_operation('stop'),
+        batch_size, pause, continue_on_error)
+
+
+def fleet_restart_webapps(resource_group_name=None, ids=None, tag=None, slot=None, batch_size=10,
+                          pause=0, continue_on_error=False):
+    return _run_fleet_operation(
+        _get_fleet_targets(resource_group_name, ids, tag, slot),
+        _fleet_site_operation('restart'),
+        batch_size, pause, continue_on_error)
+
+
+def fleet_update_app_settings(settings, resource_group_name=None, ids=None, tag=None, slot=None,
+                              batch_size=10, pause=0, continue_on_error=False):
+    return _run_fleet_operation(
+        _get_fleet_targets(resource_group_name, ids, tag, slot),
+        lambda _, rg, name, slot: update_app_settings(rg, name, settings, slot),
+        batch_size, pause, continue_on_error)
+
+
+def fleet_update_site_configs(resource_group_name=None, ids=None, tag=None, slot=None, #pylint: disable=too-many-locals
+                              batch_size=10, pause=0, continue_on_error=False,
+                              php_version=None, python_version=None,
+                              node_version=None, net_framework_version=None,
+                              java_version=None, java_container=None, java_container_version=None,
+                              remote_debugging_enabled=None, web_sockets_enabled=None,
+                              always_on=None, auto_heal_enabled=None,
+                              use32_bit_worker_process=None,
+                              app_command_line=None):
+    configs = dict(php_version=php_version, python_version=python_version,
+                   node_version=node_version, net_framework_version=net_framework_version,
+                   java_version=java_version, java_container=java_container,
+                   java_container_version=java_container_version,
+                   remote_debugging_enabled=remote_debugging_enabled,
+                   web_sockets_enabled=web_sockets_enabled, always_on=always_on,
+                   auto_heal_enabled=auto_heal_enabled,
+                   use32_bit_worker_process=use32_bit_worker_process,
+                   app_command_line=app_command_line)
+    return _run_fleet_operation(
+        _get_fleet_targets(resource_group_name, ids, tag, slot),
+        lambda _, rg, name, slot: update_site_configs(rg, name, slot, **configs),
+        batch_size, pause, continue_on_error)
+
+
+def _fleet_site_operation(operation_name):
+    return lambda client, rg, name, slot: _generic_site_operation(rg, name, operation_name, slot,
+                                                                  client=client)
+
+
+def _get_fleet_targets(resource_group_name=None, ids=None, tag=None, slot=None):
+    """ The (resource group, name, slot) of the webs with the ids, or else of those in the resource
+    group, or the subscription, with the tag. """
+    if ids:
+        targets = []
+        for resource_id in ids:
+            parts = parse_resource_id(resource_id)
+            targets.append((parts['resource_group'], parts['name'], parts.get('child_name', slot)))
+        return targets
+    if not resource_group_name and not tag:
+        raise CLIError('Select the webs with --ids, --resource-group or --tag.')
+    client = web_client_factory()
+    webapps = client.web_apps.list_by_resource_group(resource_group_name) if resource_group_name \
+        else client.web_apps.list()
+    if tag:
+        webapps = [w for w in webapps
+                   if all(k in (w.tags or {}) and (not v or w.tags[k] == v) for k, v in tag.items())]
+    return [(w.resource_group, w.name, slot) for w in webapps]
+
+
+def _run_fleet_operation(targets, operation, batch_size, pause, continue_on_error):
+    """ Runs operation(client, resource group, name, slot) on the webs in waves of batch_size webs,
+    pausing for pause seconds between waves. A wave with a failure stops the waves after it unless
+    continue_on_error. Returns the result of each web. """
+    from concurrent.futures import ThreadPoolExecutor
+    import time
+    client = web_client_factory()
+
+    def _run(target):
+        try:
+            operation(client, *target)
+            return None
+        except Exception as ex: #pylint: disable=broad-except
+            return getattr(ex, 'message', None) or str(ex)
+
+    batch_size = max(batch_size, 1)
+    errors = {}
+    with ThreadPoolExecutor(max_workers=min(batch_size, FLEET_MAX_WORKERS)) as executor:
+        for start in range(0, len(targets), batch_size):
+            if start and pause:
+                time.sleep(pause)
+            wave = targets[start:start + batch_size]
+            errors.update(zip(wave, executor.map(_run, wave)))
+            if not continue_on_error and any(errors[t] for t in wave):
+                logger.warning('Stopping, as %s of the webs failed.',
+                               len([t for t in wave if errors[t]]))
+                break
+
+    results = []
+    for target in targets:
+        status = 'Skipped' if target not in errors else \
+            ('Failed' if errors[target] else 'Succeeded')
+        results.append({'resourceGroup': target[0], 'name': target[1], 'slot': target[2],
+                        'status': status, 'error': errors.get(target)})
+    logger.warning('%s', ', '.join('{} {}'.format(len([r for r in results if r['status'] == s]),
+                                                 s.lower())
+                                   for s in ['Succeeded', 'Failed', 'Skipped']))
+    return results
+
+
 CONTAINER_APPSETTING_NAMES = ['DOCKER_REGISTRY_SERVER_URL', 'DOCKER_REGISTRY_SERVER_USERNAME',
                               'DOCKER_REGISTRY_SERVER_PASSWORD', 'DOCKER_CUSTOM_IMAGE_NAME']
 
@@ -582,78 +706,152 @@ def delete_slot(resource_group_name, webapp, slot):
     #TODO: once swagger finalized, expose other parameters like: delete_all_slots, etc...
     client.web_apps.delete_slot(resource_group_name, webapp, slot)
 
-def get_streaming_log(resource_group_name, name, provider=None, slot=None):
-    scm_url = _get_scm_url(resource_group_name, name, slot)
-    streaming_url = scm_url + '/logstream'
-    import time
-    if provider:
-        streaming_url += ('/' + provider.lstrip('/'))
+LOG_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+LOG_DOWNLOAD_WORKERS = 8
+# log lines read from the streams and not printed yet. Reading stops while it's full, so slow
+# output slows the streams rather than filling the memory
+LOG_LINE_BUFFER_SIZE = 1000
 
-    client = web_client_factory()
-    user, password = _get_site_credential(client, resource_group_name, name)
-    t = threading.Thread(target=_stream_trace, args=(streaming_url, user, password))
-    t.daemon = True
-    t.start()
 
-    while True:
-        time.sleep(100) #so that ctrl+c can stop the command
+def get_streaming_log(resource_group_name, name, provider=None, slot=None, filter_pattern=None):
+    """ Streams the logs of one or more web apps, each name optionally followed by /SLOT. Each line
+    is prefixed with the web app and slot it comes from when there are several. """
+    import re
+    sources = _get_log_sources(resource_group_name, name, slot)
+    path = '/logstream' + ('/' + provider.lstrip('/') if provider else '')
+    pattern = re.compile(filter_pattern) if filter_pattern else None
+    _stream_traces([(label if len(sources) > 1 else None, scm_url + path, user, password)
+                    for label, scm_url, user, password in sources], pattern)
+
 
 def download_historical_logs(resource_group_name, name, log_file=None, slot=None):
-    '''
-    Download historical logs as a zip file
-    '''
-    scm_url = _get_scm_url(resource_group_name, name, slot)
-    url = scm_url.rstrip('/') + '/dump'
+    """ Downloads the logs of one or more web apps as zip files, each name optionally followed by
+    /SLOT. With several web apps, the logs of each are downloaded concurrently, to log_file with
+    the web app and slot added to its name. """
+    from concurrent.futures import ThreadPoolExecutor
+    import os
+    sources = _get_log_sources(resource_group_name, name, slot)
+    root, ext = os.path.splitext(log_file)
+    log_files = [log_file] if len(sources) == 1 else \
+        ['{}-{}{}'.format(root, label.replace('/', '-'), ext) for label, _, _, _ in sources]
+    with ThreadPoolExecutor(max_workers=min(len(sources), LOG_DOWNLOAD_WORKERS)) as executor:
+        futures = [executor.submit(_download_log, scm_url, user, password, f)
+                   for (_, scm_url, user, password), f in zip(sources, log_files)]
+    for f, future in zip(log_files, futures):
+        future.result()
+        logger.warning('Downloaded logs to %s', f)
+
+
+def _download_log(scm_url, user_name, password, log_file):
     import requests
-    r = requests.get(url, stream=True)
+    r = requests.get(scm_url + '/dump', auth=(user_name, password), stream=True)
+    r.raise_for_status()
     with open(log_file, 'wb') as f:
-        for chunk in r.iter_content(chunk_size=1024):
+        for chunk in r.iter_content(chunk_size=LOG_DOWNLOAD_CHUNK_SIZE):
             if chunk: # filter out keep-alive new chunks
                 f.write(chunk)
-    logger.warning('Downloaded logs to %s', log_file)
 
-def _get_site_credential(client, resource_group_name, name):
-    creds = client.web_apps.list_publishing_credentials(resource_group_name, name)
+
+def _get_log_sources(resource_group_name, names, slot=None):
+    """ The label, scm url and publishing credentials of each web app, looked up concurrently. """
+    from concurrent.futures import ThreadPoolExecutor
+    names = [names] if isinstance(names, str) else names
+    targets = [tuple(n.split('/', 1)) if '/' in n else (n, slot) for n in names]
+    client = web_client_factory()
+
+    def _get_source(target):
+        webapp, webapp_slot = target
+        scm_url = _get_scm_url(resource_group_name, webapp, webapp_slot).rstrip('/')
+        user, password = _get_site_credential(client, resource_group_name, webapp, webapp_slot)
+        return '/'.join(t for t in target if t), scm_url, user, password
+
+    with ThreadPoolExecutor(max_workers=min(len(targets), LOG_DOWNLOAD_WORKERS)) as executor:
+        return list(executor.map(_get_source, targets))
+
+
+def _get_site_credential(client, resource_group_name, name, slot=None):
+    if slot:
+        creds = client.web_apps.list_publishing_credentials_slot(resource_group_name, name, slot)
+    else:
+        creds = client.web_apps.list_publishing_credentials(resource_group_name, name)
     creds = creds.result()
     return (creds.publishing_user_name, creds.publishing_password)
 
-def _stream_trace(streaming_url, user_name, password):
+
+def _stream_traces(streams, pattern=None):
+    """ Prints the lines of the log streams, each a (label, url, user, password), as they come.
+    A stream is read by a thread of its own, over connections of a pool shared by the streams,
+    and its lines that match the pattern are printed by the calling thread. """
     import sys
     import certifi
     import urllib3
+    try:
+        from Queue import Queue, Empty
+    except ImportError:
+        from queue import Queue, Empty
     try:
         import urllib3.contrib.pyopenssl
         urllib3.contrib.pyopenssl.inject_into_urllib3()
     except ImportError:
         pass
 
-    std_encoding = sys.stdout.encoding
     http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
+    lines = Queue(maxsize=LOG_LINE_BUFFER_SIZE)
+    for stream in streams:
+        t = threading.Thread(target=_read_trace, args=(http, lines, pattern) + stream)
+        t.daemon = True
+        t.start()
+
+    std_encoding = sys.stdout.encoding or 'utf-8'
+    streaming = len(streams)
+    while streaming:
+        try:
+            line = lines.get(timeout=1) # with a timeout, so that ctrl+c can stop the command
+        except Empty:
+            continue
+        if line is None:
+            streaming -= 1
+            continue
+        # Extra encode() and decode for stdout which does not surpport 'utf-8'
+        print(line.encode(std_encoding, errors='replace').decode(std_encoding, errors='replace'),
+              end='') # each line of log has CRLF.
+
+
+def _read_trace(http, lines, pattern, label, streaming_url, user_name, password):
+    import codecs
+    import urllib3
     headers = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(user_name, password))
-    r = http.request(
-        'GET',
-        streaming_url,
-        headers=headers,
-        preload_content=False
-    )
-    for chunk in r.stream():
-        if chunk:
-            # Extra encode() and decode for stdout which does not surpport 'utf-8'
-            print(chunk.decode(encoding='utf-8', errors='replace')
-                  .encode(std_encoding, errors='replace')
-                  .decode(std_encoding, errors='replace'), end='') # each line of log has CRLF.
-    r.release_conn()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    prefix = '[{}] '.format(label) if label else ''
+    partial = ''
+    try:
+        r = http.request('GET', streaming_url, headers=headers, preload_content=False)
+        for chunk in r.stream():
+            partial += decoder.decode(chunk)
+            complete = partial.splitlines(True)
+            partial = complete.pop() if complete and not complete[-1].endswith('\n') else ''
+            for line in complete:
+                if pattern is None or pattern.search(line):
+                    lines.put(prefix + line)
+        r.release_conn()
+        if partial and (pattern is None or pattern.search(partial)):
+            lines.put(prefix + partial)
+    except Exception as ex: # pylint: disable=broad-except
+        logger.warning('Stopped streaming the logs of %s: %s', label or streaming_url, ex)
+    finally:
+        lines.put(None)
+
 
 def upload_ssl_cert(resource_group_name, name, certificate_password, certificate_file):
     client = web_client_factory()
     webapp = _generic_site_operation(resource_group_name, name, 'get')
-    cert_file = open(certificate_file, 'rb')
-    cert_contents = cert_file.read()
+    with open(certificate_file, 'rb') as cert_file:
+        cert_contents = cert_file.read()
     hosting_environment_profile_param = webapp.hosting_environment_profile
     if hosting_environment_profile_param is None:
         hosting_environment_profile_param = ""
 
-    thumb_print = _get_cert(certificate_password, certificate_file)
+    thumb_print = _get_cert(certificate_password, cert_contents)
     cert_name = _generate_cert_name(thumb_print, hosting_environment_profile_param,
                                     webapp.location, resource_group_name)
     cert = Certificate(password=certificate_password, pfx_blob=cert_contents,
@@ -663,12 +861,36 @@ def upload_ssl_cert(resource_group_name, name, certificate_password, certificate
 def _generate_cert_name(thumb_print, hosting_environment, location, resource_group_name):
     return "%s_%s_%s_%s" % (thumb_print, hosting_environment, location, resource_group_name)
 
-def _get_cert(certificate_password, certificate_file):
-    ''' Decrypts the .pfx file '''
-    p12 = OpenSSL.crypto.load_pkcs12(open(certificate_file, 'rb').read(), certificate_password)
+# thumbprints of uploaded .pfx files, by the sha256 of their contents
+PFX_THUMBPRINTS_FILE_NAME = 'pfxThumbprints.json'
+
+def _get_pfx_thumbprints():
+    import os
+    from azure.cli.core._environment import get_config_dir
+    from azure.cli.core._session import Session
+    cache = Session()
+    cache.load(os.path.join(get_config_dir(), PFX_THUMBPRINTS_FILE_NAME))
+    return cache
+
+def _get_cert(certificate_password, cert_contents):
+    '''
+    Decrypts the .pfx file contents, unless the thumbprint of the same contents was kept from an
+    earlier upload
+    '''
+    import hashlib
+    thumbprints = _get_pfx_thumbprints()
+    key = hashlib.sha256(cert_contents).hexdigest()
+    thumbprint = thumbprints.get(key)
+    if thumbprint:
+        return thumbprint
+    p12 = OpenSSL.crypto.load_pkcs12(cert_contents, certificate_password)
     cert = p12.get_certificate()
     digest_algorithm = 'sha1'
     thumbprint = cert.digest(digest_algorithm).decode("utf-8").replace(':', '')
+    try:
+        thumbprints[key] = thumbprint
+    except (OSError, IOError) as ex:
+        logger.debug("Could not keep the certificate thumbprint: %s", ex)
     return thumbprint
 
 def list_ssl_certs(resource_group_name):
@@ -691,38 +913,111 @@ def delete_ssl_cert(resource_group_name, name, certificate_thumbprint):
 
 def _update_host_name_ssl_state(resource_group_name, webapp_name, location,
                                 host_name, ssl_state, thumbprint, slot=None):
+    return _update_host_name_ssl_states(resource_group_name, webapp_name, location,
+                                        {host_name: thumbprint}, ssl_state, slot)
+
+def _update_host_name_ssl_states(resource_group_name, webapp_name, location, thumbprints,
+                                 ssl_state, slot=None, client=None):
+    ''' Updates the ssl state of host names, each with the certificate of its thumbprint '''
     updated_webapp = Site(host_name_ssl_states=
                           [HostNameSslState
                            (
                                name=host_name,
                                ssl_state=ssl_state,
-                               thumbprint=thumbprint,
+                               thumbprint=thumbprints[host_name],
                                to_update=True
                            )
+                           for host_name in sorted(thumbprints)
                           ],
                           location=location)
     name = '{}({})'.format(webapp_name, slot) if slot else webapp_name
     return _generic_site_operation(resource_group_name, name, 'create_or_update',
-                                   slot, updated_webapp)
+                                   slot, updated_webapp, client=client)
+
+def _get_certs_by_thumbprint(client, resource_group_name):
+    return {c.thumbprint: c for c in client.certificates.list_by_resource_group(resource_group_name)}
+
+def _matches_host_name(cert_host_name, host_name):
+    if cert_host_name.startswith('*.'):
+        return '.' in host_name and host_name.split('.', 1)[1].lower() == cert_host_name[2:].lower()
+    return cert_host_name.lower() == host_name.lower()
+
+def _get_cert_host_names(cert, webapp):
+    ''' The host names of the webapp the certificate is for '''
+    return [h for h in webapp.host_names or []
+            if any(_matches_host_name(c, h) for c in cert.host_names or [])]
 
 def _update_ssl_binding(resource_group_name, name, certificate_thumbprint, ssl_type, slot=None):
     client = web_client_factory()
-    webapp = _generic_site_operation(resource_group_name, name, 'get')
-    webapp_certs = client.certificates.list_by_resource_group(resource_group_name)
-    for webapp_cert in webapp_certs:
-        if webapp_cert.thumbprint == certificate_thumbprint:
-            return _update_host_name_ssl_state(resource_group_name, name, webapp.location,
-                                               webapp_cert.host_names[0], ssl_type,
-                                               certificate_thumbprint, slot)
-    raise CLIError("Certificate for thumbprint '{}' not found.".format(certificate_thumbprint))
+    webapp = _generic_site_operation(resource_group_name, name, 'get', slot, client=client)
+    webapp_cert = _get_certs_by_thumbprint(client, resource_group_name).get(certificate_thumbprint)
+    if webapp_cert is None:
+        raise CLIError("Certificate for thumbprint '{}' not found.".format(certificate_thumbprint))
+    host_names = _get_cert_host_names(webapp_cert, webapp) or webapp_cert.host_names[:1]
+    return _update_host_name_ssl_states(resource_group_name, name, webapp.location,
+                                        {h: certificate_thumbprint for h in host_names},
+                                        ssl_type, slot, client)
+
+def _get_ssl_state(ssl_type):
+    return SslState.sni_enabled if ssl_type == 'SNI' else SslState.ip_based_enabled
 
 def bind_ssl_cert(resource_group_name, name, certificate_thumbprint, ssl_type, slot=None):
-    if ssl_type == 'SNI':
-        return _update_ssl_binding(resource_group_name, name,
-                                   certificate_thumbprint, SslState.sni_enabled, slot)
-    else:
-        return _update_ssl_binding(resource_group_name, name,
-                                   certificate_thumbprint, SslState.ip_based_enabled, slot)
+    return _update_ssl_binding(resource_group_name, name, certificate_thumbprint,
+                               _get_ssl_state(ssl_type), slot)
+
+def bind_ssl_cert_batch(resource_group_name, ssl_type, names=None, certificate_thumbprints=None,
+                        slot=None):
+    '''
+    Binds the certificates of the resource group to every host name of the webs they are for. The
+    certificates are listed once, and the webs are looked up and updated concurrently, each with
+    a single update for all its host names.
+    '''
+    from concurrent.futures import ThreadPoolExecutor
+    if slot and not names:
+        raise CLIError('Use --slot with --names.')
+    client = web_client_factory()
+    with ThreadPoolExecutor(max_workers=FLEET_MAX_WORKERS) as executor:
+        certs = executor.submit(_get_certs_by_thumbprint, client, resource_group_name)
+        if names:
+            webapps = list(zip(names, executor.map(
+                lambda n: _generic_site_operation(resource_group_name, n, 'get', slot,
+                                                  client=client), names)))
+        else:
+            webapps = [(w.name, w) for w in
+                       client.web_apps.list_by_resource_group(resource_group_name)]
+        certs = certs.result()
+        missing = [t for t in certificate_thumbprints or [] if t not in certs]
+        if missing:
+            raise CLIError("Certificate for thumbprint '{}' not found.".format(missing[0]))
+        selected = [certs[t] for t in certificate_thumbprints or sorted(certs)]
+
+        def _bind(name, thumbprints, location):
+            try:
+                _update_host_name_ssl_states(resource_group_name, name, location, thumbprints,
+                                             _get_ssl_state(ssl_type), slot, client)
+                return None
+            except Exception as ex: #pylint: disable=broad-except
+                return getattr(ex, 'message', None) or str(ex)
+
+        bindings = []
+        for name, webapp in webapps:
+            thumbprints = {}
+            for cert in selected:
+                for host_name in _get_cert_host_names(cert, webapp):
+                    thumbprints.setdefault(host_name, cert.thumbprint)
+            bindings.append((name, thumbprints,
+                             executor.submit(_bind, name, thumbprints, webapp.location)
+                             if thumbprints else None))
+
+        results = []
+        for name, thumbprints, future in bindings:
+            error = future.result() if future else None
+            results.append({'name': name, 'slot': slot,
+                            'hostNames': sorted(thumbprints),
+                            'thumbprints': sorted(set(thumbprints.values())),
+                            'status': 'Failed' if error else ('Bound' if future else 'NoMatch'),
+                            'error': error})
+    return results
 
 def unbind_ssl_cert(resource_group_name, name, certificate_thumbprint, slot=None):
     return _update_ssl_binding(resource_group_name, name,
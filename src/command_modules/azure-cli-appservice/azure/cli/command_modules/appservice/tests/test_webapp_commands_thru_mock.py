@@ -2,20 +2,113 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import io
 import json
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 import mock
+import yaml
 
+from msrest import Deserializer, Serializer
 from requests import Response
+from six import StringIO
+from six.moves import BaseHTTPServer, socketserver
 
+from azure.mgmt.web import models
 from azure.mgmt.web.models import SourceControl, HostNameBinding, Site
 from azure.mgmt.web import WebSiteManagementClient
 from azure.cli.core.adal_authentication import AdalAuthentication
+from azure.cli.core._util import CLIError
 from azure.cli.command_modules.appservice.custom import (set_deployment_user,
-                                                         update_git_token, add_hostname)
+                                                         update_git_token, add_hostname,
+                                                         get_streaming_log,
+                                                         download_historical_logs,
+                                                         fleet_restart_webapps,
+                                                         bind_ssl_cert, bind_ssl_cert_batch,
+                                                         _get_cert)
 
 # pylint: disable=line-too-long
 
+
+def _load_recorded_ssl_binding():
+    """ The web app and certificates listed by the recorded 'ssl bind', and the web app it put. """
+    deserialize = Deserializer(dict((k, v) for k, v in models.__dict__.items() if isinstance(v, type)))
+    with open(os.path.join(os.path.dirname(__file__), 'recordings', 'test_webapp_ssl.yaml')) as f:
+        interactions = yaml.safe_load(f)['interactions']
+    webapp, certs, put = None, None, None
+    for interaction in interactions:
+        request, body = interaction['request'], interaction['response']['body']['string']
+        uri = request['uri'].split('?')[0]
+        if request['method'] == 'GET' and uri.endswith('/sites/webapp-ssl-test123'):
+            webapp = webapp or deserialize('Site', json.loads(body))
+        elif request['method'] == 'GET' and uri.endswith('/certificates'):
+            certs = deserialize('[Certificate]', json.loads(body)['value'])
+        elif request['method'] == 'PUT' and uri.endswith('/sites/webapp-ssl-test123') and certs and put is None:
+            put = json.loads(request['body'])
+    return webapp, certs, put
+
+
+class _StubWebApps(object):
+    """ Web apps whose operations each take a while, counting those running at once. """
+
+    def __init__(self, webapps, latency=0.05):
+        self.webapps = webapps
+        self.latency = latency
+        self.restarted = []
+        self.failing = set()
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def list_by_resource_group(self, resource_group_name):
+        return [w for w in self.webapps if w.resource_group == resource_group_name]
+
+    def list(self):
+        return list(self.webapps)
+
+    def restart(self, resource_group_name, name):
+        self.restart_slot(resource_group_name, name, None)
+
+    def restart_slot(self, resource_group_name, name, slot):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        threading.Event().wait(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+            self.restarted.append((resource_group_name, name, slot))
+        if name in self.failing:
+            raise CLIError('{} failed to restart'.format(name))
+
+
+class _LogServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _LogHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """ Serves the logs of a web app in chunks that split lines, as the scm site does. """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        webapp = self.path.split('/')[1]
+        if self.path.endswith('/dump'):
+            content = (webapp * 1000).encode('utf-8')
+        else:
+            content = ''.join('{} {} {}\r\n'.format(webapp, 'ERROR' if i % 2 else 'INFO', i) for i in range(5)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for i in range(0, len(content), 7):
+            chunk = content[i:i + 7]
+            self.wfile.write('{:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
 class Test_Webapp_Mocked(unittest.TestCase):
 
     def setUp(self):
@@ -73,6 +166,136 @@ class Test_Webapp_Mocked(unittest.TestCase):
         # assert
         self.assertEqual(result.name, domain)
 
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_log_sources', autospec=True)
+    def test_stream_and_download_logs_of_several_webs(self, get_log_sources_mock):
+        server = _LogServer(('127.0.0.1', 0), _LogHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        get_log_sources_mock.return_value = [('web1', url + '/web1', 'user', 'secret'),
+                                             ('web2/staging', url + '/web2', 'user', 'secret')]
+
+        with mock.patch('sys.stdout', new_callable=StringIO) as stdout:
+            get_streaming_log('g1', ['web1', 'web2/staging'], provider='application', filter_pattern='ERROR')
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(['[web1] web1 ERROR 1', '[web1] web1 ERROR 3'], [l for l in lines if 'web1 ' in l])
+        self.assertEqual(['[web2/staging] web2 ERROR 1', '[web2/staging] web2 ERROR 3'], [l for l in lines if 'web2 ' in l])
+        self.assertEqual(4, len(lines))
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        download_historical_logs('g1', ['web1', 'web2/staging'], os.path.join(directory, 'logs.zip'))
+        with open(os.path.join(directory, 'logs-web2-staging.zip')) as f:
+            self.assertEqual('web2' * 1000, f.read())
+        self.assertEqual(['logs-web1.zip', 'logs-web2-staging.zip'], sorted(os.listdir(directory)))
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_fleet_restart_in_waves(self, client_factory_mock):
+        webapps = []
+        for i in range(7):
+            webapp = Site('westus', tags={'env': 'prod'} if i < 6 else {'env': 'test'})
+            webapp.name = 'web{}'.format(i)
+            webapp.resource_group = 'g1'
+            webapps.append(webapp)
+        web_apps = _StubWebApps(webapps)
+        client_factory_mock.return_value = mock.MagicMock(web_apps=web_apps)
+
+        with mock.patch('time.sleep') as sleep:
+            results = fleet_restart_webapps(tag={'env': 'prod'}, batch_size=3, pause=30)
+        self.assertEqual(['Succeeded'] * 6, [r['status'] for r in results])
+        self.assertEqual(['web{}'.format(i) for i in range(6)], [r['name'] for r in results])
+        self.assertEqual(3, web_apps.max_in_flight)
+        sleep.assert_called_once_with(30)
+
+        # the waves after one with a failure are skipped, unless continuing on errors
+        web_apps.failing.add('web1')
+        with mock.patch('time.sleep'):
+            results = fleet_restart_webapps('g1', batch_size=3)
+        self.assertEqual(['Succeeded', 'Failed', 'Succeeded'] + ['Skipped'] * 4, [r['status'] for r in results])
+        self.assertEqual('web1 failed to restart', results[1]['error'])
+        with mock.patch('time.sleep'):
+            results = fleet_restart_webapps('g1', batch_size=3, continue_on_error=True)
+        self.assertEqual(6, len([r for r in results if r['status'] == 'Succeeded']))
+
+        web_apps.restarted = []
+        fleet_restart_webapps(ids=['/subscriptions/s/resourceGroups/g2/providers/Microsoft.Web/sites/web9/slots/staging',
+                                   '/subscriptions/s/resourceGroups/g2/providers/Microsoft.Web/sites/web8'])
+        self.assertEqual([('g2', 'web8', None), ('g2', 'web9', 'staging')], sorted(web_apps.restarted, key=lambda r: r[1]))
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_bind_ssl_certs_of_many_webs(self, client_factory_mock):
+        webapp, certs, recorded_put = _load_recorded_ssl_binding()
+        other = Site('West US')
+        other.name, other.host_names = 'other', ['other.contoso.com']
+        client = mock.MagicMock()
+        client.web_apps.list_by_resource_group.return_value = [webapp, other]
+        client.certificates.list_by_resource_group.return_value = certs
+        client_factory_mock.return_value = client
+
+        results = bind_ssl_cert_batch('test_cli_webapp_ssl', 'SNI')
+        thumbprint = 'DB2BA6898D0B330A93E7F69FF505C61EF39921B6'
+        self.assertEqual([{'name': 'webapp-ssl-test123', 'slot': None, 'hostNames': ['webapp-ssl-test123.azurewebsites.net'],
+                           'thumbprints': [thumbprint], 'status': 'Bound', 'error': None},
+                          {'name': 'other', 'slot': None, 'hostNames': [], 'thumbprints': [], 'status': 'NoMatch', 'error': None}],
+                         results)
+        # the certificates are listed once, and the web is put as by 'ssl bind'
+        client.certificates.list_by_resource_group.assert_called_once_with('test_cli_webapp_ssl')
+        (resource_group, name, put), _ = client.web_apps.create_or_update.call_args
+        serialize = Serializer(dict((k, v) for k, v in models.__dict__.items() if isinstance(v, type)))
+        self.assertEqual(('test_cli_webapp_ssl', 'webapp-ssl-test123'), (resource_group, name))
+        self.assertEqual(recorded_put, serialize.body(put, 'Site'))
+
+        # a wildcard certificate is for every subdomain
+        certs[0].host_names = ['*.contoso.com']
+        client.web_apps.create_or_update.reset_mock()
+        results = bind_ssl_cert_batch('test_cli_webapp_ssl', 'IP', certificate_thumbprints=[thumbprint])
+        self.assertEqual(['NoMatch', 'Bound'], [r['status'] for r in results])
+        (_, name, put), _ = client.web_apps.create_or_update.call_args
+        self.assertEqual(('other', ['other.contoso.com'], ['IpBasedEnabled']),
+                         (name, [s.name for s in put.host_name_ssl_states], [s.ssl_state.value for s in put.host_name_ssl_states]))
+
+        with self.assertRaisesRegex(CLIError, 'not found'):
+            bind_ssl_cert_batch('test_cli_webapp_ssl', 'SNI', certificate_thumbprints=['ABC'])
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory', autospec=True)
+    def test_bind_ssl_cert_to_the_host_names_of_a_slot(self, client_factory_mock):
+        webapp, certs, _ = _load_recorded_ssl_binding()
+        certs[0].host_names = ['*.contoso.com']
+        staging = Site(webapp.location)
+        staging.name, staging.host_names = 'webapp-ssl-test123(staging)', ['staging.contoso.com']
+        client = mock.MagicMock()
+        client.web_apps.get_slot.return_value = staging
+        client.certificates.list_by_resource_group.return_value = certs
+        client_factory_mock.return_value = client
+
+        bind_ssl_cert('test_cli_webapp_ssl', 'webapp-ssl-test123', certs[0].thumbprint, 'SNI', slot='staging')
+        client.web_apps.get_slot.assert_called_once_with('test_cli_webapp_ssl', 'webapp-ssl-test123', 'staging')
+        client.web_apps.get.assert_not_called()
+        (_, _, put, slot), _ = client.web_apps.create_or_update_slot.call_args
+        self.assertEqual('staging', slot)
+        self.assertEqual(['staging.contoso.com'], [s.name for s in put.host_name_ssl_states])
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.OpenSSL')
+    def test_pfx_thumbprint_is_kept_by_the_uploaded_contents(self, openssl_mock):
+        import hashlib
+        cert = openssl_mock.crypto.load_pkcs12.return_value.get_certificate.return_value
+        cert.digest.return_value = b'DB:2B:A6'
+        with open(os.path.join(os.path.dirname(__file__), 'server.pfx'), 'rb') as f:
+            contents = f.read()
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        with mock.patch('azure.cli.core._environment.get_config_dir', return_value=config_dir):
+            self.assertEqual('DB2BA6', _get_cert('test', contents))
+            # the same contents are not decrypted again, whatever the password
+            self.assertEqual('DB2BA6', _get_cert('other', contents))
+        openssl_mock.crypto.load_pkcs12.assert_called_once_with(contents, 'test')
+        # only the thumbprint is kept, by a digest of the contents
+        with io.open(os.path.join(config_dir, 'pfxThumbprints.json'), encoding='utf-8-sig') as f:
+            self.assertEqual({hashlib.sha256(contents).hexdigest(): 'DB2BA6'}, json.load(f))
+
     @staticmethod
     def _make_response(content_json):
         resp = mock.create_autospec(Response)
@@ -19,7 +19,7 @@ from azure.cli.core.commands import (
     CliCommandArgument,
     get_op_handler)
 from azure.cli.core.commands._introspection import (
-    extract_full_summary_from_signature,
+    extract_full_summary_from_operation,
     extract_args_from_signature)
 
 
@@ -580,8 +580,7 @@ class AzureBatchDataPlaneCommand(object):
             table_transformer=table_transformer,
             arguments_loader=lambda: self._load_transformed_arguments(
                 get_op_handler(operation)),
-            description_loader=lambda: extract_full_summary_from_signature(
-                get_op_handler(operation))
+            description_loader=lambda: extract_full_summary_from_operation(operation)
         )
 
     def _cancel_operation(self, kwargs, config, user):
@@ -18,7 +18,7 @@ from azure.cli.core.commands.parameters import \
 from azure.cli.command_modules.batch._validators import \
     (application_enabled, datetime_format, storage_account_id, application_package_reference_format,
      validate_client_parameters, validate_pool_resize_parameters, metadata_item_format,
-     certificate_reference_format, validate_json_file, validate_cert_file,
+     certificate_reference_format, validate_json_file, validate_task_json_file, validate_cert_file,
      environment_setting_format, validate_cert_settings, resource_file_format, load_node_agent_skus)
 
 # pylint: disable=line-too-long
@@ -92,7 +92,7 @@ register_cli_argument('batch certificate', 'password', help='The password to acc
 register_cli_argument('batch certificate', 'certificate_file', type=file_type, help='The certificate file: cer file or pfx file.', validator=validate_cert_file, completer=FilesCompleter())
 register_cli_argument('batch certificate delete', 'abort', action='store_true', help='Cancel the failed certificate deletion operation.')
 
-register_cli_argument('batch task create', 'json_file', type=file_type, help='The file containing the task(s) to create in JSON format, if this parameter is specified, all other parameters are ignored.', validator=validate_json_file, completer=FilesCompleter())
+register_cli_argument('batch task create', 'json_file', type=file_type, help='The file containing the task(s) to create in JSON format, if this parameter is specified, all other parameters are ignored.', validator=validate_task_json_file, completer=FilesCompleter())
 register_cli_argument('batch task create', 'application_package_references', nargs='+', help='The space separated list of IDs specifying the application packages to be installed. Space separated application IDs with optional version in \'id[#version]\' format.', type=application_package_reference_format)
 register_cli_argument('batch task create', 'job_id', help='The ID of the job containing the task.')
 register_cli_argument('batch task create', 'task_id', help='The ID of the task.')
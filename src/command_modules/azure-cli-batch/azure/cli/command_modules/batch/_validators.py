@@ -177,6 +177,20 @@ def validate_json_file(namespace):
             raise ValueError("Invalid JSON file: {}".format(err))
 
 
+def validate_task_json_file(namespace):
+    """Validate the given task json file, reading a task collection one task at a time"""
+    if namespace.json_file:
+        from azure.cli.command_modules.batch.custom import _iter_json_tasks
+        try:
+            with open(namespace.json_file) as file_handle:
+                for _ in _iter_json_tasks(file_handle):
+                    pass
+        except EnvironmentError:
+            raise ValueError("Cannot access JSON request file: " + namespace.json_file)
+        except ValueError as err:
+            raise ValueError("Invalid JSON file: {}".format(err))
+
+
 def validate_cert_file(namespace):
     """Validate the give cert file existing"""
     try:
@@ -289,6 +289,109 @@ def list_job(client, job_schedule_id=None, filter=None, select=None, expand=None
     return _handle_batch_exception(action)
 
 
+# Limits of a single add task collection request to the Batch service
+MAX_TASKS_PER_REQUEST = 100
+# The service rejects bodies over 1MB, leave room for the request envelope
+MAX_TASK_REQUEST_SIZE = 1000 * 1000
+MAX_TASK_REQUEST_WORKERS = 8
+MAX_TASK_ADD_RETRIES = 3
+
+
+def _iter_json_tasks(file_handle, buffer_size=64 * 1024):
+    """ Yields the task objects of a JSON file one by one. A file holding a JSON array is decoded
+    an element at a time so that large task collections are never loaded whole. """
+    decoder = json.JSONDecoder()
+    buf = file_handle.read(buffer_size).lstrip()
+    if not buf.startswith('['):
+        yield json.loads(buf + file_handle.read())
+        return
+
+    buf = buf[1:]
+    eof = False
+    while True:
+        buf = buf.lstrip()
+        if buf.startswith(','):
+            buf = buf[1:].lstrip()
+        if buf.startswith(']'):
+            return
+        try:
+            obj, end = decoder.raw_decode(buf)
+        except ValueError:
+            if eof:
+                raise
+            # the buffer ends part way through an element
+            more = file_handle.read(buffer_size)
+            eof = not more
+            buf += more
+            continue
+        yield obj
+        buf = buf[end:]
+
+
+def _chunk_tasks(tasks, max_count=MAX_TASKS_PER_REQUEST, max_size=MAX_TASK_REQUEST_SIZE):
+    """ Groups task objects into chunks that fit within a single add task collection request. """
+    chunk, chunk_size = [], 0
+    for task in tasks:
+        size = len(json.dumps(task)) + 1
+        if chunk and (len(chunk) == max_count or chunk_size + size > max_size):
+            yield chunk
+            chunk, chunk_size = [], 0
+        chunk.append(task)
+        chunk_size += size
+    if chunk:
+        yield chunk
+
+
+def _add_task_chunk(client, job_id, tasks):
+    """ Adds a chunk of tasks. Tasks failing with a server error are retried, and a chunk the
+    service finds too large is split in two. Returns the TaskAddResult of every task. """
+    import time
+    results = {}
+    pending = tasks
+    for attempt in range(MAX_TASK_ADD_RETRIES + 1):
+        try:
+            added = client.add_collection(job_id=job_id, value=pending).value
+        except BatchErrorException as ex:
+            if getattr(ex.error, 'code', None) != 'RequestBodyTooLarge' or len(pending) < 2:
+                raise
+            half = len(pending) // 2
+            split = _add_task_chunk(client, job_id, pending[:half]) + \
+                _add_task_chunk(client, job_id, pending[half:])
+            results.update((r.task_id, r) for r in split)
+            break
+        results.update((r.task_id, r) for r in added)
+        failed = set(r.task_id for r in added
+                     if getattr(r.status, 'value', r.status) == 'serverError')
+        pending = [t for t in pending if t.id in failed]
+        if not pending or attempt == MAX_TASK_ADD_RETRIES:
+            break
+        time.sleep(2 ** attempt)
+    return [results[t.id] for t in tasks if t.id in results]
+
+
+def _add_task_collection(client, job_id, json_tasks, max_workers=MAX_TASK_REQUEST_WORKERS):
+    """ Submits the tasks in chunks on a bounded thread pool. Only a few chunks are held in memory
+    at once so that tasks can be streamed from disk. """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    def _submit(chunk):
+        tasks = client._deserialize('[TaskAddParameter]', chunk)  # pylint: disable=protected-access
+        return _add_task_chunk(client, job_id, tasks)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        for index, chunk in enumerate(_chunk_tasks(json_tasks)):
+            if len(running) >= max_workers * 2:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+            running[executor.submit(_submit, chunk)] = index
+        for future in running:
+            results[running[future]] = future.result()
+    return [r for index in sorted(results) for r in results[index]]
+
+
 @transfer_doc(TaskAddParameter, TaskConstraints)
 def create_task(client, job_id, json_file=None, task_id=None, command_line=None,  # pylint:disable=too-many-arguments
                 resource_files=None, environment_settings=None, affinity_info=None,
@@ -298,20 +401,21 @@ def create_task(client, job_id, json_file=None, task_id=None, command_line=None,
         if task is not None:
             client.add(job_id=job_id, task=task)
             return client.get(job_id=job_id, task_id=task.id)
-        else:
-            result = client.add_collection(job_id=job_id, value=tasks)
-            return result.value
+        with open(json_file) as f:
+            try:
+                return _add_task_collection(client, job_id, _iter_json_tasks(f))
+            except (DeserializationError, ValueError):
+                raise ValueError("JSON file '{}' is not in reqired format.".format(json_file))
 
     task = None
     if json_file:
         with open(json_file) as f:
-            json_obj = json.load(f)
-            try:
-                task = client._deserialize('TaskAddParameter', json_obj)  # pylint: disable=protected-access
-            except DeserializationError:
+            first = f.read(1024).lstrip()[:1]
+            if first == '{':
+                f.seek(0)
                 try:
-                    tasks = client._deserialize('[TaskAddParameter]', json_obj)  # pylint: disable=protected-access
-                except DeserializationError:
+                    task = client._deserialize('TaskAddParameter', json.load(f))  # pylint: disable=protected-access
+                except (DeserializationError, ValueError):
                     raise ValueError("JSON file '{}' is not in reqired format.".format(json_file))
     else:
         task = TaskAddParameter(task_id, command_line,
@@ -3,11 +3,13 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
 import os
 import unittest
 import datetime
 import isodate
 import mock
+from six import StringIO
 
 from msrest.exceptions import ValidationError, ClientRequestError
 from azure.batch import models, operations, BatchServiceClient
@@ -16,6 +18,7 @@ from azure.cli.core._util import CLIError
 
 from azure.cli.command_modules.batch import _validators
 from azure.cli.command_modules.batch import _command_type
+from azure.cli.command_modules.batch import custom
 
 
 class TestObj(object):
@@ -683,3 +686,68 @@ class TestBatchLoader(unittest.TestCase):
         with mock.patch.object(_command_type, 'get_op_handler', get_op_handler):
             result = self.command_pool.cmd.execute(kwargs=kwargs)
             self.assertEqual(result, "Pool Created")
+
+
+class TestBatchTaskCollection(unittest.TestCase):
+    # pylint: disable=protected-access
+
+    @staticmethod
+    def _task(task_id):
+        task = mock.MagicMock()
+        task.id = task_id
+        return task
+
+    @staticmethod
+    def _result(task_id, status='success'):
+        result = mock.MagicMock(status=status)
+        result.task_id = task_id
+        return result
+
+    def test_batch_iter_json_tasks(self):
+        tasks = [{'id': 'task{}'.format(i), 'commandLine': 'echo ' + 'x' * i} for i in range(50)]
+        for content, expected in [(json.dumps(tasks), tasks), (json.dumps(tasks, indent=4), tasks),
+                                  ('  []  ', [])]:
+            parsed = list(custom._iter_json_tasks(StringIO(content), buffer_size=16))
+            self.assertEqual(expected, parsed)
+
+        task = {'id': 'task', 'commandLine': 'echo'}
+        self.assertEqual([task], list(custom._iter_json_tasks(StringIO(json.dumps(task)))))
+
+        with self.assertRaises(ValueError):
+            list(custom._iter_json_tasks(StringIO('[{"id": "task"}, {"id"'), buffer_size=4))
+
+    def test_batch_chunk_tasks(self):
+        tasks = [{'id': 'task{}'.format(i)} for i in range(250)]
+        chunks = list(custom._chunk_tasks(tasks))
+        self.assertEqual([100, 100, 50], [len(c) for c in chunks])
+
+        chunks = list(custom._chunk_tasks(tasks, max_size=len(json.dumps(tasks[0])) * 10))
+        self.assertTrue(all(len(c) < 10 for c in chunks))
+        self.assertEqual(tasks, [t for c in chunks for t in c])
+
+    @mock.patch('time.sleep')
+    def test_batch_add_task_chunk_retries_server_errors(self, _):
+        tasks = [self._task('a'), self._task('b'), self._task('c')]
+        client = mock.MagicMock()
+        client.add_collection.side_effect = [
+            mock.MagicMock(value=[self._result('a'), self._result('b', 'serverError'),
+                                  self._result('c', 'clientError')]),
+            mock.MagicMock(value=[self._result('b')])]
+
+        results = custom._add_task_chunk(client, 'job', tasks)
+
+        self.assertEqual(['a', 'b', 'c'], [r.task_id for r in results])
+        self.assertEqual(['success', 'success', 'clientError'], [r.status for r in results])
+        self.assertEqual([tasks[1]], client.add_collection.call_args[1]['value'])
+
+    def test_batch_add_task_collection_in_order(self):
+        tasks = [{'id': 'task{}'.format(i)} for i in range(1050)]
+        client = mock.MagicMock()
+        client._deserialize.side_effect = lambda _, chunk: [self._task(t['id']) for t in chunk]
+        client.add_collection.side_effect = lambda job_id, value: mock.MagicMock(
+            value=[self._result(t.id) for t in value])
+
+        results = custom._add_task_collection(client, 'job', iter(tasks), max_workers=4)
+
+        self.assertEqual([t['id'] for t in tasks], [r.task_id for r in results])
+        self.assertEqual(11, client.add_collection.call_count)
@@ -0,0 +1,20 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from azure.cli.core.help_files import helps
+
+helps['find'] = """
+            type: command
+            short-summary: Find commands by searching their names, help, parameters and examples.
+            long-summary: >
+                Searches an index stored in the CLI configuration directory, so commands are found
+                without loading the command modules. The index is built on first use and rebuilt
+                whenever command modules are installed, removed or upgraded.
+            examples:
+                - name: Find the commands to create a virtual machine.
+                  text: az find -q create vm
+                - name: Find the commands that manage blob storage, as a table.
+                  text: az find -q blob --top 5 -o table
+"""
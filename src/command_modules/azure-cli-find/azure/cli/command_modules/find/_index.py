@@ -0,0 +1,150 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import math
+import marshal
+import os
+import re
+import sys
+from collections import defaultdict
+
+# Bump the version when the layout of the index changes.
+INDEX_VERSION = 1
+INDEX_FILE_NAME = 'findIndex.{}.{}{}.marshal'.format(INDEX_VERSION, *sys.version_info[:2])
+
+# How much a term counts for depending on where it appears in the help of a command.
+NAME_WEIGHT = 5
+SUMMARY_WEIGHT = 3
+PARAMETER_WEIGHT = 2
+LONG_SUMMARY_WEIGHT = 1
+EXAMPLE_WEIGHT = 1
+
+# Query terms that are not in the index are matched against terms they are a prefix of, at a
+# discount.
+PREFIX_MATCH_DISCOUNT = 0.5
+PREFIX_MATCH_MIN_LENGTH = 3
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(['a', 'an', 'and', 'are', 'as', 'az', 'be', 'by', 'for', 'from', 'in',
+                        'is', 'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with'])
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_PATTERN.findall((text or '').lower()) if t not in _STOPWORDS]
+
+
+def get_index_path():
+    from azure.cli.core._environment import get_config_dir
+    return os.path.join(get_config_dir(), INDEX_FILE_NAME)
+
+
+def get_index_key():
+    """ Identifies the installed command modules without importing any of them, so the index is
+    rebuilt whenever a module is installed, removed or upgraded. """
+    import pkgutil
+    from azure.cli.core import __version__ as core_version
+    import azure.cli.command_modules as command_modules
+    modules = []
+    for finder, name, _ in pkgutil.iter_modules(command_modules.__path__):
+        try:
+            mtime = os.path.getmtime(os.path.join(finder.path, name))
+        except (AttributeError, OSError):
+            mtime = 0
+        modules.append((name, mtime))
+    return (core_version, tuple(sorted(modules)))
+
+
+def build_index(entries, key=None):
+    """ Builds an inverted index over help entries.
+    Each entry is a dict with a 'name' and optionally a 'summary', 'long-summary', a list of
+    'parameters' and a list of 'examples'. The index maps every term to a flat tuple of
+    (entry, weight) pairs, where the weight reflects where in the entry the term appears. """
+    names = []
+    summaries = []
+    postings = defaultdict(list)
+    fields = (('summary', SUMMARY_WEIGHT), ('long-summary', LONG_SUMMARY_WEIGHT))
+    for doc_id, entry in enumerate(sorted(entries, key=lambda e: e['name'])):
+        names.append(entry['name'])
+        summaries.append(entry.get('summary') or '')
+        weights = defaultdict(int)
+        for term in set(tokenize(entry['name'])):
+            weights[term] += NAME_WEIGHT
+        for field, weight in fields:
+            for term in set(tokenize(entry.get(field))):
+                weights[term] += weight
+        for term in set(t for p in entry.get('parameters') or [] for t in tokenize(p)):
+            weights[term] += PARAMETER_WEIGHT
+        for term in set(t for e in entry.get('examples') or [] for t in tokenize(e)):
+            weights[term] += EXAMPLE_WEIGHT
+        for term, weight in weights.items():
+            postings[term].extend((doc_id, weight))
+    return {'version': INDEX_VERSION,
+            'key': key,
+            'names': names,
+            'summaries': summaries,
+            'postings': {t: tuple(p) for t, p in postings.items()}}
+
+
+def save_index(index, path):
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as f:
+        marshal.dump(index, f)
+    getattr(os, 'replace', os.rename)(temp_path, path)
+
+
+def load_index(path, key=None):
+    """ Returns the index stored at path, or None if it is missing, unreadable or was built for
+    a different set of command modules. """
+    try:
+        with open(path, 'rb') as f:
+            index = marshal.loads(f.read())  # much faster than unmarshalling from the file
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(index, dict) or index.get('version') != INDEX_VERSION or \
+            (key is not None and index.get('key') != key):
+        return None
+    return index
+
+
+def _expand_term(index, term):
+    postings = index['postings']
+    if term in postings:
+        return [(term, 1.0)]
+    if len(term) < PREFIX_MATCH_MIN_LENGTH:
+        return []
+    return [(t, PREFIX_MATCH_DISCOUNT) for t in postings if t.startswith(term)]
+
+
+def search(index, query, top=None):
+    """ Ranks the indexed entries for a free text query.
+    Entries matching more of the query terms come first, then entries whose name covers more of
+    them, then the entry named exactly like the query, then entries with the fewest other words in
+    their name and finally the entries with the highest tf-idf style score. Returns a list of (name, summary) tuples. """
+    query_terms = tokenize(query)
+    terms = list(dict.fromkeys(query_terms))
+    if not terms:
+        return []
+    postings = index['postings']
+    doc_count = max(len(index['names']), 1)
+    matched = defaultdict(set)
+    scores = defaultdict(float)
+    for term in terms:
+        for indexed_term, discount in _expand_term(index, term):
+            term_postings = postings[indexed_term]
+            idf = math.log(1.0 + float(doc_count) / len(term_postings))
+            for doc_id, weight in zip(term_postings[::2], term_postings[1::2]):
+                matched[doc_id].add(term)
+                scores[doc_id] += weight * idf * discount
+
+    def _rank(doc_id):
+        name_terms = tokenize(index['names'][doc_id])
+        covered = sum(1 for t in terms if t in name_terms)
+        return (-len(matched[doc_id]), -covered, name_terms != query_terms,
+                len(name_terms) - covered, -scores[doc_id], index['names'][doc_id])
+
+    ranked = sorted(matched, key=_rank)
+    if top is not None:
+        ranked = ranked[:top]
+    return [(index['names'][d], index['summaries'][d]) for d in ranked]
@@ -0,0 +1,14 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from azure.cli.core.commands import register_cli_argument
+
+# pylint: disable=line-too-long
+
+register_cli_argument('find', 'search_query', options_list=('--search-query', '-q'), nargs='+',
+                      help='Words to search the commands, their help, parameters and examples for.')
+register_cli_argument('find', 'reindex', action='store_true',
+                      help='Rebuild the search index from the installed command modules before searching.')
+register_cli_argument('find', 'top', type=int, help='Maximum number of commands to return.')
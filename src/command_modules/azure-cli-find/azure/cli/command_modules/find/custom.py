@@ -0,0 +1,75 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+from collections import OrderedDict
+
+from azure.cli.core._util import CLIError
+import azure.cli.core.azlogging as azlogging
+
+from azure.cli.command_modules.find._index import (build_index, get_index_key, get_index_path,
+                                                   load_index, save_index, search)
+
+logger = azlogging.get_az_logger(__name__)
+
+
+def _get_help_entries():
+    """ Loads every installed command module and collects the help of all commands and groups. """
+    import azure.cli.core.commands as commands
+    from azure.cli.core.commands._introspection import save_argument_spec_cache
+    from azure.cli.core.help_files import helps, _load_help_file
+
+    command_table = commands.get_command_table()
+    entries = {}
+    for name in command_table:
+        if name == 'find':
+            continue  # its own examples would match nearly every query
+        commands.load_params(name)
+        command = command_table[name]
+        entries[name] = {
+            'name': name,
+            'summary': (command.description or '').strip().split('\n')[0],
+            'parameters': [' '.join(arg.options_list)
+                           for arg in command.arguments.values()
+                           if arg.options.get('help') != argparse.SUPPRESS]
+        }
+    save_argument_spec_cache()
+    for name in helps:
+        if name == 'find':
+            continue
+        try:
+            help_data = _load_help_file(name) or {}
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Skipping invalid help for '%s'.", name)
+            continue
+        entry = entries.setdefault(name, {'name': name})
+        entry['summary'] = help_data.get('short-summary') or entry.get('summary')
+        entry['long-summary'] = help_data.get('long-summary')
+        entry['examples'] = ['{} {}'.format(e.get('name', ''), e.get('text', ''))
+                             for e in help_data.get('examples') or []]
+    return list(entries.values())
+
+
+def _get_index(reindex):
+    path = get_index_path()
+    key = get_index_key()
+    index = None if reindex else load_index(path, key)
+    if index is None:
+        logger.warning('Building the command search index. This only happens after the CLI is '
+                       'installed or updated.')
+        index = build_index(_get_help_entries(), key)
+        try:
+            save_index(index, path)
+        except (IOError, OSError) as ex:
+            logger.debug('Unable to save the command search index: %s', ex)
+    return index
+
+
+def find_commands(search_query, reindex=False, top=10):
+    if top < 1:
+        raise CLIError('--top must be a positive number.')
+    index = _get_index(reindex)
+    return [OrderedDict([('command', name), ('summary', summary)])
+            for name, summary in search(index, ' '.join(search_query), top)]
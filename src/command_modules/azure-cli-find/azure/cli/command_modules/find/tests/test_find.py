@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import timeit
+import unittest
+
+import mock
+
+from azure.cli.command_modules.find._index import (build_index, load_index, save_index, search,
+                                                   tokenize)
+from azure.cli.command_modules.find.custom import find_commands
+
+ENTRIES = [
+    {'name': 'vm', 'summary': 'Provision Linux or Windows virtual machines.'},
+    {'name': 'vm create', 'summary': 'Create an Azure Virtual Machine.',
+     'parameters': ['--name -n', '--image', '--ssh-key-value'],
+     'examples': ['Create a VM with SSH. az vm create -n MyVm --image UbuntuLTS']},
+    {'name': 'vm disk attach', 'summary': 'Attach a managed disk to a VM.',
+     'parameters': ['--vm-name', '--disk'],
+     'long-summary': 'The disk must exist before it can be attached to the VM.'},
+    {'name': 'vmss create', 'summary': 'Create an Azure Virtual Machine Scale Set.',
+     'parameters': ['--name -n', '--image']},
+    {'name': 'storage blob upload', 'summary': 'Upload a file to a storage blob.',
+     'parameters': ['--container-name -c', '--file -f']},
+]
+
+
+def _find_baseline_command_table():
+    path = os.path.dirname(os.path.abspath(__file__))
+    while path != os.path.dirname(path):
+        candidate = os.path.join(path, 'baseline_command_table.json')
+        if os.path.isfile(candidate):
+            return candidate
+        path = os.path.dirname(path)
+    return None
+
+
+class TestFindIndex(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(['create', 'vm', 'ssh', 'key', 'value'],
+                         tokenize('Create the VM --ssh-key-value'))
+        self.assertEqual([], tokenize(None))
+
+    def test_search_ranks_name_matches_first(self):
+        index = build_index(ENTRIES)
+        self.assertEqual('vm create', search(index, 'create vm')[0][0])
+        self.assertEqual('vm disk attach', search(index, 'attach disk')[0][0])
+        self.assertEqual(['vm create', 'vmss create'],
+                         [name for name, _ in search(index, 'create')])
+        self.assertEqual(['vm create', 'vm'],
+                         [name for name, _ in search(index, 'vm image', top=2)])
+        self.assertEqual([], search(index, 'the'))
+        self.assertEqual([], search(index, 'keyvault'))
+
+    def test_search_matches_prefixes_of_unknown_terms(self):
+        index = build_index(ENTRIES)
+        self.assertEqual([('storage blob upload', 'Upload a file to a storage blob.')],
+                         search(index, 'stor upl'))
+        self.assertEqual([], search(index, 'st'))
+
+    def test_saved_index_is_only_loaded_for_the_same_modules(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'index')
+        save_index(build_index(ENTRIES, key=('1.0', (('vm', 1),))), path)
+
+        self.assertEqual('vm create', search(load_index(path, ('1.0', (('vm', 1),))), 'vm')[1][0])
+        self.assertIsNone(load_index(path, ('1.0', (('vm', 2),))))
+        self.assertIsNone(load_index(os.path.join(directory, 'missing')))
+
+    def test_baseline_commands_rank_first_for_their_own_name(self):
+        baseline_path = _find_baseline_command_table()
+        if not baseline_path:
+            self.skipTest('baseline_command_table.json is not available')
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        entries = [{'name': name.strip(),
+                    'parameters': [arg['name'] for arg in command['arguments']]}
+                   for name, command in baseline.items()]
+        index = build_index(entries)
+
+        # names such as 'vm list-sizes' and 'vm list sizes' tokenize the same way
+        names = set(e['name'] for e in entries)
+        ambiguous = set(n for n in names
+                        if any(o != n and tokenize(o) == tokenize(n) for o in names))
+        for name in names - ambiguous:
+            self.assertEqual(name, search(index, name)[0][0])
+
+        elapsed = timeit.timeit(lambda: [search(index, name, top=10) for name in names], number=1)
+        self.assertLess(elapsed / len(names), 0.01)
+
+
+class TestFindCommands(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        patches = [mock.patch('azure.cli.core._environment.get_config_dir',
+                              return_value=self.config_dir),
+                   mock.patch('azure.cli.command_modules.find.custom.get_index_key',
+                              return_value=('1.0', (('vm', 1),)))]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    @mock.patch('azure.cli.command_modules.find.custom._get_help_entries', return_value=ENTRIES)
+    def test_index_is_built_once_and_reused(self, get_help_entries):
+        result = find_commands(['create', 'vm'], top=1)
+        self.assertEqual([{'command': 'vm create', 'summary': 'Create an Azure Virtual Machine.'}],
+                         [dict(r) for r in result])
+
+        self.assertEqual('storage blob upload', find_commands(['blob'])[0]['command'])
+        self.assertEqual(1, get_help_entries.call_count)
+
+        find_commands(['blob'], reindex=True)
+        self.assertEqual(2, get_help_entries.call_count)
+
+    @mock.patch('azure.cli.command_modules.find.custom._get_help_entries', return_value=ENTRIES)
+    def test_index_is_rebuilt_when_modules_change(self, get_help_entries):
+        find_commands(['vm'])
+        with mock.patch('azure.cli.command_modules.find.custom.get_index_key',
+                        return_value=('1.0', (('vm', 2),))):
+            find_commands(['vm'])
+        self.assertEqual(2, get_help_entries.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
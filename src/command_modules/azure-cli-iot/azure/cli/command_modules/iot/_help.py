@@ -199,6 +199,16 @@ helps['iot device create'] = """
             az iot device create --hub-name MyIotHub --device-id MyDevice --x509 --output-dir /path/to/output
 """
 
+helps['iot device create-batch'] = """
+    type: command
+    short-summary: Register the devices in a local file in an IoT Hub.
+    long-summary: The file is read as the devices are created, 100 devices per request with several requests at a time. Devices that fail for throttling or a server error are retried. The devices that could not be created are returned.
+    examples:
+        - name: Create the devices exported from another IoT Hub.
+          text: >
+            az iot device create-batch --hub-name MyIotHub --input-file devices.jsonl
+"""
+
 helps['iot device show'] = """
     type: command
     short-summary: Show metadata of a device in an IoT Hub.
@@ -226,7 +236,7 @@ helps['iot device delete'] = """
 helps['iot device show-connection-string'] = """
     type: command
     short-summary: Show the connection string of devices in an IoT Hub.
-    long-summary: If the device identifier is not provided, connection strings for all devices in your IoT Hub are returned. Otherwise, the connection string of the target device is returned.
+    long-summary: If the device identifier is not provided, connection strings for all devices in your IoT Hub are returned. Otherwise, the connection string of the target device is returned. A file written with --output-file holds the device keys, and only the current user can read it.
     examples:
         - name: Show the connection string of a device in an IoT Hub using primary key.
           text: >
@@ -240,6 +250,9 @@ helps['iot device show-connection-string'] = """
         - name: Show the connection strings of the top 100 devices in an IoT Hub using primary key.
           text: >
             az iot device show-connection-string --hub-name MyIotHub --top 100
+        - name: Write the connection strings of all devices in an IoT Hub to a file, as JSON lines.
+          text: >
+            az iot device show-connection-string --hub-name MyIotHub --output-file devices.jsonl
 """
 
 helps['iot device message'] = """
@@ -292,6 +305,16 @@ helps['iot device export'] = """
     long-summary: For more information, see https://docs.microsoft.com/azure/iot-hub/iot-hub-devguide-identity-registry#import-and-export-device-identities.
 """
 
+helps['iot device export-local'] = """
+    type: command
+    short-summary: Export the device identities of an IoT Hub to a local file.
+    long-summary: The identities are written as JSON lines, a page of devices at a time, in the format create-batch reads. Unlike export, no blob container is needed. With --include-keys the file holds the device keys unencrypted, and only the current user can read it.
+    examples:
+        - name: Export the device identities with their keys.
+          text: >
+            az iot device export-local --hub-name MyIotHub --output-file devices.jsonl --include-keys
+"""
+
 helps['iot device import'] = """
     type: command
     short-summary: Import, update, or delete device identities in the IoT hub identity registry from a blob.
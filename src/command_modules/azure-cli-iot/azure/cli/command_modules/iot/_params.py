@@ -78,6 +78,11 @@ register_cli_argument('iot device create', 'output_dir', arg_group='X.509 Certif
                       help='Output directory for generated self-signed X.509 certificate. '
                            'Default is current working directory.')
 
+# Arguments for 'iot device create-batch'
+register_cli_argument('iot device create-batch', 'input_file',
+                      help='File of the devices to create, as JSON lines with the device identity in the format of an '
+                           'import job: an \'id\' and optionally a \'status\' and \'authentication\'.')
+
 # Arguments for 'iot device list'
 register_cli_argument('iot device list', 'top', help='Maximum number of device identities to return.', type=int)
 
@@ -90,7 +95,11 @@ register_cli_argument('iot device delete', 'etag',
 
 # Arguments for 'iot device show-connection-string'
 register_cli_argument('iot device show-connection-string', 'top', type=int,
-                      help='Maximum number of connection strings to return.')
+                      help='Maximum number of connection strings to return. Ignored with --output-file.')
+register_cli_argument('iot device show-connection-string', 'output_file',
+                      help='Write the connection strings of all devices in the IoT Hub to this file, as JSON lines, '
+                           'rather than returning them. Use for IoT Hubs with many devices. The file holds the device '
+                           'keys, and only the current user can read it.')
 register_cli_argument('iot device show-connection-string', 'key_type', options_list=('--key',), help='The key to use.',
                       **enum_choice_list(KeyType))
 
@@ -124,3 +133,10 @@ register_cli_argument('iot device import', 'input_blob_container_uri',
 register_cli_argument('iot device import', 'output_blob_container_uri',
                       help='Blob Shared Access Signature URI with write access to a blob container.'
                            'This is used to output the status of the job and the results.')
+
+# Arguments for 'iot device export-local'
+register_cli_argument('iot device export-local', 'output_file',
+                      help='File to write the device identities to, as JSON lines that create-batch reads.')
+register_cli_argument('iot device export-local', 'include_keys', action='store_true',
+                      help='If set, keys are exported, and only the current user can read the file. Every device is '
+                           'fetched for them, which takes longer.')
@@ -35,6 +35,7 @@ cli_command(__name__, 'iot hub show-stats', custom_path.format('iot_hub_get_stat
 
 # iot device commands
 cli_command(__name__, 'iot device create', custom_path.format('iot_device_create'), factory)
+cli_command(__name__, 'iot device create-batch', custom_path.format('iot_device_create_batch'), factory)
 cli_command(__name__, 'iot device list', custom_path.format('iot_device_list'), factory)
 cli_command(__name__, 'iot device show-connection-string', custom_path.format('iot_device_show_connection_string'), factory)
 cli_command(__name__, 'iot device show', custom_path.format('iot_device_get'), factory)
@@ -47,3 +48,4 @@ cli_command(__name__, 'iot device message reject', custom_path.format('iot_devic
 cli_command(__name__, 'iot device message abandon', custom_path.format('iot_device_abandon_message'), factory)
 cli_command(__name__, 'iot device export', custom_path.format('iot_device_export'), factory)
 cli_command(__name__, 'iot device import', custom_path.format('iot_device_import'), factory)
+cli_command(__name__, 'iot device export-local', custom_path.format('iot_device_export_local'), factory)
@@ -7,19 +7,32 @@
 from __future__ import print_function
 from os.path import exists
 from enum import Enum
-from azure.cli.core._util import CLIError
+from azure.cli.core._util import CLIError, open_private_file
 from azure.cli.core.commands import LongRunningOperation
 from azure.mgmt.iothub.models.iot_hub_client_enums import IotHubSku, AccessRights
 from azure.mgmt.iothub.models.iot_hub_description import IotHubDescription
 from azure.mgmt.iothub.models.iot_hub_sku_info import IotHubSkuInfo
 from azure.mgmt.iothub.models.shared_access_signature_authorization_rule import SharedAccessSignatureAuthorizationRule
 from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.iot_hub_device_client import IotHubDeviceClient
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.error_details import ErrorDetailsException
 from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.authentication import Authentication
 from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.device_description import DeviceDescription
 from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.models.x509_thumbprint import X509Thumbprint
 from azure.cli.command_modules.iot.sas_token_auth import SasTokenAuthentication
 from ._factory import resource_service_factory
 from ._utils import create_self_signed_certificate
+import azure.cli.core.azlogging as azlogging
+
+logger = azlogging.get_az_logger(__name__)
+
+DEVICE_QUERY_PAGE_SIZE = 1000
+DEVICE_FETCH_WORKERS = 16
+DEVICE_BATCH_SIZE = 100
+DEVICE_BATCH_RETRIES = 3
+DEVICE_BATCH_RETRY_DELAY = 1
+DEVICE_BATCH_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEVICE_BATCH_RETRY_ERROR_CODES = ('ThrottlingException', 'ThrottleBacklogLimitExceeded', 'ServerError',
+                                  'ServiceUnavailable', 'InternalServerError')
 
 
 # CUSTOM TYPE
@@ -266,19 +279,69 @@ def iot_device_delete(client, hub_name, device_id, resource_group_name=None, eta
 
 
 def iot_device_show_connection_string(client, hub_name, device_id=None, resource_group_name=None, top=20,
-                                      key_type=KeyType.primary.value):
+                                      key_type=KeyType.primary.value, output_file=None):
     resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
+    device_client = _get_device_client(client, resource_group_name, hub_name, '')
+    host_name = _get_hub_host_name(hub_name)
     if device_id is None:
-        devices = iot_device_list(client, hub_name, resource_group_name, top)
+        if output_file:
+            return _write_device_connection_strings(device_client, host_name, key_type, output_file)
+        devices = device_client.list(top)
         if devices is None:
             raise CLIError('No devices found in IoT Hub {}.'.format(hub_name))
-
-        def conn_str_getter(d):
-            return _get_single_device_connection_string(client, hub_name, d.device_id, resource_group_name, key_type)
-        return [{'deviceId': d.device_id, 'connectionString': conn_str_getter(d)} for d in devices]
+        # the listed devices come with their keys, so the connection strings are built from those
+        return [{'deviceId': d.device_id, 'connectionString': _build_device_connection_string(host_name, d, key_type)}
+                for d in devices]
     else:
-        conn_str = _get_single_device_connection_string(client, hub_name, device_id, resource_group_name, key_type)
-        return {'connectionString': conn_str}
+        device = device_client.get(device_id)
+        if device is None:
+            raise CLIError('Device {} not found.'.format(device_id))
+        return {'connectionString': _build_device_connection_string(host_name, device, key_type)}
+
+
+def _write_device_connection_strings(device_client, host_name, key_type, output_file):
+    """ Writes the connection strings of every device in the hub to a file, a JSON object per line, a page of
+    devices at a time. Devices listed by the query come without their keys, so those authenticated by keys are
+    fetched concurrently, by at most DEVICE_FETCH_WORKERS at a time. """
+    from concurrent.futures import ThreadPoolExecutor
+    import json
+
+    def _connection_string(twin):
+        device_id = twin['deviceId']
+        if twin.get('authenticationType', 'sas') != 'sas':
+            return device_id, _build_device_connection_string(host_name, None, key_type, device_id)
+        device = _get_listed_device(device_client, device_id)
+        return device_id, device and _build_device_connection_string(host_name, device, key_type)
+
+    count = 0
+    # the connection strings hold the keys of the devices
+    with open_private_file(output_file) as f, ThreadPoolExecutor(max_workers=DEVICE_FETCH_WORKERS) as executor:
+        for twins in _iter_device_twins(device_client):
+            for device_id, conn_str in executor.map(_connection_string, twins):
+                if conn_str is not None:
+                    f.write(json.dumps({'deviceId': device_id, 'connectionString': conn_str}) + '\n')
+                    count += 1
+    return {'deviceCount': count, 'outputFile': output_file}
+
+
+def _iter_device_twins(device_client):
+    """ The twins of every device in the hub, a page at a time. """
+    continuation = None
+    while True:
+        page = device_client.query('SELECT * FROM devices', DEVICE_QUERY_PAGE_SIZE, continuation, raw=True)
+        yield page.output or []
+        continuation = page.headers.get('x-ms-continuation')
+        if not continuation:
+            return
+
+
+def _get_listed_device(device_client, device_id):
+    try:
+        return device_client.get(device_id)
+    except ErrorDetailsException as ex:
+        # removed since it was listed
+        logger.warning("Skipping device '%s': %s", device_id, ex)
+        return None
 
 
 def iot_device_send_message(client, hub_name, device_id, resource_group_name=None, data='Ping from Azure CLI',
@@ -331,26 +394,142 @@ def iot_device_import(client, hub_name, input_blob_container_uri, output_blob_co
     return client.import_devices(resource_group_name, hub_name, input_blob_container_uri, output_blob_container_uri)
 
 
-def _get_single_device_connection_string(client, hub_name, device_id, resource_group_name, key_type):
-    device_client = _get_device_client(client, resource_group_name, hub_name, device_id)
-    device = device_client.get(device_id)
-    if device is None:
-        raise CLIError('Device {} not found.'.format(device_id))
+def iot_device_create_batch(client, hub_name, input_file, resource_group_name=None):
+    """ Creates the devices in a file of JSON lines, DEVICE_BATCH_SIZE devices per request and DEVICE_FETCH_WORKERS
+    requests at a time, reading the file as the requests complete. """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    device_client = _get_device_client(client, resource_group_name, hub_name, '')
+    result = {'created': 0, 'failed': []}
+
+    def _add(futures):
+        for future in futures:
+            created, failed = future.result()
+            result['created'] += created
+            result['failed'].extend(failed)
+
+    with open(input_file) as f, ThreadPoolExecutor(max_workers=DEVICE_FETCH_WORKERS) as executor:
+        pending = set()
+        for batch in _read_device_batches(f, input_file):
+            if len(pending) >= 2 * DEVICE_FETCH_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _add(done)
+            pending.add(executor.submit(_create_devices, device_client, batch))
+        _add(wait(pending).done)
+    if result['failed']:
+        logger.warning('%d devices could not be created.', len(result['failed']))
+    return result
+
+
+def _read_device_batches(lines, input_file):
+    import json
+    batch = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            device = json.loads(line)
+            device['id']  # pylint: disable=pointless-statement
+        except (ValueError, KeyError, TypeError):
+            raise CLIError("Line {} of '{}' isn't a device: a JSON object with an 'id'.".format(number, input_file))
+        device.setdefault('importMode', 'create')
+        batch.append(device)
+        if len(batch) == DEVICE_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _create_devices(device_client, devices):
+    """ Creates a batch of devices, retrying those that failed for throttling or a server error. Returns the number
+    created and the errors of those that weren't. """
+    import time
+    created, failed, retrying = 0, [], []
+    for attempt in range(DEVICE_BATCH_RETRIES + 1):
+        if attempt:
+            time.sleep(DEVICE_BATCH_RETRY_DELAY * 2 ** (attempt - 1))
+        try:
+            result = device_client.bulk_create_or_update(devices) or {}
+        except ErrorDetailsException as ex:
+            status = ex.response.status_code
+            retrying = [{'deviceId': d['id'], 'errorCode': status, 'errorStatus': str(ex)} for d in devices]
+            if status not in DEVICE_BATCH_RETRY_STATUS_CODES:
+                break
+            continue
+        if result.get('isSuccessful'):
+            return created + len(devices), failed
+        errors = result.get('errors')
+        if not errors:
+            # the request as a whole was rejected, as for a device with an invalid status or authentication
+            message = result.get('Message') or result.get('message') or 'The devices were rejected.'
+            return created, failed + [{'deviceId': d['id'], 'errorCode': 400, 'errorStatus': message}
+                                      for d in devices]
+        created += len(devices) - len(errors)
+        retried = set(e['deviceId'] for e in errors if e.get('errorCode') in DEVICE_BATCH_RETRY_ERROR_CODES)
+        failed.extend(e for e in errors if e['deviceId'] not in retried)
+        retrying = [e for e in errors if e['deviceId'] in retried]
+        devices = [d for d in devices if d['id'] in retried]
+        if not devices:
+            break
+    return created, failed + retrying
+
+
+def iot_device_export_local(client, hub_name, output_file, include_keys=False, resource_group_name=None):
+    """ Writes the identities of every device in the hub to a file of JSON lines that create-batch can read, a page
+    of devices at a time. The keys are only returned by the device, so with them every device is fetched, by at
+    most DEVICE_FETCH_WORKERS at a time. """
+    from concurrent.futures import ThreadPoolExecutor
+    import json
+    device_client = _get_device_client(client, resource_group_name, hub_name, '')
 
-    conn_str_template = 'HostName={0}.azure-devices.net;DeviceId={1};{2}={3}'
-    keys = device.authentication.symmetric_key
-    if any([keys.primary_key, keys.secondary_key]):
+    def _exported(twin):
+        if not include_keys:
+            exported = {'id': twin['deviceId'], 'status': twin.get('status')}
+            if twin.get('x509Thumbprint'):
+                exported['authentication'] = {'x509Thumbprint': twin['x509Thumbprint']}
+            return exported
+        device = _get_listed_device(device_client, twin['deviceId'])
+        if device is None:
+            return None
+        auth = device.authentication
+        keys = auth.symmetric_key if auth else None
+        thumbprints = auth.x509_thumbprint if auth else None
+        return {'id': device.device_id, 'status': device.status, 'authentication': {
+            'symmetricKey': {'primaryKey': keys and keys.primary_key, 'secondaryKey': keys and keys.secondary_key},
+            'x509Thumbprint': {'primaryThumbprint': thumbprints and thumbprints.primary_thumbprint,
+                               'secondaryThumbprint': thumbprints and thumbprints.secondary_thumbprint}}}
+
+    count = 0
+    with open_private_file(output_file) if include_keys else open(output_file, 'w') as f, \
+            ThreadPoolExecutor(max_workers=DEVICE_FETCH_WORKERS) as executor:
+        for twins in _iter_device_twins(device_client):
+            for exported in executor.map(_exported, twins):
+                if exported is not None:
+                    f.write(json.dumps(exported) + '\n')
+                    count += 1
+    return {'deviceCount': count, 'outputFile': output_file}
+
+
+def _build_device_connection_string(host_name, device, key_type, device_id=None):
+    conn_str_template = 'HostName={0};DeviceId={1};{2}={3}'
+    device_id = device_id or device.device_id
+    keys = device.authentication.symmetric_key if device else None
+    if keys and any([keys.primary_key, keys.secondary_key]):
         key = keys.secondary_key if key_type == KeyType.secondary else keys.primary_key
         if key is None:
             raise CLIError('{0} key not found.'.format(key_type))
-        return conn_str_template.format(hub_name, device_id, 'SharedAccessKey', key)
+        return conn_str_template.format(host_name, device_id, 'SharedAccessKey', key)
     else:
-        return conn_str_template.format(hub_name, device_id, 'x509', 'true')
+        return conn_str_template.format(host_name, device_id, 'x509', 'true')
+
+
+def _get_hub_host_name(hub_name):
+    return '{0}.azure-devices.net'.format(hub_name)
 
 
 def _get_device_client(client, resource_group_name, hub_name, device_id):
     resource_group_name = _ensure_resource_group_name(client, resource_group_name, hub_name)
-    base_url = '{0}.azure-devices.net'.format(hub_name)
+    base_url = _get_hub_host_name(hub_name)
     uri = '{0}/devices/{1}'.format(base_url, device_id)
     access_policy = iot_hub_policy_get(client, hub_name, 'iothubowner', resource_group_name)
     creds = SasTokenAuthentication(uri, access_policy.key_name, access_policy.primary_key)
@@ -266,6 +266,140 @@ class IotHubDevicesOperations(object):
 
         return deserialized
 
+    def bulk_create_or_update(
+            self, devices, custom_headers=None, raw=False, **operation_config):
+        """Create, update or delete up to 100 device identities in the
+        identity registry of an IoT Hub.
+
+        Create, update or delete up to 100 device identities in the identity
+        registry of an IoT Hub. The devices that couldn't be changed are
+        listed in the errors of the result.
+
+        :param devices: Devices, each with an 'id' and an 'importMode' such as
+         'create'.
+        :type devices: list of object
+        :param dict custom_headers: headers that will be added to the request
+        :param bool raw: returns the direct response alongside the
+         deserialized response
+        :param operation_config: :ref:`Operation configuration
+         overrides<msrest:optionsforoperations>`.
+        :rtype: object
+        :rtype: :class:`ClientRawResponse<msrest.pipeline.ClientRawResponse>`
+         if raw=true
+        """
+        # Construct URL
+        url = '/devices'
+
+        # Construct parameters
+        query_parameters = {}
+        query_parameters['api-version'] = self._serialize.query("self.config.api_version", self.config.api_version, 'str')
+
+        # Construct headers
+        header_parameters = {}
+        header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+        if self.config.generate_client_request_id:
+            header_parameters['x-ms-client-request-id'] = str(uuid.uuid1())
+        if custom_headers:
+            header_parameters.update(custom_headers)
+        if self.config.accept_language is not None:
+            header_parameters['accept-language'] = self._serialize.header("self.config.accept_language", self.config.accept_language, 'str')
+
+        # Construct body
+        body_content = self._serialize.body(devices, '[object]')
+
+        # Construct and send request
+        request = self._client.post(url, query_parameters)
+        response = self._client.send(
+            request, header_parameters, body_content, **operation_config)
+
+        if response.status_code not in [200, 400]:
+            raise models.ErrorDetailsException(self._deserialize, response)
+
+        deserialized = None
+
+        if response.status_code == 200:
+            deserialized = self._deserialize('object', response)
+        if response.status_code == 400:
+            deserialized = self._deserialize('object', response)
+
+        if raw:
+            client_raw_response = ClientRawResponse(deserialized, response)
+            return client_raw_response
+
+        return deserialized
+
+    def query(
+            self, query, max_item_count=None, continuation=None, custom_headers=None, raw=False, **operation_config):
+        """Query device twins from the identity registry of an IoT Hub, a page
+        at a time.
+
+        Query device twins from the identity registry of an IoT Hub, a page
+        at a time.
+
+        :param query: Query, such as 'SELECT * FROM devices'.
+        :type query: str
+        :param max_item_count: Maximum number of device twins in the page.
+        :type max_item_count: int
+        :param continuation: Continuation token returned with the previous
+         page.
+        :type continuation: str
+        :param dict custom_headers: headers that will be added to the request
+        :param bool raw: returns the direct response alongside the
+         deserialized response
+        :param operation_config: :ref:`Operation configuration
+         overrides<msrest:optionsforoperations>`.
+        :rtype: list of object
+        :rtype: :class:`ClientRawResponse<msrest.pipeline.ClientRawResponse>`
+         if raw=true
+        """
+        # Construct URL
+        url = '/devices/query'
+
+        # Construct parameters
+        query_parameters = {}
+        query_parameters['api-version'] = self._serialize.query("self.config.api_version", self.config.api_version, 'str')
+
+        # Construct headers
+        header_parameters = {}
+        header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+        if self.config.generate_client_request_id:
+            header_parameters['x-ms-client-request-id'] = str(uuid.uuid1())
+        if custom_headers:
+            header_parameters.update(custom_headers)
+        if max_item_count is not None:
+            header_parameters['x-ms-max-item-count'] = self._serialize.header("max_item_count", max_item_count, 'int', maximum=1000, minimum=1)
+        if continuation is not None:
+            header_parameters['x-ms-continuation'] = self._serialize.header("continuation", continuation, 'str')
+        if self.config.accept_language is not None:
+            header_parameters['accept-language'] = self._serialize.header("self.config.accept_language", self.config.accept_language, 'str')
+
+        # Construct body
+        body_content = self._serialize.body({'query': query}, '{str}')
+
+        # Construct and send request
+        request = self._client.post(url, query_parameters)
+        response = self._client.send(
+            request, header_parameters, body_content, **operation_config)
+
+        if response.status_code not in [200]:
+            raise models.ErrorDetailsException(self._deserialize, response)
+
+        deserialized = None
+        header_dict = {}
+
+        if response.status_code == 200:
+            deserialized = self._deserialize('[object]', response)
+            header_dict = {
+                'x-ms-continuation': 'str',
+            }
+
+        if raw:
+            client_raw_response = ClientRawResponse(deserialized, response)
+            client_raw_response.add_headers(header_dict)
+            return client_raw_response
+
+        return deserialized
+
     def send_message(
             self, device_id, message, iot_hub_message_id=None, iot_hub_correlation_id=None, iot_hub_user_id=None, custom_headers=None, raw=False, **operation_config):
         """Send a device-to-cloud message.
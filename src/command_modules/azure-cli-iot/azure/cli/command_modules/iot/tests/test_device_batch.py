@@ -0,0 +1,198 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=line-too-long
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import unittest
+
+import mock
+from six.moves import BaseHTTPServer
+
+from azure.cli.core._util import CLIError
+from azure.cli.command_modules.iot.custom import iot_device_create_batch, iot_device_export_local
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib.iot_hub_device_client import IotHubDeviceClient
+from azure.cli.command_modules.iot.sas_token_auth import SasTokenAuthentication
+
+
+class _FakeRegistry(BaseHTTPServer.HTTPServer):
+    """ An IoT Hub device registry in memory. The first bulk request is throttled, and the first time a device named
+    'throttled-*' is in one it fails with a throttling error. A request with a device of an invalid status is rejected
+    as a whole. """
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), _RegistryHandler)
+        self.devices = {}
+        self.bulk_requests = 0
+        self.throttled = set()
+        self.lock = threading.Lock()
+
+
+class _RegistryHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def _reply(self, status, body, headers=None):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _body(self):
+        return json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        path = self.path.split('?')[0]
+        if path == '/devices':
+            self._bulk(self._body())
+        elif path == '/devices/query':
+            self._body()
+            self._query(int(self.headers['x-ms-max-item-count']), int(self.headers.get('x-ms-continuation') or 0))
+        else:
+            self._reply(404, {'Message': 'Not found'})
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        device = self.server.devices.get(self.path.split('?')[0][len('/devices/'):])
+        if device is None:
+            self._reply(404, {'Message': 'DeviceNotFound'})
+        else:
+            self._reply(200, dict(device, deviceId=device['id']))
+
+    def _bulk(self, devices):
+        registry = self.server
+        with registry.lock:
+            registry.bulk_requests += 1
+            if registry.bulk_requests == 1:
+                return self._reply(429, {'Message': 'ThrottlingException'})
+            if any(d.get('status', 'enabled') not in ('enabled', 'disabled') for d in devices):
+                return self._reply(400, {'Message': 'ErrorCode:ArgumentInvalid;Invalid device status.'})
+            errors = []
+            for device in devices:
+                if device['id'].startswith('throttled-') and device['id'] not in registry.throttled:
+                    registry.throttled.add(device['id'])
+                    errors.append({'deviceId': device['id'], 'errorCode': 'ThrottlingException', 'errorStatus': 'Throttled'})
+                elif device['id'] in registry.devices:
+                    errors.append({'deviceId': device['id'], 'errorCode': 'DeviceAlreadyExists', 'errorStatus': 'Exists'})
+                else:
+                    registry.devices[device['id']] = {'id': device['id'], 'status': device.get('status', 'enabled'),
+                                                      'authentication': device.get('authentication')}
+        self._reply(400 if errors else 200, {'isSuccessful': not errors, 'errors': errors})
+
+    def _query(self, page_size, start):
+        ids = sorted(self.server.devices)
+        twins = [{'deviceId': i, 'status': self.server.devices[i]['status']} for i in ids[start:start + page_size]]
+        more = start + page_size < len(ids)
+        self._reply(200, twins, {'x-ms-continuation': str(start + page_size)} if more else None)
+
+
+class TestDeviceBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = _FakeRegistry()
+        server = threading.Thread(target=self.registry.serve_forever)
+        server.daemon = True
+        server.start()
+        self.addCleanup(self.registry.server_close)
+        self.addCleanup(self.registry.shutdown)
+
+        url = 'http://127.0.0.1:{}'.format(self.registry.server_address[1])
+        device_client = IotHubDeviceClient(SasTokenAuthentication(url, 'iothubowner', 'a2V5'), 'sub',
+                                           base_url=url).iot_hub_devices
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patches = [mock.patch('azure.cli.command_modules.iot.custom._get_device_client', return_value=device_client),
+                   mock.patch('azure.cli.command_modules.iot.custom.DEVICE_BATCH_SIZE', 3),
+                   mock.patch('azure.cli.command_modules.iot.custom.DEVICE_QUERY_PAGE_SIZE', 4),
+                   mock.patch('time.sleep')]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_devices_are_created_in_batches_retrying_throttled_ones(self):
+        keys = {'symmetricKey': {'primaryKey': 'cHJpbWFyeQ==', 'secondaryKey': 'c2Vjb25kYXJ5'}}
+        devices = [{'id': 'device-{}'.format(i), 'authentication': keys} for i in range(7)]
+        devices += [{'id': 'throttled-1', 'status': 'disabled'}, {'id': 'device-0'}]
+        input_file = self._write('devices.jsonl', [json.dumps(d) for d in devices] + [''])
+
+        result = iot_device_create_batch(None, 'hub', input_file, resource_group_name='rg')
+        self.assertEqual(8, result['created'])
+        self.assertEqual([{'deviceId': 'device-0', 'errorCode': 'DeviceAlreadyExists', 'errorStatus': 'Exists'}],
+                         result['failed'])
+        self.assertEqual(['throttled-1'], sorted(self.registry.throttled))
+        self.assertEqual('disabled', self.registry.devices['throttled-1']['status'])
+        # 3 batches, the one throttled as a whole and the one with the device throttled retried
+        self.assertEqual(5, self.registry.bulk_requests)
+
+    def test_throttled_devices_are_retried_next_to_failed_ones(self):
+        self.registry.devices['device-0'] = {'id': 'device-0', 'status': 'enabled', 'authentication': None}
+        self.registry.bulk_requests = 1
+        input_file = self._write('devices.jsonl', ['{"id": "device-0"}', '{"id": "throttled-1"}', '{"id": "device-1"}'])
+
+        result = iot_device_create_batch(None, 'hub', input_file, resource_group_name='rg')
+        self.assertEqual(2, result['created'])
+        self.assertEqual(['device-0'], [e['deviceId'] for e in result['failed']])
+        self.assertEqual(['device-0', 'device-1', 'throttled-1'], sorted(self.registry.devices))
+        self.assertEqual(3, self.registry.bulk_requests)
+
+    def test_batches_rejected_as_a_whole_are_failed(self):
+        self.registry.bulk_requests = 1
+        input_file = self._write('devices.jsonl', ['{"id": "device-0"}', '{"id": "device-1", "status": "on"}',
+                                                   '{"id": "device-2"}', '{"id": "device-3"}'])
+
+        result = iot_device_create_batch(None, 'hub', input_file, resource_group_name='rg')
+        self.assertEqual(1, result['created'])
+        self.assertEqual(['device-0', 'device-1', 'device-2'], sorted(e['deviceId'] for e in result['failed']))
+        self.assertIn('ArgumentInvalid', result['failed'][0]['errorStatus'])
+        self.assertEqual(['device-3'], sorted(self.registry.devices))
+
+    def test_exported_devices_can_be_created_again(self):
+        keys = {'symmetricKey': {'primaryKey': 'cHJpbWFyeQ==', 'secondaryKey': 'c2Vjb25kYXJ5'},
+                'x509Thumbprint': {'primaryThumbprint': None, 'secondaryThumbprint': None}}
+        for i in range(6):
+            self.registry.devices['device-{}'.format(i)] = {'id': 'device-{}'.format(i), 'status': 'enabled',
+                                                            'authentication': keys}
+        output_file = os.path.join(self.directory, 'exported.jsonl')
+
+        self.assertEqual({'deviceCount': 6, 'outputFile': output_file},
+                         iot_device_export_local(None, 'hub', output_file, include_keys=True, resource_group_name='rg'))
+        if os.name != 'nt':
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(output_file).st_mode))
+        with open(output_file) as f:
+            exported = [json.loads(line) for line in f]
+        self.assertEqual({'id': 'device-5', 'status': 'enabled', 'authentication': keys}, exported[5])
+
+        iot_device_export_local(None, 'hub', output_file, resource_group_name='rg')
+        with open(output_file) as f:
+            self.assertEqual({'id': 'device-0', 'status': 'enabled'}, json.loads(f.readline()))
+
+        exported_devices, self.registry.devices = self.registry.devices, {}
+        self.registry.bulk_requests = 1
+        result = iot_device_create_batch(None, 'hub', output_file, resource_group_name='rg')
+        self.assertEqual({'created': 6, 'failed': []}, result)
+        self.assertEqual(sorted(exported_devices), sorted(self.registry.devices))
+
+    def test_lines_without_a_device_id_are_rejected(self):
+        input_file = self._write('devices.jsonl', ['{"id": "device-1"}', '{"status": "enabled"}'])
+        with self.assertRaisesRegexp(CLIError, 'Line 2'):
+            iot_device_create_batch(None, 'hub', input_file, resource_group_name='rg')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# pylint: disable=line-too-long
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+import mock
+import yaml
+from msrest import Deserializer
+
+from azure.cli.command_modules.iot.custom import iot_device_show_connection_string
+from azure.cli.command_modules.iot.mgmt_iot_hub_device.lib import models
+
+HUB = 'iot-hub-for-test'
+DEVICES_URI = 'https://{}.azure-devices.net/devices'.format(HUB)
+
+
+def _load_recorded_devices():
+    """ The devices listed and those fetched one by one by the recorded 'iot device' commands. """
+    deserialize = Deserializer(dict((k, v) for k, v in models.__dict__.items() if isinstance(v, type)))
+    path = os.path.join(os.path.dirname(__file__), 'recordings', 'test_iot_hub.yaml')
+    with open(path) as f:
+        interactions = yaml.safe_load(f)['interactions']
+    listed, fetched = None, {}
+    for interaction in interactions:
+        if interaction['request']['method'] != 'GET' or interaction['response']['status']['code'] != 200:
+            continue
+        uri = interaction['request']['uri'].split('?')[0]
+        body = json.loads(interaction['response']['body']['string'])
+        if uri == DEVICES_URI:
+            listed = deserialize('[DeviceDescription]', body)
+        elif uri.startswith(DEVICES_URI + '/') and uri.count('/') == 4:
+            fetched[uri.rsplit('/', 1)[1]] = deserialize('DeviceDescription', body)
+    return listed, fetched
+
+
+class TestDeviceConnectionString(unittest.TestCase):
+
+    def setUp(self):
+        self.listed, self.fetched = _load_recorded_devices()
+        self.device_client = mock.MagicMock()
+        self.device_client.list.return_value = self.listed
+        self.device_client.get.side_effect = lambda device_id: self.fetched[device_id]
+        patcher = mock.patch('azure.cli.command_modules.iot.custom._get_device_client',
+                             return_value=self.device_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_listed_connection_strings_match_those_of_each_device(self):
+        listed = iot_device_show_connection_string(None, HUB, resource_group_name='rg')
+        self.assertFalse(self.device_client.get.called)
+        self.assertEqual(['test-device-1', 'test-device-2'], sorted(d['deviceId'] for d in listed))
+        for device in listed:
+            shown = iot_device_show_connection_string(None, HUB, device['deviceId'], resource_group_name='rg')
+            self.assertEqual(shown['connectionString'], device['connectionString'])
+        self.assertIn({'deviceId': 'test-device-2',
+                       'connectionString': 'HostName=iot-hub-for-test.azure-devices.net;DeviceId=test-device-2;x509=true'},
+                      listed)
+        self.assertIn({'deviceId': 'test-device-1',
+                       'connectionString': 'HostName=iot-hub-for-test.azure-devices.net;DeviceId=test-device-1;'
+                                           'SharedAccessKey=tcYQ1dzGzaqdBiIWPdtr/EYhCK3aqcBXGaJOIv451s0='},
+                      listed)
+
+    def test_connection_strings_of_all_devices_are_written_page_by_page(self):
+        pages = [mock.MagicMock(output=[{'deviceId': 'test-device-2', 'authenticationType': 'selfSigned'}],
+                                headers={'x-ms-continuation': 'next'}),
+                 mock.MagicMock(output=[{'deviceId': 'test-device-1', 'authenticationType': 'sas'}],
+                                headers={'x-ms-continuation': None})]
+        self.device_client.query.side_effect = pages
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output_file = os.path.join(directory, 'devices.jsonl')
+
+        result = iot_device_show_connection_string(None, HUB, resource_group_name='rg', output_file=output_file)
+        self.assertEqual({'deviceCount': 2, 'outputFile': output_file}, result)
+        self.assertEqual([None, 'next'], [c[0][2] for c in self.device_client.query.call_args_list])
+        # only the devices authenticated by keys are fetched, for their keys
+        self.device_client.get.assert_called_once_with('test-device-1')
+
+        if os.name != 'nt':
+            self.assertEqual(0o600, stat.S_IMODE(os.stat(output_file).st_mode))
+        with open(output_file) as f:
+            written = [json.loads(line) for line in f]
+        listed = iot_device_show_connection_string(None, HUB, resource_group_name='rg')
+        self.assertEqual(sorted(listed, key=lambda d: d['deviceId']), sorted(written, key=lambda d: d['deviceId']))
+
+
+if __name__ == '__main__':
+    unittest.main()
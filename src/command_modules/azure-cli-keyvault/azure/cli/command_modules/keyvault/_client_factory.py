@@ -7,3 +7,99 @@ def keyvault_client_factory(**_):
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
     from azure.mgmt.keyvault import KeyVaultManagementClient
     return get_mgmt_service_client(KeyVaultManagementClient)
+
+
+# Tokens are refreshed this many seconds before they expire so that requests never race expiry
+TOKEN_REFRESH_MARGIN = 300
+# Lifetime assumed for tokens whose expiry can't be read
+DEFAULT_TOKEN_LIFETIME = 600
+
+
+def _get_token_expiry(token):
+    """ Reads the 'exp' claim of a JWT access token without validating it. """
+    import base64
+    import json
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = base64.urlsafe_b64decode(payload.encode('ascii')).decode('utf-8')
+        return float(json.loads(claims)['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _retrieve_token(resource):
+    import adal
+    from azure.cli.core._profile import Profile
+    from azure.cli.core._util import CLIError
+    try:
+        return Profile().get_login_credentials(resource)[0]._token_retriever() # pylint: disable=protected-access
+    except adal.AdalError as err:
+        #pylint: disable=no-member
+        if (hasattr(err, 'error_response') and
+                ('error_description' in err.error_response)
+                and ('AADSTS70008:' in err.error_response['error_description'])):
+            raise CLIError(
+                "Credentials have expired due to inactivity. Please run 'az login'")
+        raise CLIError(err)
+
+
+def _get_keep_alive_authentication(authorization_callback):
+    """ KeyVaultAuthentication that signs the session msrest keeps open between the requests of a
+    client, where the one of azure-keyvault signs a new session for every request. """
+    from azure.keyvault import KeyVaultAuthentication
+
+    class _KeepAliveAuthentication(KeyVaultAuthentication):  # pylint: disable=too-few-public-methods
+        def signed_session(self, session=None):  # pylint: disable=arguments-differ
+            if session is None:
+                return super(_KeepAliveAuthentication, self).signed_session()
+            session.auth = self.auth
+            return session
+
+    return _KeepAliveAuthentication(authorization_callback)
+
+
+class KeyVaultClientCache(object):
+    """ Process-wide cache of authenticated Key Vault data plane clients and of the bearer tokens
+    they use. Tokens are keyed by authorization server and resource audience, clients by client
+    type and vault URL. Safe to use from multiple threads.
+    """
+
+    def __init__(self, token_retriever=_retrieve_token):
+        import threading
+        self._token_retriever = token_retriever
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._clients = {}
+
+    def get_token(self, server, resource, scope): # pylint: disable=unused-argument
+        """ Authorization callback for KeyVaultAuthentication. """
+        import time
+        key = (server, resource)
+        with self._lock:
+            scheme, token, expires_on = self._tokens.get(key, (None, None, 0))
+            if expires_on - TOKEN_REFRESH_MARGIN <= time.time():
+                scheme, token = self._token_retriever(resource)
+                expires_on = _get_token_expiry(token) or time.time() + DEFAULT_TOKEN_LIFETIME
+                self._tokens[key] = (scheme, token, expires_on)
+        return scheme, token
+
+    def get_client(self, client_type, vault_base_url=None):
+        key = (client_type, (vault_base_url or '').lower().rstrip('/'))
+        with self._lock:
+            try:
+                return self._clients[key]
+            except KeyError:
+                client = client_type(_get_keep_alive_authentication(self.get_token))
+                # keep the connection to the vault open between requests; the convenience client
+                # wraps the generated one
+                getattr(client, 'keyvault', client).config.keep_alive = True
+                self._clients[key] = client
+                return client
+
+
+_KEYVAULT_CLIENT_CACHE = KeyVaultClientCache()
+
+
+def keyvault_data_plane_factory(client_type, vault_base_url=None):
+    return _KEYVAULT_CLIENT_CACHE.get_client(client_type, vault_base_url)
@@ -6,15 +6,13 @@
 import base64
 from six import string_types
 
-import adal
-
 from azure.cli.core.commands import (command_table,
                                      command_module_map,
                                      CliCommand,
                                      LongRunningOperation,
                                      get_op_handler)
 from azure.cli.core.commands._introspection import \
-    (extract_full_summary_from_signature, extract_args_from_signature)
+    (extract_full_summary_from_operation, extract_args_from_operation)
 
 from azure.cli.core._util import CLIError
 
@@ -45,35 +43,20 @@ def _create_key_vault_command(module_name, name, operation, transform_result, ta
         from msrest.paging import Paged
         from msrest.exceptions import ValidationError, ClientRequestError
         from msrestazure.azure_operation import AzureOperationPoller
-        from azure.cli.core._profile import Profile
-        from azure.keyvault import \
-            (KeyVaultClient, KeyVaultAuthentication)
+        from azure.keyvault import KeyVaultClient
         from azure.keyvault.generated import \
             (KeyVaultClient as BaseKeyVaultClient)
         from azure.keyvault.generated.models import \
             (KeyVaultErrorException)
+        from azure.cli.command_modules.keyvault._client_factory import \
+            keyvault_data_plane_factory
 
         try:
-
-            def get_token(server, resource, scope): # pylint: disable=unused-argument
-                try:
-                    return Profile().get_login_credentials(resource)[0]._token_retriever() # pylint: disable=protected-access
-                except adal.AdalError as err:
-                    #pylint: disable=no-member
-                    if (hasattr(err, 'error_response') and
-                            ('error_description' in err.error_response)
-                            and ('AADSTS70008:' in err.error_response['error_description'])):
-                        raise CLIError(
-                            "Credentials have expired due to inactivity. Please run 'az login'")
-                    raise CLIError(err)
-
             op = get_op_handler(operation)
             # since the convenience client can be inconvenient, we have to check and create the
-            # correct client version
-            if 'generated' in op.__module__:
-                client = BaseKeyVaultClient(KeyVaultAuthentication(get_token))
-            else:
-                client = KeyVaultClient(KeyVaultAuthentication(get_token)) # pylint: disable=redefined-variable-type
+            # correct client version. Clients are reused across the commands of this process.
+            client_type = BaseKeyVaultClient if 'generated' in op.__module__ else KeyVaultClient
+            client = keyvault_data_plane_factory(client_type, kwargs.get('vault_base_url'))
             result = op(client, **kwargs)
 
             # apply results transform if specified
@@ -106,8 +89,8 @@ def _create_key_vault_command(module_name, name, operation, transform_result, ta
 
     command_module_map[name] = module_name
     name = ' '.join(name.split())
-    arguments_loader = lambda: extract_args_from_signature(get_op_handler(operation))
-    description_loader = lambda: extract_full_summary_from_signature(get_op_handler(operation))
+    arguments_loader = lambda: extract_args_from_operation(operation)
+    description_loader = lambda: extract_full_summary_from_operation(operation)
     cmd = CliCommand(name, _execute_command, table_transformer=table_transformer,
                      arguments_loader=arguments_loader, description_loader=description_loader)
     return cmd
@@ -39,6 +39,26 @@ helps['keyvault update'] = """
     short-summary: Update the properties of a key vault.
 """
 
+helps['keyvault backup-all'] = """
+    type: command
+    short-summary: Back up all keys, secrets and certificates of a key vault to a local directory.
+    long-summary: >
+        Objects are backed up concurrently and recorded in a manifest in the directory. Run the command again with the same directory to resume an interrupted backup.
+        The backup contains secret values and certificate private keys unencrypted. Its files can only be read by the current user; keep the directory as safe as the vault itself.
+    examples:
+        - name: Back up a key vault.
+          text: az keyvault backup-all --vault-name MyKeyVault --directory ./MyKeyVault-backup
+"""
+
+helps['keyvault restore-all'] = """
+    type: command
+    short-summary: Restore the keys, secrets and certificates backed up by 'az keyvault backup-all'.
+    long-summary: Run the command again with the same directory to resume an interrupted restore.
+    examples:
+        - name: Restore a backup into another key vault.
+          text: az keyvault restore-all --vault-name MyOtherKeyVault --directory ./MyKeyVault-backup
+"""
+
 helps['keyvault key'] = """
     type: group
     short-summary: Manage keys.
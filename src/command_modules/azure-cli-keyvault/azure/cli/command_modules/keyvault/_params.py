@@ -4,7 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=line-too-long
-from argcomplete.completers import FilesCompleter
+from argcomplete.completers import FilesCompleter, DirectoriesCompleter
 
 from azure.mgmt.keyvault.models.key_vault_management_client_enums import \
     (SkuName, KeyPermissions, SecretPermissions, CertificatePermissions)
@@ -112,6 +112,10 @@ register_cli_argument('keyvault set-policy', 'certificate_permissions', metavar=
 for item in ['key', 'secret', 'certificate']:
     register_cli_argument('keyvault {}'.format(item), '{}_name'.format(item), options_list=('--name', '-n'), help='Name of the {}.'.format(item), id_part='child_name', completer=get_keyvault_name_completion_list(item))
     register_cli_argument('keyvault {}'.format(item), 'vault_base_url', vault_name_type, type=vault_base_url_type, id_part=None)
+for item in ['backup-all', 'restore-all']:
+    register_cli_argument('keyvault {}'.format(item), 'vault_base_url', vault_name_type, type=vault_base_url_type, id_part=None)
+    register_cli_argument('keyvault {}'.format(item), 'directory', options_list=('--directory', '-d'), type=file_type, completer=DirectoriesCompleter())
+    register_cli_argument('keyvault {}'.format(item), 'max_connections', type=int)
 # TODO: Fix once service side issue is fixed that there is no way to list pending certificates
 register_cli_argument('keyvault certificate pending', 'certificate_name', options_list=('--name', '-n'), help='Name of the pending certificate.', id_part='child_name', completer=None)
 
@@ -43,6 +43,9 @@ cli_generic_update_command(__name__,
 
 # Data Plane Commands
 
+cli_keyvault_data_plane_command('keyvault backup-all', custom_path.format('backup_vault'))
+cli_keyvault_data_plane_command('keyvault restore-all', custom_path.format('restore_vault'))
+
 cli_keyvault_data_plane_command('keyvault key list', convenience_path.format('KeyVaultClient.get_keys'))
 cli_keyvault_data_plane_command('keyvault key list-versions', convenience_path.format('KeyVaultClient.get_key_versions'))
 cli_keyvault_data_plane_command('keyvault key create', custom_path.format('create_key'))
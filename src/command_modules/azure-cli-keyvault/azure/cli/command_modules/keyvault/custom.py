@@ -23,7 +23,7 @@ from azure.mgmt.keyvault.models import (VaultCreateOrUpdateParameters,
 from azure.graphrbac import GraphRbacManagementClient
 
 import azure.cli.core.telemetry as telemetry
-from azure.cli.core._util import CLIError
+from azure.cli.core._util import CLIError, open_private_file
 import azure.cli.core.azlogging as azlogging
 
 from azure.keyvault import KeyVaultClient
@@ -568,3 +568,213 @@ def certificate_policy_template():
     del template.attributes.created
     del template.attributes.updated
     return template
+
+# Bulk backup and restore
+
+BACKUP_MANIFEST_NAME = 'manifest.json'
+BACKUP_MAX_CONNECTIONS = 8
+BACKUP_MAX_RETRIES = 5
+# Number of completed objects between manifest saves
+BACKUP_MANIFEST_SAVE_INTERVAL = 50
+_BACKUP_KINDS = ('key', 'secret', 'certificate')
+
+def _retry_on_throttling(func, *args, **kwargs):
+    """ Calls func, backing off while the vault throttles (429) or is unavailable (503). """
+    from msrest.exceptions import HttpOperationError
+    delay = 1
+    for attempt in range(BACKUP_MAX_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except HttpOperationError as ex:
+            response = ex.response
+            if attempt == BACKUP_MAX_RETRIES - 1 or \
+                    getattr(response, 'status_code', None) not in (429, 503):
+                raise
+            try:
+                wait = float(response.headers['Retry-After'])
+            except (KeyError, TypeError, ValueError):
+                wait = delay
+            time.sleep(wait)
+            delay *= 2
+
+def _model_serializers():
+    from msrest.serialization import Serializer, Deserializer
+    from azure.keyvault.generated import models
+    client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+    return Serializer(client_models), Deserializer(client_models)
+
+class _BackupManifest(object):
+    """ Records the state of every object of a bulk backup so that backup-all and restore-all can
+    resume where a previous run stopped. """
+
+    def __init__(self, directory, vault_base_url=None):
+        import json
+        import threading
+        self.path = os.path.join(directory, BACKUP_MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        try:
+            with open(self.path, 'r') as f:
+                self.data = json.load(f)
+        except IOError:
+            self.data = {'vault': vault_base_url, 'objects': {}}
+
+    @staticmethod
+    def _key(kind, name):
+        return '{}s/{}'.format(kind, name)
+
+    def get(self, kind, name):
+        return self.data['objects'].get(self._key(kind, name), {})
+
+    def entries(self):
+        return list(self.data['objects'].values())
+
+    def update(self, kind, name, **values):
+        with self._lock:
+            entry = self.data['objects'].setdefault(self._key(kind, name),
+                                                    {'kind': kind, 'name': name})
+            entry.update(values)
+            self._unsaved += 1
+            if self._unsaved >= BACKUP_MANIFEST_SAVE_INTERVAL:
+                self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        import json
+        temp_path = self.path + '.tmp'
+        with open_private_file(temp_path) as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        getattr(os, 'replace', os.rename)(temp_path, self.path)
+        self._unsaved = 0
+
+def _run_bulk_operation(manifest, objects, operation, state, max_connections):
+    """ Runs operation(kind, name) for each object on a bounded thread pool and records the
+    outcome in the manifest under `state`. """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    failed = []
+    tasks = {}
+    executor = ThreadPoolExecutor(max_workers=max_connections)
+    try:
+        tasks = {executor.submit(operation, kind, name): (kind, name) for kind, name in objects}
+        for task in as_completed(tasks):
+            kind, name = tasks[task]
+            try:
+                values = task.result() or {}
+                values.update({state: True, 'error': None})
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Failed to process %s '%s': %s", kind, name, ex)
+                values = {state: False, 'error': str(ex)}
+                failed.append({'kind': kind, 'name': name, 'error': str(ex)})
+            manifest.update(kind, name, **values)
+    except KeyboardInterrupt:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        manifest.save()
+    return failed
+
+def _list_backup_objects(client, vault_base_url):
+    def _items(paged):
+        try:
+            return list(paged)
+        except TypeError:
+            # empty collections fail to page, see _command_type
+            return []
+
+    def _name(object_id):
+        return object_id.rstrip('/').rsplit('/', 1)[1]
+
+    # keys and secrets which back a certificate are restored with their certificate
+    objects = [('key', _name(k.kid)) for k in _items(client.get_keys(vault_base_url))
+               if not k.managed]
+    objects.extend(('secret', _name(s.id)) for s in _items(client.get_secrets(vault_base_url))
+                   if not s.managed)
+    objects.extend(('certificate', _name(c.id))
+                   for c in _items(client.get_certificates(vault_base_url)))
+    return objects
+
+def backup_vault(client, vault_base_url, directory, max_connections=BACKUP_MAX_CONNECTIONS):
+    """ Back up every key, secret and certificate of a vault to a local directory. Keys are saved
+    as key vault backup blobs. Secrets and certificates are saved with their values, attributes
+    and tags. Run again with the same directory to resume an interrupted backup.
+    :param str directory: Directory to write the manifest and object backups to.
+    :param int max_connections: Maximum number of concurrent requests to the vault.
+    """
+    import json
+    serializer, _ = _model_serializers()
+    # the backup holds secret values and private keys unencrypted, so only the user may read it
+    for kind_dir in [directory] + [os.path.join(directory, kind + 's') for kind in _BACKUP_KINDS]:
+        if not os.path.isdir(kind_dir):
+            os.makedirs(kind_dir, 0o700)
+
+    def _write(kind, name, content, mode='w'):
+        file_name = os.path.join(kind + 's', name + ('.blob' if 'b' in mode else '.json'))
+        with open_private_file(os.path.join(directory, file_name), mode) as f:
+            f.write(content)
+        return {'file': file_name}
+
+    def _backup(kind, name):
+        if kind == 'key':
+            blob = _retry_on_throttling(client.backup_key, vault_base_url, name).value
+            return _write(kind, name, blob, 'wb')
+        secret = _retry_on_throttling(client.keyvault.get_secret, vault_base_url, name, '')
+        backup = {'value': secret.value, 'contentType': secret.content_type, 'tags': secret.tags}
+        if kind == 'secret':
+            backup['attributes'] = serializer.body(secret.attributes, 'SecretAttributes')
+        else:
+            cert = _retry_on_throttling(client.keyvault.get_certificate, vault_base_url, name, '')
+            backup['tags'] = cert.tags
+            backup['attributes'] = serializer.body(cert.attributes, 'CertificateAttributes')
+            backup['policy'] = serializer.body(cert.policy, 'CertificatePolicy')
+        return _write(kind, name, json.dumps(backup))
+
+    manifest = _BackupManifest(directory, vault_base_url)
+    objects = _list_backup_objects(client, vault_base_url)
+    pending = [o for o in objects if not manifest.get(*o).get('backedUp')]
+    failed = _run_bulk_operation(manifest, pending, _backup, 'backedUp', max_connections)
+    return {'total': len(objects), 'skipped': len(objects) - len(pending),
+            'succeeded': len(pending) - len(failed), 'failed': failed}
+
+def restore_vault(client, vault_base_url, directory, max_connections=BACKUP_MAX_CONNECTIONS):
+    """ Restore the keys, secrets and certificates saved by 'keyvault backup-all' into a vault.
+    Run again with the same directory to resume an interrupted restore.
+    :param str directory: Directory containing the manifest and object backups.
+    :param int max_connections: Maximum number of concurrent requests to the vault.
+    """
+    import json
+    _, deserializer = _model_serializers()
+    manifest = _BackupManifest(directory)
+    if not os.path.isfile(manifest.path):
+        raise CLIError("No backup manifest found in '{}'.".format(directory))
+
+    def _restore(kind, name):
+        path = os.path.join(directory, manifest.get(kind, name)['file'])
+        if kind == 'key':
+            with open(path, 'rb') as f:
+                _retry_on_throttling(client.restore_key, vault_base_url, f.read())
+            return
+        with open(path, 'r') as f:
+            backup = json.load(f)
+        if kind == 'secret':
+            _retry_on_throttling(
+                client.set_secret, vault_base_url, name, backup['value'], tags=backup['tags'],
+                content_type=backup['contentType'],
+                secret_attributes=deserializer('SecretAttributes', backup['attributes']))
+        else:
+            _retry_on_throttling(
+                client.import_certificate, vault_base_url, name, backup['value'],
+                certificate_policy=deserializer('CertificatePolicy', backup['policy']),
+                certificate_attributes=deserializer('CertificateAttributes', backup['attributes']),
+                tags=backup['tags'])
+
+    entries = manifest.entries()
+    pending = [(e['kind'], e['name']) for e in entries
+               if e.get('backedUp') and not e.get('restored')]
+    failed = _run_bulk_operation(manifest, pending, _restore, 'restored', max_connections)
+    return {'total': len(entries), 'skipped': len(entries) - len(pending),
+            'succeeded': len(pending) - len(failed), 'failed': failed}
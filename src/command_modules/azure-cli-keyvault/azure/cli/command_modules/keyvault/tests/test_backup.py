@@ -0,0 +1,134 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+import mock
+from msrest.exceptions import HttpOperationError
+
+from azure.cli.command_modules.keyvault.custom import (backup_vault, restore_vault,
+                                                       _retry_on_throttling, BACKUP_MANIFEST_NAME)
+
+VAULT = 'https://myvault.vault.azure.net'
+
+
+def _item(kind, name, managed=None):
+    item = mock.MagicMock(managed=managed)
+    item.kid = item.id = '{}/{}s/{}'.format(VAULT, kind, name)
+    return item
+
+
+def _http_error(status_code, retry_after=None):
+    response = mock.MagicMock(status_code=status_code,
+                              headers={'Retry-After': retry_after} if retry_after else {})
+    error = HttpOperationError.__new__(HttpOperationError)
+    error.response = response
+    return error
+
+
+def _vault_client():
+    client = mock.MagicMock()
+    client.get_keys.return_value = [_item('key', 'key1'), _item('key', 'cert1', managed=True)]
+    client.get_secrets.return_value = [_item('secret', 'secret1'),
+                                       _item('secret', 'cert1', managed=True)]
+    client.get_certificates.return_value = [_item('certificate', 'cert1')]
+    client.backup_key.return_value.value = b'key-backup'
+    client.keyvault.get_secret.return_value = mock.MagicMock(value='secret-value',
+                                                             content_type='text/plain',
+                                                             tags={'a': 'b'})
+    client.keyvault.get_certificate.return_value.tags = None
+    return client
+
+
+class TestKeyVaultBulkBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _manifest(self):
+        with open(os.path.join(self.directory, BACKUP_MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    @mock.patch('azure.cli.command_modules.keyvault.custom._model_serializers')
+    def test_backup_vault_writes_objects_and_manifest(self, serializers):
+        serializers.return_value = (mock.MagicMock(), mock.MagicMock())
+        serializers.return_value[0].body.return_value = {'enabled': True}
+        client = _vault_client()
+
+        result = backup_vault(client, VAULT, self.directory)
+
+        self.assertEqual({'total': 3, 'skipped': 0, 'succeeded': 3, 'failed': []}, result)
+        with open(os.path.join(self.directory, 'keys', 'key1.blob'), 'rb') as f:
+            self.assertEqual(b'key-backup', f.read())
+        with open(os.path.join(self.directory, 'secrets', 'secret1.json')) as f:
+            self.assertEqual('secret-value', json.load(f)['value'])
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, 'certificates', 'cert1.json')))
+        manifest = self._manifest()
+        self.assertEqual(VAULT, manifest['vault'])
+        self.assertEqual(['certificates/cert1', 'keys/key1', 'secrets/secret1'],
+                         sorted(manifest['objects']))
+        self.assertTrue(all(o['backedUp'] for o in manifest['objects'].values()))
+        if os.name != 'nt':
+            # the backup holds secrets unencrypted
+            for path, mode in (('keys', 0o700), ('keys/key1.blob', 0o600),
+                               ('secrets/secret1.json', 0o600), (BACKUP_MANIFEST_NAME, 0o600)):
+                self.assertEqual(mode, stat.S_IMODE(os.stat(os.path.join(self.directory,
+                                                                         path)).st_mode))
+
+    @mock.patch('azure.cli.command_modules.keyvault.custom._model_serializers')
+    def test_backup_vault_resumes_after_failures(self, serializers):
+        serializers.return_value = (mock.MagicMock(), mock.MagicMock())
+        serializers.return_value[0].body.return_value = {}
+        client = _vault_client()
+        client.backup_key.side_effect = ValueError('boom')
+
+        result = backup_vault(client, VAULT, self.directory)
+        self.assertEqual([{'kind': 'key', 'name': 'key1', 'error': 'boom'}], result['failed'])
+
+        client.backup_key.side_effect = None
+        client.keyvault.get_secret.reset_mock()
+        result = backup_vault(client, VAULT, self.directory)
+        self.assertEqual({'total': 3, 'skipped': 2, 'succeeded': 1, 'failed': []}, result)
+        self.assertFalse(client.keyvault.get_secret.called)
+
+    @mock.patch('azure.cli.command_modules.keyvault.custom._model_serializers')
+    def test_restore_vault_restores_backed_up_objects_once(self, serializers):
+        serializers.return_value = (mock.MagicMock(), mock.MagicMock())
+        serializers.return_value[0].body.return_value = {}
+        backup_vault(_vault_client(), VAULT, self.directory)
+
+        client = mock.MagicMock()
+        result = restore_vault(client, VAULT, self.directory)
+
+        self.assertEqual({'total': 3, 'skipped': 0, 'succeeded': 3, 'failed': []}, result)
+        client.restore_key.assert_called_once_with(VAULT, b'key-backup')
+        self.assertEqual('secret1', client.set_secret.call_args[0][1])
+        self.assertEqual('cert1', client.import_certificate.call_args[0][1])
+
+        result = restore_vault(client, VAULT, self.directory)
+        self.assertEqual(3, result['skipped'])
+        self.assertEqual(1, client.restore_key.call_count)
+
+    @mock.patch('time.sleep')
+    def test_retry_on_throttling(self, sleep):
+        func = mock.MagicMock(side_effect=[_http_error(429, '7'), _http_error(503), 'done'])
+        self.assertEqual('done', _retry_on_throttling(func, 'arg'))
+        self.assertEqual([mock.call(7.0), mock.call(2)], sleep.call_args_list)
+
+        func = mock.MagicMock(side_effect=_http_error(404))
+        with self.assertRaises(HttpOperationError):
+            _retry_on_throttling(func)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import json
+import time
+import unittest
+
+import mock
+import requests
+from msrest import Configuration
+from msrest.authentication import Authentication
+from msrest.service_client import ServiceClient
+
+from azure.cli.command_modules.keyvault._client_factory import KeyVaultClientCache
+
+SERVER = 'https://login.windows.net/tenant'
+RESOURCE = 'https://vault.azure.net'
+
+
+def _jwt(expires_on):
+    claims = base64.urlsafe_b64encode(json.dumps({'exp': expires_on}).encode('utf-8'))
+    return 'header.{}.signature'.format(claims.decode('ascii').rstrip('='))
+
+
+class _KeyVaultAuthentication(Authentication):
+    """ As in azure-keyvault, signs a new session for every request """
+
+    def __init__(self, authorization_callback):
+        super(_KeyVaultAuthentication, self).__init__()
+        self.auth = mock.MagicMock(side_effect=lambda request: request)
+        self.authorization_callback = authorization_callback
+
+    def signed_session(self):  # pylint: disable=arguments-differ
+        session = requests.Session()
+        session.auth = self.auth
+        return session
+
+
+class _KeyVaultClient(object):  # pylint: disable=too-few-public-methods
+    """ As the convenience client of azure-keyvault, wraps the generated one """
+
+    def __init__(self, credentials):
+        self.keyvault = ServiceClient(credentials, Configuration('https://myvault.vault.azure.net'))
+
+
+class TestKeyVaultClientCache(unittest.TestCase):
+
+    def setUp(self):
+        keyvault = mock.MagicMock(KeyVaultAuthentication=_KeyVaultAuthentication)
+        patcher = mock.patch.dict('sys.modules', {'azure.keyvault': keyvault})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_is_acquired_once_per_audience(self):
+        retriever = mock.MagicMock(return_value=('Bearer', _jwt(time.time() + 3600)))
+        cache = KeyVaultClientCache(retriever)
+
+        for _ in range(100):
+            self.assertEqual('Bearer', cache.get_token(SERVER, RESOURCE, '')[0])
+        self.assertEqual(1, retriever.call_count)
+
+        cache.get_token(SERVER, 'https://other.azure.net', '')
+        self.assertEqual(2, retriever.call_count)
+
+    def test_token_is_refreshed_before_expiry(self):
+        retriever = mock.MagicMock(return_value=('Bearer', _jwt(time.time() + 60)))
+        cache = KeyVaultClientCache(retriever)
+
+        cache.get_token(SERVER, RESOURCE, '')
+        cache.get_token(SERVER, RESOURCE, '')
+        self.assertEqual(2, retriever.call_count)
+
+    def test_token_without_expiry_is_cached_briefly(self):
+        retriever = mock.MagicMock(return_value=('Bearer', 'opaque-token'))
+        cache = KeyVaultClientCache(retriever)
+
+        cache.get_token(SERVER, RESOURCE, '')
+        cache.get_token(SERVER, RESOURCE, '')
+        self.assertEqual(1, retriever.call_count)
+
+    def test_clients_are_reused_per_vault(self):
+        client_type = mock.MagicMock(side_effect=lambda _: mock.MagicMock())
+        cache = KeyVaultClientCache(mock.MagicMock())
+
+        client = cache.get_client(client_type, 'https://myvault.vault.azure.net/')
+        self.assertIs(client, cache.get_client(client_type, 'https://MyVault.vault.azure.net'))
+        self.assertIsNot(client, cache.get_client(client_type, 'https://other.vault.azure.net'))
+
+        self.assertEqual(2, client_type.call_count)
+        (credentials,), _ = client_type.call_args
+        self.assertEqual(cache.get_token, credentials.authorization_callback)
+
+    def test_cached_client_sends_every_request_over_one_session(self):
+        response = requests.Response()
+        response.status_code = 200
+        cache = KeyVaultClientCache(mock.MagicMock())
+        with mock.patch('requests.Session.send', autospec=True, return_value=response) as send:
+            for _ in range(3):
+                client = cache.get_client(_KeyVaultClient, 'https://myvault.vault.azure.net')
+                client.keyvault.send(client.keyvault.get('/secrets/mysecret'))
+
+        self.assertTrue(client.keyvault.config.keep_alive)
+        sessions = [args[0] for args, _ in send.call_args_list]
+        self.assertEqual(3, len(sessions))
+        self.assertTrue(all(s is sessions[0] for s in sessions))
+        self.assertEqual(3, client.keyvault.creds.auth.call_count)
+
+if __name__ == '__main__':
+    unittest.main()
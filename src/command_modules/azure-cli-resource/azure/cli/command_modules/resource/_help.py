@@ -230,6 +230,15 @@ helps['group deployment wait'] = """
     type: command
     short-summary: Place the CLI in a waiting state until a condition of the deployment is met.
 """
+helps['group deployment watch'] = """
+    type: command
+    short-summary: Stream the progress of each resource in a deployment until it finishes.
+    long-summary: Only operations that are new or have changed since the previous poll are fetched and reported.
+    examples:
+        - name: Follow a deployment started with --no-wait.
+          text: >
+            az group deployment watch -g MyResourceGroup -n MyDeployment
+"""
 helps['group deployment operation'] = """
     type: group
     short-summary: Manage deployment operations.
@@ -84,6 +84,7 @@ cli_command(__name__, 'group deployment show', 'azure.mgmt.resource.resources.op
 cli_command(__name__, 'group deployment delete', 'azure.mgmt.resource.resources.operations.deployments_operations#DeploymentsOperations.delete', cf_deployments)
 cli_command(__name__, 'group deployment validate', 'azure.cli.command_modules.resource.custom#validate_arm_template')
 cli_command(__name__, 'group deployment export', 'azure.cli.command_modules.resource.custom#export_deployment_as_template')
+cli_command(__name__, 'group deployment watch', 'azure.cli.command_modules.resource.custom#watch_deployment')
 
 # Resource group deployment operations commands
 cli_command(__name__, 'group deployment operation list', 'azure.mgmt.resource.resources.operations.deployment_operations_operations#DeploymentOperationsOperations.list', cf_deployment_operations)
@@ -8,7 +8,9 @@
 from __future__ import print_function
 import json
 import os
+import time
 import uuid
+from collections import OrderedDict
 
 from azure.mgmt.resource.resources import ResourceManagementClient
 from azure.mgmt.resource.resources.models.resource_group import ResourceGroup
@@ -21,6 +23,7 @@ from azure.mgmt.resource.links.models import ResourceLinkProperties
 from azure.cli.core.parser import IncorrectUsageError
 from azure.cli.core._util import CLIError, get_file_json
 import azure.cli.core.azlogging as azlogging
+from azure.cli.core.commands import LongRunningOperation
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.commands.arm import is_valid_resource_id, parse_resource_id
 
@@ -31,6 +34,12 @@ from ._client_factory import (_resource_client_factory,
 
 logger = azlogging.get_az_logger(__name__)
 
+_DEPLOYMENT_POLL_INTERVAL = 5
+_DEPLOYMENT_TERMINAL_STATES = ('Succeeded', 'Failed', 'Canceled')
+_MAX_DEPLOYMENT_OPERATION_WORKERS = 20
+# when deployment progress is next polled is decided by this clock
+_deployment_clock = time.time
+
 def list_resource_groups(tag=None): # pylint: disable=no-self-use
     ''' List resource groups, optionally filtered by a tag.
     :param str tag:tag to filter by in 'key[=value]' format
@@ -129,9 +138,31 @@ def _deploy_arm_template_core(resource_group_name, template_file=None, template_
     if validate_only:
         return smc.deployments.validate(resource_group_name, deployment_name,
                                         properties, raw=no_wait)
-    else:
-        return smc.deployments.create_or_update(resource_group_name, deployment_name,
-                                                properties, raw=no_wait)
+
+    poller = smc.deployments.create_or_update(resource_group_name, deployment_name,
+                                              properties, raw=no_wait)
+    if no_wait:
+        return poller
+
+    # report per-resource progress while the deployment runs
+    monitor = _DeploymentMonitor(smc.deployment_operations, resource_group_name,
+                                 deployment_name, report=logger.info)
+    return _DeploymentProgressOperation(monitor, 'Starting group deployment create')(poller)
+
+def watch_deployment(resource_group_name, deployment_name, interval=_DEPLOYMENT_POLL_INTERVAL):
+    '''Stream the progress of a running deployment until it finishes.
+    :param int interval:seconds to wait between polls.
+    '''
+    smc = get_mgmt_service_client(ResourceManagementClient)
+    monitor = _DeploymentMonitor(smc.deployment_operations, resource_group_name,
+                                 deployment_name, report=logger.warning)
+    while True:
+        deployment = smc.deployments.get(resource_group_name, deployment_name)
+        monitor.poll()
+        if deployment.properties.provisioning_state in _DEPLOYMENT_TERMINAL_STATES:
+            break
+        time.sleep(interval)
+    return monitor.summary()
 
 
 def export_deployment_as_template(resource_group_name, deployment_name):
@@ -168,11 +199,113 @@ def tag_resource(tags, resource_group_name=None, resource_provider_namespace=Non
 def get_deployment_operations(client, resource_group_name, deployment_name, operation_ids):
     """get a deployment's operation.
     """
-    result = []
-    for op_id in operation_ids:
-        dep = client.get(resource_group_name, deployment_name, op_id)
-        result.append(dep)
-    return result
+    def _get_operation(op_id):
+        return client.get(resource_group_name, deployment_name, op_id)
+
+    if len(operation_ids) < 2:
+        return [_get_operation(op_id) for op_id in operation_ids]
+
+    from concurrent.futures import ThreadPoolExecutor
+    workers = min(len(operation_ids), _MAX_DEPLOYMENT_OPERATION_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map keeps the requested order and re-raises the first failure
+        return list(executor.map(_get_operation, operation_ids))
+
+class _DeploymentMonitor(object):
+    '''Tracks the operations of a deployment across polls so each poll only reports the
+    operations which are new or have changed state since the previous one.
+
+    ARM lists deployment operations most recently updated first, so a poll stops paging as
+    soon as it reaches an operation that is unchanged and no newer than the last poll.
+    '''
+
+    def __init__(self, client, resource_group_name, deployment_name, report=None):
+        self.client = client
+        self.resource_group_name = resource_group_name
+        self.deployment_name = deployment_name
+        self.report = report
+        self.operations = {}
+        self.started = {}
+        self.latest_timestamp = None
+
+    def poll(self):
+        '''Fetch the operations updated since the last poll and report each of them.
+        :return: the new or changed operations, most recently updated first.
+        '''
+        previous_timestamp = self.latest_timestamp
+        changed = []
+        for op in self.client.list(self.resource_group_name, self.deployment_name):
+            props = op.properties
+            known = self.operations.get(op.operation_id)
+            if known is not None and \
+                    known.properties.provisioning_state == props.provisioning_state and \
+                    known.properties.timestamp == props.timestamp:
+                if previous_timestamp is not None and props.timestamp <= previous_timestamp:
+                    break
+                continue
+            self.operations[op.operation_id] = op
+            self.started.setdefault(op.operation_id, props.timestamp)
+            if self.latest_timestamp is None or props.timestamp > self.latest_timestamp:
+                self.latest_timestamp = props.timestamp
+            changed.append(op)
+
+        if self.report:
+            # report in the order the changes happened
+            for op in reversed(changed):
+                self.report(_format_deployment_operation(self._describe(op)))
+        return changed
+
+    def summary(self):
+        '''Describe every operation seen so far, in the order they started.'''
+        ordered = sorted(self.operations.values(),
+                         key=lambda op: self.started[op.operation_id])
+        return [self._describe(op) for op in ordered]
+
+    def _describe(self, op):
+        props = op.properties
+        target = props.target_resource
+        duration = None
+        if props.provisioning_state in _DEPLOYMENT_TERMINAL_STATES:
+            duration = (props.timestamp - self.started[op.operation_id]).total_seconds()
+        return OrderedDict([
+            ('operationId', op.operation_id),
+            ('resourceType', target.resource_type if target else None),
+            ('resourceName', target.resource_name if target else None),
+            ('provisioningState', props.provisioning_state),
+            ('statusCode', props.status_code),
+            ('timestamp', props.timestamp.isoformat() if props.timestamp else None),
+            ('durationInSeconds', duration)
+        ])
+
+class _DeploymentProgressOperation(LongRunningOperation):
+    '''Waits for a deployment like any long running operation, polling its monitor for
+    progress every _DEPLOYMENT_POLL_INTERVAL seconds while it runs.
+    '''
+
+    def __init__(self, monitor, start_msg='', finish_msg='', poller_done_interval_ms=1000.0):
+        super(_DeploymentProgressOperation, self).__init__(start_msg, finish_msg,
+                                                           poller_done_interval_ms)
+        self.monitor = monitor
+        self.next_poll = _deployment_clock() + _DEPLOYMENT_POLL_INTERVAL
+
+    def _delay(self):
+        super(_DeploymentProgressOperation, self)._delay()
+        if _deployment_clock() < self.next_poll:
+            return
+        self.next_poll = _deployment_clock() + _DEPLOYMENT_POLL_INTERVAL
+        try:
+            self.monitor.poll()
+        except Exception as ex:  # pylint: disable=broad-except
+            # progress is informational only, never fail the deployment over it
+            logger.debug('Unable to fetch deployment operations: %s', ex)
+
+def _format_deployment_operation(description):
+    resource = '{}/{}'.format(description['resourceType'], description['resourceName']) \
+        if description['resourceType'] else description['operationId']
+    message = '{}: {}'.format(description['provisioningState'], resource)
+    if description['durationInSeconds'] is not None:
+        message += ' ({:.0f}s)'.format(description['durationInSeconds'])
+    return message
 
 def list_resources(resource_group_name=None, resource_provider_namespace=None,
                    resource_type=None, name=None, tag=None, location=None):
@@ -247,7 +380,9 @@ def _update_provider(namespace, registering):
     if registering:
         rcf.providers.register(namespace)
     else:
+        from azure.cli.core.commands.providers import forget_provider_registration
         rcf.providers.unregister(namespace)
+        forget_provider_registration(namespace, rcf.providers)
 
     #timeout'd, normal for resources with many regions, but let users know.
     action = 'Registering' if registering else 'Unregistering'
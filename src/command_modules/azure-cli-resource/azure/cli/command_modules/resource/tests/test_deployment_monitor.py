@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import unittest
+from datetime import datetime, timedelta
+
+import mock
+from msrest.exceptions import ClientException
+
+from azure.cli.core._util import CLIError
+from azure.cli.command_modules.resource.custom import (_DeploymentMonitor,
+                                                       deploy_arm_template,
+                                                       get_deployment_operations)
+
+START = datetime(2017, 2, 22, 10, 0, 0)
+
+
+def _operation(op_id, state, seconds, name=None):
+    op = mock.MagicMock()
+    op.operation_id = op_id
+    op.properties.provisioning_state = state
+    op.properties.timestamp = START + timedelta(seconds=seconds)
+    op.properties.status_code = 'OK'
+    op.properties.target_resource.resource_type = 'Microsoft.Storage/storageAccounts'
+    op.properties.target_resource.resource_name = name or op_id
+    return op
+
+
+class _ListClient(object):  # pylint: disable=too-few-public-methods
+    '''Serves one list of operations per poll and records how many were consumed.'''
+
+    def __init__(self, polls):
+        self.polls = list(polls)
+        self.consumed = []
+
+    def list(self, resource_group_name, deployment_name):  # pylint: disable=unused-argument
+        ops = self.polls.pop(0)
+        self.consumed.append(0)
+        for op in ops:
+            self.consumed[-1] += 1
+            yield op
+
+
+class TestDeploymentMonitor(unittest.TestCase):
+
+    def test_poll_reports_only_new_or_changed_operations(self):
+        first = [_operation('b', 'Running', 5), _operation('a', 'Running', 1)]
+        second = [_operation('b', 'Succeeded', 65), _operation('c', 'Running', 30),
+                  _operation('a', 'Running', 1)]
+        client = _ListClient([first, second])
+        reported = []
+        monitor = _DeploymentMonitor(client, 'rg', 'dep', report=reported.append)
+
+        self.assertEqual(['b', 'a'], [op.operation_id for op in monitor.poll()])
+        self.assertEqual(['b', 'c'], [op.operation_id for op in monitor.poll()])
+        # paging stopped at the first unchanged operation
+        self.assertEqual([2, 3], client.consumed)
+        self.assertEqual('Succeeded: Microsoft.Storage/storageAccounts/b (60s)', reported[-1])
+
+    def test_poll_stops_paging_at_previously_seen_operations(self):
+        ops = [_operation('b', 'Running', 5), _operation('a', 'Running', 1)]
+        client = _ListClient([ops, ops])
+        monitor = _DeploymentMonitor(client, 'rg', 'dep')
+        monitor.poll()
+        self.assertEqual([], monitor.poll())
+        self.assertEqual([2, 1], client.consumed)
+
+    def test_summary_is_ordered_by_start(self):
+        client = _ListClient([[_operation('b', 'Running', 5), _operation('a', 'Succeeded', 1)]])
+        monitor = _DeploymentMonitor(client, 'rg', 'dep')
+        monitor.poll()
+        summary = monitor.summary()
+        self.assertEqual(['a', 'b'], [s['operationId'] for s in summary])
+        self.assertEqual(0, summary[0]['durationInSeconds'])
+        self.assertIsNone(summary[1]['durationInSeconds'])
+
+    def test_get_deployment_operations_keeps_requested_order(self):
+        client = mock.MagicMock()
+        client.get.side_effect = lambda rg, name, op_id: op_id.upper()
+        result = get_deployment_operations(client, 'rg', 'dep', ['x', 'y', 'z'])
+        self.assertEqual(['X', 'Y', 'Z'], result)
+        self.assertEqual(3, client.get.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch('azure.cli.command_modules.resource.custom._deployment_clock')
+    @mock.patch('azure.cli.command_modules.resource.custom.get_mgmt_service_client')
+    def test_failed_deployment_is_reported_as_a_cli_error(self, client_factory, clock, _):
+        smc = client_factory.return_value
+        smc.deployment_operations = _ListClient([[_operation('a', 'Running', 1)]])
+        poller = smc.deployments.create_or_update.return_value
+        poller.done.side_effect = [False, False, True]
+        poller.result.side_effect = ClientException('Deployment failed.')
+        clock.side_effect = [0, 1, 5, 5]
+        template_file = os.path.join(os.path.dirname(__file__), 'simple_deploy.json')
+
+        with self.assertRaisesRegex(CLIError, 'Deployment failed.'):
+            deploy_arm_template('rg', template_file=template_file, deployment_name='dep')
+        # progress was polled once the interval had passed, and never waited on the poller
+        self.assertEqual([1], smc.deployment_operations.consumed)
+        self.assertFalse(poller.wait.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
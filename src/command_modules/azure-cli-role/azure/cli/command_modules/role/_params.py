@@ -58,6 +58,8 @@ register_cli_argument('role assignment', 'show_all', options_list=('--all',), ac
 register_cli_argument('role assignment', 'include_inherited', action='store_true',
                       help='include assignments applied on parent scopes')
 register_cli_argument('role assignment', 'assignee', help='represent a user, group, or service principal. supported format: object id, user sign-in name, or service principal name')
+register_cli_argument('role assignment list', 'assignee', nargs='+', help='space separated users, groups, or service principals. supported format: object id, user sign-in name, or service principal name')
+register_cli_argument('role assignment delete', 'assignee', nargs='+', help='space separated users, groups, or service principals. supported format: object id, user sign-in name, or service principal name')
 register_cli_argument('role assignment', 'ids', nargs='+', help='space separated role assignment ids')
 register_cli_argument('role definition', 'role_definition_id', options_list=('--name', '-n'), help='the role definition name')
 register_cli_argument('role', 'resource_group_name', options_list=('--resource-group', '-g'),
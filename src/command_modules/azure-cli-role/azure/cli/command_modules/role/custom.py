@@ -6,11 +6,14 @@ import datetime
 import json
 import re
 import os
+import time
 import uuid
 from dateutil.relativedelta import relativedelta
 import dateutil.parser
+from six import string_types
 
-from azure.cli.core._util import CLIError, todict, get_file_json
+from azure.cli.core._util import CLIError, todict, get_file_json, retry_with_backoff
+from azure.cli.core._session import SESSION
 import azure.cli.core.azlogging as azlogging
 
 from azure.mgmt.authorization.models import (RoleAssignmentProperties, Permission, RoleDefinition,
@@ -30,6 +33,65 @@ logger = azlogging.get_az_logger(__name__)
 
 _CUSTOM_RULE = 'CustomRole'
 
+_ROLE_CACHE_KEY = 'roleCache'
+_PRINCIPAL_CACHE_TTL = 900
+_ROLE_DEFINITION_CACHE_TTL = 3600
+# AAD Graph limits the number of 'or' clauses in a single filter
+_GRAPH_FILTER_BATCH_SIZE = 15
+_GRAPH_OBJECT_IDS_BATCH_SIZE = 1000
+_MAX_WORKERS = 20
+
+class _RoleCache(object):
+    '''Principal and role definition lookups cached per tenant in the CLI session file, so
+    repeated role assignment commands don't repeat the same Graph and ARM queries.
+    '''
+    OBJECT_IDS = 'objectIds'
+    PRINCIPAL_NAMES = 'principalNames'
+    ROLE_DEFINITIONS = 'roleDefinitions'
+    ROLE_IDS = 'roleIds'
+
+    def __init__(self, tenant_id):
+        self.entries = SESSION[_ROLE_CACHE_KEY].setdefault(tenant_id, {})
+        self.dirty = False
+
+    def get(self, kind, key):
+        entry = self.entries.get(kind, {}).get(key)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        return None
+
+    def set(self, kind, key, value, ttl):
+        self.entries.setdefault(kind, {})[key] = [value, time.time() + ttl]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        now = time.time()
+        for kind in self.entries.values():
+            for key in [k for k, entry in kind.items() if entry[1] <= now]:
+                del kind[key]
+        SESSION.save_with_retry()
+        self.dirty = False
+
+def _get_tenant_id(subscription_id):
+    from azure.cli.core._profile import Profile
+    return Profile().get_subscription(subscription_id)['tenantId']
+
+def _chunks(items, size):
+    items = list(items)
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+def _run_concurrently(func, items):
+    '''Call func for every item on a bounded thread pool, preserving order.'''
+    items = list(items)
+    if len(items) < 2:
+        return [func(i) for i in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(len(items), _MAX_WORKERS)) as executor:
+        return list(executor.map(func, items))
+
 def list_role_definitions(name=None, resource_group_name=None, scope=None,
                           custom_role_only=False):
     definitions_client = _auth_client_factory(scope).role_definitions
@@ -118,6 +180,7 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,#py
     member(transitively). Supported only for a user principal.
     '''
     graph_client = _graph_client_factory()
+    cache = _RoleCache(graph_client.config.tenant_id)
     factory = _auth_client_factory(scope)
     assignments_client = factory.role_assignments
     definitions_client = factory.role_definitions
@@ -133,9 +196,11 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,#py
 
     assignments = _search_role_assignments(assignments_client, definitions_client,
                                            scope, assignee, role,
-                                           include_inherited, include_groups)
+                                           include_inherited, include_groups,
+                                           graph_client=graph_client, cache=cache)
 
     if not assignments:
+        cache.save()
         return []
 
     #fill in logic names to get things understandable.
@@ -145,22 +210,47 @@ def list_role_assignments(assignee=None, role=None, resource_group_name=None,#py
 
     #pylint: disable=line-too-long
     #fill in role names
-    role_defs = list(definitions_client.list(
-        scope=scope or ('/subscriptions/' + definitions_client.config.subscription_id)))
-    role_dics = {i.id: i.properties.role_name for i in role_defs}
+    role_dics = _get_role_definition_names(
+        definitions_client, scope or ('/subscriptions/' + definitions_client.config.subscription_id),
+        set(i['properties']['roleDefinitionId'] for i in results), cache)
     for i in results:
         i['properties']['roleDefinitionName'] = role_dics.get(i['properties']['roleDefinitionId'], None)
 
     #fill in principal names
     principal_ids = set(i['properties']['principalId'] for i in results)
     if principal_ids:
-        principals = _get_object_stubs(graph_client, principal_ids)
-        principal_dics = {i.object_id:_get_displayable_name(i) for i in principals}
+        principal_dics = _get_principal_names(graph_client, principal_ids, cache)
         for i in results:
             i['properties']['principalName'] = principal_dics.get(i['properties']['principalId'], None)
 
+    cache.save()
     return results
 
+def _get_role_definition_names(definitions_client, scope, role_definition_ids, cache):
+    role_dics = cache.get(_RoleCache.ROLE_DEFINITIONS, scope)
+    if role_dics is None or not role_definition_ids.issubset(role_dics):
+        role_defs = list(definitions_client.list(scope=scope))
+        role_dics = {i.id: i.properties.role_name for i in role_defs}
+        cache.set(_RoleCache.ROLE_DEFINITIONS, scope, role_dics, _ROLE_DEFINITION_CACHE_TTL)
+    return role_dics
+
+def _get_principal_names(graph_client, principal_ids, cache):
+    principal_dics = {}
+    missing = []
+    for object_id in principal_ids:
+        name = cache.get(_RoleCache.PRINCIPAL_NAMES, object_id)
+        if name is None:
+            missing.append(object_id)
+        else:
+            principal_dics[object_id] = name
+    if missing:
+        for principal in _get_object_stubs(graph_client, missing):
+            name = _get_displayable_name(principal)
+            principal_dics[principal.object_id] = name
+            cache.set(_RoleCache.PRINCIPAL_NAMES, principal.object_id, name,
+                      _PRINCIPAL_CACHE_TTL)
+    return principal_dics
+
 def _get_displayable_name(graph_object):
     if graph_object.user_principal_name:
         return graph_object.user_principal_name
@@ -178,8 +268,7 @@ def delete_role_assignments(ids=None, assignee=None, role=None, #pylint: disable
     if ids:
         if assignee or role or resource_group_name or scope or include_inherited:
             raise CLIError('When assignment ids are used, other parameter values are not required')
-        for i in ids:
-            assignments_client.delete_by_id(i)
+        _run_concurrently(assignments_client.delete_by_id, ids)
         return
 
     scope = _build_role_scope(resource_group_name, scope,
@@ -189,24 +278,34 @@ def delete_role_assignments(ids=None, assignee=None, role=None, #pylint: disable
                                            include_groups=False)
 
     if assignments:
-        for a in assignments:
-            assignments_client.delete_by_id(a.id)
+        _run_concurrently(assignments_client.delete_by_id, [a.id for a in assignments])
     else:
         raise CLIError('No matched assignments were found to delete')
 
 def _search_role_assignments(assignments_client, definitions_client,#pylint: disable=too-many-arguments
-                             scope, assignee, role, include_inherited, include_groups):
-    assignee_object_id = None
+                             scope, assignee, role, include_inherited, include_groups,
+                             graph_client=None, cache=None):
+    assignee_object_ids = None
     if assignee:
-        assignee_object_id = _resolve_object_id(assignee)
+        assignees = [assignee] if isinstance(assignee, string_types) else assignee
+        resolved = _resolve_object_ids(assignees, graph_client, cache)
+        assignee_object_ids = [resolved[a] for a in assignees]
 
     #combining filters is unsupported, so we pick the best, and do limited maunal filtering
-    if assignee_object_id:
-        if include_groups:
-            f = "assignedTo('{}')".format(assignee_object_id)
-        else:
-            f = "principalId eq '{}'".format(assignee_object_id)
-        assignments = list(assignments_client.list(filter=f))
+    if assignee_object_ids:
+        def _list_for_principal(object_id):
+            if include_groups:
+                f = "assignedTo('{}')".format(object_id)
+            else:
+                f = "principalId eq '{}'".format(object_id)
+            return list(assignments_client.list(filter=f))
+        assignments = []
+        seen = set()
+        for found in _run_concurrently(_list_for_principal, assignee_object_ids):
+            for a in found:
+                if a.id not in seen:
+                    seen.add(a.id)
+                    assignments.append(a)
     elif scope:
         assignments = list(assignments_client.list_for_scope(scope=scope, filter='atScope()'))
     else:
@@ -245,6 +344,11 @@ def _resolve_role_id(role, scope, definitions_client):
     except ValueError:
         pass
     if not role_id: #retrieve role id
+        cache = _RoleCache(_get_tenant_id(definitions_client.config.subscription_id))
+        cache_key = '{}/{}'.format(scope, role.lower())
+        role_id = cache.get(_RoleCache.ROLE_IDS, cache_key)
+        if role_id:
+            return role_id
         role_defs = list(definitions_client.list(scope, "roleName eq '{}'".format(role)))
         if not role_defs:
             raise CLIError("Role '{}' doesn't exist.".format(role))
@@ -253,6 +357,8 @@ def _resolve_role_id(role, scope, definitions_client):
             err = "More than one role matches the given name '{}'. Please pick a value from '{}'"
             raise CLIError(err.format(role, ids))
         role_id = role_defs[0].id
+        cache.set(_RoleCache.ROLE_IDS, cache_key, role_id, _ROLE_DEFINITION_CACHE_TTL)
+        cache.save()
     return role_id
 
 def list_apps(client, app_id=None, display_name=None, identifier_uri=None, query_filter=None):
@@ -445,7 +551,6 @@ def create_service_principal_for_rbac(name=None, password=None, years=1, #pylint
            Defaults to the root of the current subscription.
     :param str role: role the service principal has on the resources.
     '''
-    import time
     graph_client = _graph_client_factory()
     role_client = _auth_client_factory().role_assignments
     scopes = scopes or ['/subscriptions/' + role_client.config.subscription_id]
@@ -484,40 +589,33 @@ def create_service_principal_for_rbac(name=None, password=None, years=1, #pylint
     #pylint: disable=no-member
     app_id = aad_application.app_id
     #retry till server replication is done
-    for l in range(0, _RETRY_TIMES):
-        try:
-            aad_sp = _create_service_principal(app_id, resolve_app=False)
-            break
-        except Exception as ex: #pylint: disable=broad-except
-            #pylint: disable=line-too-long
-            if l < _RETRY_TIMES and 'The appId of the service principal does not reference a valid application object' in str(ex):
-                time.sleep(5)
-                logger.warning('Retrying service principal creation: %s/%s', l+1, _RETRY_TIMES)
-            else:
-                logger.warning("Creating service principal failed for appid '%s'. Trace followed:\n%s",
-                               name, ex.response.headers if hasattr(ex, 'response') else ex) #pylint: disable=no-member
-                raise
+    try:
+        #pylint: disable=line-too-long
+        aad_sp = retry_with_backoff(lambda: _create_service_principal(app_id, resolve_app=False),
+                                    lambda ex: 'The appId of the service principal does not reference a valid application object' in str(ex),
+                                    _RETRY_TIMES, delay=1, max_delay=5,
+                                    on_retry=lambda l, _: logger.warning('Retrying service principal creation: %s/%s', l, _RETRY_TIMES))
+    except Exception as ex: #pylint: disable=broad-except
+        logger.warning("Creating service principal failed for appid '%s'. Trace followed:\n%s",
+                       name, ex.response.headers if hasattr(ex, 'response') else ex) #pylint: disable=no-member
+        raise
     sp_oid = aad_sp.object_id
 
     #retry while server replication is done
     if not skip_assignment:
         # pylint: disable=line-too-long
         for scope in scopes:
-            for l in range(0, _RETRY_TIMES):
-                try:
-                    _create_role_assignment(role, sp_oid, None, scope, resolve_assignee=False)
-                    break
-                except Exception as ex:
-                    if l < _RETRY_TIMES and ' does not exist in the directory ' in str(ex):
-                        time.sleep(5)
-                        logger.warning('Retrying role assignment creation: %s/%s', l+1, _RETRY_TIMES)
-                        continue
-                    else:
-                        #dump out history for diagnoses
-                        logger.warning('Role assignment creation failed.\n')
-                        if getattr(ex, 'response', None) is not None:
-                            logger.warning('role assignment response headers: %s\n', ex.response.headers) #pylint: disable=no-member
-                    raise
+            try:
+                retry_with_backoff(lambda scope=scope: _create_role_assignment(role, sp_oid, None, scope, resolve_assignee=False),
+                                   lambda ex: ' does not exist in the directory ' in str(ex),
+                                   _RETRY_TIMES, delay=1, max_delay=5,
+                                   on_retry=lambda l, _: logger.warning('Retrying role assignment creation: %s/%s', l, _RETRY_TIMES))
+            except Exception as ex:
+                #dump out history for diagnoses
+                logger.warning('Role assignment creation failed.\n')
+                if getattr(ex, 'response', None) is not None:
+                    logger.warning('role assignment response headers: %s\n', ex.response.headers) #pylint: disable=no-member
+                raise
 
     if expanded_view:
         from azure.cli.core._profile import Profile
@@ -572,26 +670,71 @@ def reset_service_principal_credential(name, password=None, years=1):
         }
 
 def _resolve_object_id(assignee):
-    client = _graph_client_factory()
-    result = None
-    if assignee.find('@') >= 0: #looks like a user principal name
-        result = list(client.users.list(filter="userPrincipalName eq '{}'".format(assignee)))
-    if not result:
-        result = list(client.service_principals.list(
-            filter="servicePrincipalNames/any(c:c eq '{}')".format(assignee)))
-    if not result: #assume an object id, let us verify it
-        from azure.graphrbac.models import GetObjectsParameters
-        result = _get_object_stubs(client, [assignee])
+    return _resolve_object_ids([assignee])[assignee]
 
-    #2+ matches should never happen, so we only check 'no match' here
-    if not result:
-        raise CLIError("No matches in graph database for '{}'".format(assignee))
+def _resolve_object_ids(assignees, client=None, cache=None):
+    '''Resolve user principal names, service principal names and object ids to object ids,
+    batching the Graph queries for all of the assignees.
+    '''
+    client = client or _graph_client_factory()
+    own_cache = cache is None
+    cache = cache or _RoleCache(client.config.tenant_id)
+    result = {}
+    for assignee in assignees:
+        object_id = cache.get(_RoleCache.OBJECT_IDS, assignee)
+        if object_id:
+            result[assignee] = object_id
+
+    def _pending():
+        return [a for a in assignees if a not in result]
+
+    def _match(candidates, names, object_id):
+        names = [n.lower() for n in names if n]
+        for assignee in candidates:
+            if assignee.lower() in names:
+                result[assignee] = object_id
+
+    #looks like a user principal name
+    for chunk in _chunks([a for a in _pending() if a.find('@') >= 0], _GRAPH_FILTER_BATCH_SIZE):
+        f = ' or '.join("userPrincipalName eq '{}'".format(a) for a in chunk)
+        for user in client.users.list(filter=f):
+            _match(chunk, [user.user_principal_name], user.object_id)
+
+    for chunk in _chunks(_pending(), _GRAPH_FILTER_BATCH_SIZE):
+        f = 'servicePrincipalNames/any(c:{})'.format(
+            ' or '.join("c eq '{}'".format(a) for a in chunk))
+        for sp in client.service_principals.list(filter=f):
+            _match(chunk, sp.service_principal_names or [], sp.object_id)
+
+    #assume an object id, let us verify it
+    candidates = []
+    for assignee in _pending():
+        try:
+            uuid.UUID(assignee)
+            candidates.append(assignee)
+        except ValueError:
+            pass
+    if candidates:
+        for stub in _get_object_stubs(client, candidates):
+            _match(candidates, [stub.object_id], stub.object_id)
 
-    return result[0].object_id
+    #2+ matches should never happen, so we only check 'no match' here
+    missing = _pending()
+    if missing:
+        raise CLIError("No matches in graph database for '{}'".format("', '".join(missing)))
+
+    for assignee in assignees:
+        cache.set(_RoleCache.OBJECT_IDS, assignee, result[assignee], _PRINCIPAL_CACHE_TTL)
+    if own_cache:
+        cache.save()
+    return result
 
 def _get_object_stubs(graph_client, assignees):
     from azure.graphrbac.models import GetObjectsParameters
-    params = GetObjectsParameters(include_directory_object_references=True,
-                                  object_ids=assignees)
-    return list(graph_client.objects.get_objects_by_object_ids(params))
+    result = []
+    for chunk in _chunks(assignees, _GRAPH_OBJECT_IDS_BATCH_SIZE):
+        params = GetObjectsParameters(include_directory_object_references=True,
+                                      object_ids=chunk)
+        result.extend(graph_client.objects.get_objects_by_object_ids(params))
+    return result
 
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+
+from azure.cli.core._session import SESSION
+from azure.cli.core._util import CLIError
+from azure.cli.command_modules.role.custom import (_RoleCache, _resolve_object_ids,
+                                                   _get_principal_names)
+
+USER_ID = '11111111-1111-1111-1111-111111111111'
+SP_ID = '22222222-2222-2222-2222-222222222222'
+GROUP_ID = '33333333-3333-3333-3333-333333333333'
+
+
+def _graph_object(object_id, upn=None, spns=None):
+    obj = mock.MagicMock()
+    obj.object_id = object_id
+    obj.user_principal_name = upn
+    obj.service_principal_names = spns
+    return obj
+
+
+def _graph_client():
+    client = mock.MagicMock()
+    client.config.tenant_id = 'tenant'
+    client.users.list.return_value = [_graph_object(USER_ID, upn='John@contoso.com')]
+    client.service_principals.list.return_value = [
+        _graph_object(SP_ID, spns=['http://app', 'app-id'])]
+    client.objects.get_objects_by_object_ids.return_value = [_graph_object(GROUP_ID)]
+    return client
+
+
+class TestRoleAssignmentResolution(unittest.TestCase):
+
+    def setUp(self):
+        SESSION.data.pop('roleCache', None)
+
+    def test_resolve_object_ids_batches_graph_queries(self):
+        client = _graph_client()
+        result = _resolve_object_ids(['john@contoso.com', 'http://app', GROUP_ID], client)
+
+        self.assertEqual({'john@contoso.com': USER_ID, 'http://app': SP_ID, GROUP_ID: GROUP_ID},
+                         result)
+        client.users.list.assert_called_once_with(
+            filter="userPrincipalName eq 'john@contoso.com'")
+        client.service_principals.list.assert_called_once_with(
+            filter="servicePrincipalNames/any(c:c eq 'http://app' or c eq '{}')".format(GROUP_ID))
+        self.assertEqual(1, client.objects.get_objects_by_object_ids.call_count)
+
+    def test_resolve_object_ids_uses_tenant_cache(self):
+        _resolve_object_ids(['john@contoso.com'], _graph_client())
+
+        client = _graph_client()
+        result = _resolve_object_ids(['john@contoso.com'], client)
+        self.assertEqual(USER_ID, result['john@contoso.com'])
+        self.assertFalse(client.users.list.called)
+
+        client.config.tenant_id = 'other tenant'
+        _resolve_object_ids(['john@contoso.com'], client)
+        self.assertTrue(client.users.list.called)
+
+    def test_resolve_object_ids_reports_missing_assignees(self):
+        client = _graph_client()
+        client.service_principals.list.return_value = []
+        with self.assertRaises(CLIError) as context:
+            _resolve_object_ids(['nobody', 'http://app'], client)
+        self.assertIn("'nobody', 'http://app'", str(context.exception))
+
+    def test_principal_names_only_fetch_uncached_objects(self):
+        client = _graph_client()
+        client.objects.get_objects_by_object_ids.return_value = [
+            _graph_object(USER_ID, upn='john@contoso.com')]
+        cache = _RoleCache('tenant')
+        cache.set(_RoleCache.PRINCIPAL_NAMES, SP_ID, 'http://app', 60)
+
+        names = _get_principal_names(client, [USER_ID, SP_ID], cache)
+
+        self.assertEqual({USER_ID: 'john@contoso.com', SP_ID: 'http://app'}, names)
+        params = client.objects.get_objects_by_object_ids.call_args[0][0]
+        self.assertEqual([USER_ID], params.object_ids)
+
+    def test_expired_entries_are_ignored(self):
+        cache = _RoleCache('tenant')
+        cache.set(_RoleCache.OBJECT_IDS, 'someone', USER_ID, -1)
+        self.assertIsNone(cache.get(_RoleCache.OBJECT_IDS, 'someone'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,44 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import threading
+
+# the credentials shared by the lookups of the thread, if it is one of several making them at once
+_shared_credentials = threading.local()
+
+
+def get_shared_credentials():
+    """ Credentials for clients used from several threads at once. The token is acquired, and
+    refreshed if it has expired, here, once: threads refreshing it each with credentials of their
+    own would rewrite the token cache file at the same time. """
+    from azure.cli.core._profile import Profile
+    from azure.cli.core.adal_authentication import AdalAuthentication
+    cred, subscription_id, _ = Profile().get_login_credentials()
+    token = cred._token_retriever()  # pylint: disable=protected-access
+    return AdalAuthentication(lambda: token), subscription_id
+
+
+def run_with_shared_credentials(credentials, func, *args):
+    _shared_credentials.value = credentials
+    try:
+        return func(*args)
+    finally:
+        _shared_credentials.value = None
+
+
+def get_mgmt_client(client_type):
+    """ A management client with the credentials shared by the thread, if any, or else its own """
+    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    credentials = getattr(_shared_credentials, 'value', None)
+    if credentials is None:
+        return get_mgmt_service_client(client_type)
+    from azure.cli.core._profile import CLOUD
+    from azure.cli.core.commands.client_factory import configure_common_settings
+    cred, subscription_id = credentials
+    client = client_type(cred, subscription_id, base_url=CLOUD.endpoints.resource_manager)
+    configure_common_settings(client)
+    return client
+
 
 def _compute_client_factory(**_):
     from azure.mgmt.compute import ComputeManagementClient
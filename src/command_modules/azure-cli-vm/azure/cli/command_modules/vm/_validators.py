@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+from contextlib import contextmanager
 import os
 import re
 
@@ -11,13 +12,16 @@ from msrestazure.azure_exceptions import CloudError
 from azure.cli.core.commands.arm import resource_id, parse_resource_id, is_valid_resource_id
 from azure.cli.core.commands.client_factory import get_subscription_id
 from azure.cli.core._util import CLIError, random_string
-from ._client_factory import _compute_client_factory
+from ._client_factory import (_compute_client_factory, get_mgmt_client, get_shared_credentials,
+                              run_with_shared_credentials)
 from azure.cli.command_modules.vm._vm_utils import check_existence
 from azure.cli.command_modules.vm._template_builder import StorageProfile
 import azure.cli.core.azlogging as azlogging
 
 logger = azlogging.get_az_logger(__name__)
 
+URN_PATTERN = '([^:]*):([^:]*):([^:]*):([^:]*)'
+
 
 def validate_nsg_name(namespace):
     namespace.network_security_group_name = namespace.network_security_group_name \
@@ -59,11 +63,117 @@ def validate_vm_nics(namespace):
 
 def validate_location(namespace):
     if not namespace.location:
-        from azure.mgmt.resource.resources import ResourceManagementClient
-        from azure.cli.core.commands.client_factory import get_mgmt_service_client
-        resource_client = get_mgmt_service_client(ResourceManagementClient)
-        rg = resource_client.resource_groups.get(namespace.resource_group_name)
-        namespace.location = rg.location  # pylint: disable=no-member
+        namespace.location = _lookup(_get_resource_group_location, namespace.resource_group_name)
+
+
+# region VM Create Lookups
+
+class _Prefetch(object):  # pylint: disable=too-few-public-methods
+    """ The lookups of the create validators, started concurrently before those run. A lookup is
+    keyed by its function and arguments; one that wasn't started is made when it is asked for. """
+
+    def __init__(self, futures):
+        self.futures = futures
+
+    def lookup(self, func, *args):
+        future = self.futures.get((func,) + args)
+        return future.result() if future else func(*args)
+
+
+_prefetch = None  # of the create command being validated
+
+
+def _lookup(func, *args):
+    return _prefetch.lookup(func, *args) if _prefetch else func(*args)
+
+
+def _get_resource_group_location(resource_group_name):
+    from azure.mgmt.resource.resources import ResourceManagementClient
+    resource_client = get_mgmt_client(ResourceManagementClient)
+    rg = resource_client.resource_groups.get(resource_group_name)
+    return rg.location  # pylint: disable=no-member
+
+
+def _get_image(resource_group_name, image_name):
+    from azure.mgmt.compute import ComputeManagementClient
+    return get_mgmt_client(ComputeManagementClient).images.get(resource_group_name, image_name)
+
+
+def _list_storage_accounts(resource_group_name):
+    from azure.mgmt.storage import StorageManagementClient
+    storage_client = get_mgmt_client(StorageManagementClient).storage_accounts
+    return list(storage_client.list_by_resource_group(resource_group_name))
+
+
+def _list_vnets(resource_group_name):
+    from azure.mgmt.network import NetworkManagementClient
+    client = get_mgmt_client(NetworkManagementClient).virtual_networks
+    return list(client.list(resource_group_name))
+
+
+def _get_vm_create_lookups(namespace, for_scale_set=False):
+    """ The lookups the create validators will make, as far as the arguments tell before they are
+    validated. None depends on another, so all of them can be made at once. """
+    from azure.cli.command_modules.vm._actions import load_images_from_aliases_doc
+    rg = namespace.resource_group_name
+    lookups = []
+    if not namespace.location:
+        lookups.append((_get_resource_group_location, rg))
+
+    image = namespace.image or ''
+    if is_valid_resource_id(image):
+        res = parse_resource_id(image)
+        lookups.append((_get_image, res['resource_group'], res['name']))
+    elif image and not re.match(URN_PATTERN, image) and not image.lower().endswith('.vhd'):
+        # an alias, or else the name of a custom image, which is looked up only if it isn't one
+        lookups.append((load_images_from_aliases_doc,))
+
+    if not for_scale_set and namespace.use_unmanaged_disk:
+        if namespace.storage_account:
+            storage_id = parse_resource_id(namespace.storage_account)
+            lookups.append((check_existence, storage_id['name'],
+                            storage_id.get('resource_group', rg),
+                            'Microsoft.Storage', 'storageAccounts'))
+        else:
+            lookups.append((_list_storage_accounts, rg))
+
+    if getattr(namespace, 'availability_set', None):
+        as_id = parse_resource_id(namespace.availability_set)
+        lookups.append((check_existence, as_id['name'], as_id.get('resource_group', rg),
+                        'Microsoft.Compute', 'availabilitySets'))
+
+    if namespace.subnet:
+        lookups.append((check_existence, namespace.subnet, rg, 'Microsoft.Network', 'subnets',
+                        namespace.vnet_name, 'virtualNetworks'))
+    elif not namespace.vnet_name and not getattr(namespace, 'nics', None):
+        lookups.append((_list_vnets, rg))
+
+    for arg, resource_type in (('nsg', 'networkSecurityGroups'),
+                               ('public_ip_address', 'publicIPAddresses'),
+                               ('load_balancer', 'loadBalancers')):
+        if getattr(namespace, arg, None):
+            lookups.append((check_existence, getattr(namespace, arg), rg,
+                            'Microsoft.Network', resource_type))
+    return lookups
+
+
+@contextmanager
+def _prefetched_lookups(namespace, for_scale_set=False):
+    from concurrent.futures import ThreadPoolExecutor
+    global _prefetch  # pylint: disable=global-statement
+    lookups = _get_vm_create_lookups(namespace, for_scale_set)
+    credentials = get_shared_credentials() if lookups else None
+    executor = ThreadPoolExecutor(max_workers=max(len(lookups), 1))
+    _prefetch = _Prefetch(dict((l, executor.submit(run_with_shared_credentials, credentials, *l))
+                               for l in lookups))
+    try:
+        yield
+    finally:
+        _prefetch = None
+        # lookups the arguments turned out not to need are left to finish on their own
+        executor.shutdown(wait=False)
+
+# endregion
 
 
 # region VM Create Validators
@@ -113,7 +223,7 @@ def _validate_vm_create_storage_profile(namespace, for_scale_set=False):  # pyli
                            " Please either remove it or turn on '--use-unmanaged-disk'")
 
     # attempt to parse an URN
-    urn_match = re.match('([^:]*):([^:]*):([^:]*):([^:]*)', image)
+    urn_match = re.match(URN_PATTERN, image)
     if urn_match:
         namespace.os_publisher = urn_match.group(1)
         namespace.os_offer = urn_match.group(2)
@@ -139,7 +249,7 @@ def _validate_vm_create_storage_profile(namespace, for_scale_set=False):  # pyli
             name=name)
         namespace.storage_profile = StorageProfile.ManagedSpecializedOSDisk
     else:
-        images = load_images_from_aliases_doc()
+        images = _lookup(load_images_from_aliases_doc)
         matched = next((x for x in images if x['urnAlias'].lower() == image.lower()), None)
         if matched:
             namespace.os_publisher = matched['publisher']
@@ -151,9 +261,8 @@ def _validate_vm_create_storage_profile(namespace, for_scale_set=False):  # pyli
                                          else StorageProfile.ManagedPirImage)
         else:
             # last try: is it a custom image name?
-            compute_client = _compute_client_factory()
             try:
-                compute_client.images.get(namespace.resource_group_name, image)
+                _lookup(_get_image, namespace.resource_group_name, image)
                 image = namespace.image = _get_resource_id(image, namespace.resource_group_name,
                                                            'images', 'Microsoft.Compute')
                 namespace.storage_profile = StorageProfile.ManagedCustomImage
@@ -163,8 +272,7 @@ def _validate_vm_create_storage_profile(namespace, for_scale_set=False):  # pyli
 
     if namespace.storage_profile == StorageProfile.ManagedCustomImage:
         res = parse_resource_id(image)
-        compute_client = _compute_client_factory()
-        image_info = compute_client.images.get(res['resource_group'], res['name'])
+        image_info = _lookup(_get_image, res['resource_group'], res['name'])
         # pylint: disable=no-member
         namespace.os_type = image_info.storage_profile.os_disk.os_type.value
         namespace.image_data_disks = image_info.storage_profile.data_disks
@@ -178,21 +286,18 @@ def _validate_vm_create_storage_account(namespace):
     if namespace.storage_account:
         storage_id = parse_resource_id(namespace.storage_account)
         rg = storage_id.get('resource_group', namespace.resource_group_name)
-        if check_existence(storage_id['name'], rg, 'Microsoft.Storage', 'storageAccounts'):
+        if _lookup(check_existence, storage_id['name'], rg, 'Microsoft.Storage',
+                   'storageAccounts'):
             # 1 - existing storage account specified
             namespace.storage_account_type = 'existing'
         else:
             # 2 - params for new storage account specified
             namespace.storage_account_type = 'new'
     else:
-        from azure.mgmt.storage import StorageManagementClient
-        from azure.cli.core.commands.client_factory import get_mgmt_service_client
-        storage_client = get_mgmt_service_client(StorageManagementClient).storage_accounts
-
         # find storage account in target resource group that matches the VM's location
         sku_tier = 'Premium' if 'Premium' in namespace.storage_sku else 'Standard'
         account = next(
-            (a for a in storage_client.list_by_resource_group(namespace.resource_group_name)
+            (a for a in _lookup(_list_storage_accounts, namespace.resource_group_name)
              if a.sku.tier.value == sku_tier and a.location == namespace.location), None)
 
         if account:
@@ -211,7 +316,7 @@ def _validate_vm_create_availability_set(namespace):
         name = as_id['name']
         rg = as_id.get('resource_group', namespace.resource_group_name)
 
-        if not check_existence(name, rg, 'Microsoft.Compute', 'availabilitySets'):
+        if not _lookup(check_existence, name, rg, 'Microsoft.Compute', 'availabilitySets'):
             raise CLIError("Availability set '{}' does not exist.".format(name))
 
         namespace.availability_set = resource_id(
@@ -232,12 +337,9 @@ def _validate_vm_create_vnet(namespace, for_scale_set=False):
 
     if not vnet and not subnet and not nics:  # pylint: disable=too-many-nested-blocks
         # if nothing specified, try to find an existing vnet and subnet in the target resource group
-        from azure.mgmt.network import NetworkManagementClient
-        from azure.cli.core.commands.client_factory import get_mgmt_service_client
-        client = get_mgmt_service_client(NetworkManagementClient).virtual_networks
-
         # find VNET in target resource group that matches the VM's location with a matching subnet
-        for vnet_match in (v for v in client.list(rg) if v.location == location and v.subnets):
+        for vnet_match in (v for v in _lookup(_list_vnets, rg)
+                           if v.location == location and v.subnets):
 
             # 1 - find a suitable existing vnet/subnet
             result = None
@@ -264,8 +366,8 @@ def _validate_vm_create_vnet(namespace, for_scale_set=False):
             raise CLIError("incorrect '--subnet' usage: --subnet SUBNET_ID | "
                            "--subnet SUBNET_NAME --vnet-name VNET_NAME")
 
-        subnet_exists = \
-            check_existence(subnet, rg, 'Microsoft.Network', 'subnets', vnet, 'virtualNetworks')
+        subnet_exists = _lookup(check_existence, subnet, rg, 'Microsoft.Network', 'subnets', vnet,
+                                'virtualNetworks')
 
         if subnet_is_id and not subnet_exists:
             raise CLIError("Subnet '{}' does not exist.".format(subnet))
@@ -300,8 +402,8 @@ def _validate_vmss_create_subnet(namespace):
 def _validate_vm_create_nsg(namespace):
 
     if namespace.nsg:
-        if check_existence(namespace.nsg, namespace.resource_group_name,
-                           'Microsoft.Network', 'networkSecurityGroups'):
+        if _lookup(check_existence, namespace.nsg, namespace.resource_group_name,
+                   'Microsoft.Network', 'networkSecurityGroups'):
             namespace.nsg_type = 'existing'
         else:
             namespace.nsg_type = 'new'
@@ -313,8 +415,8 @@ def _validate_vm_create_nsg(namespace):
 
 def _validate_vm_create_public_ip(namespace):
     if namespace.public_ip_address:
-        if check_existence(namespace.public_ip_address, namespace.resource_group_name,
-                           'Microsoft.Network', 'publicIPAddresses'):
+        if _lookup(check_existence, namespace.public_ip_address, namespace.resource_group_name,
+                   'Microsoft.Network', 'publicIPAddresses'):
             namespace.public_ip_type = 'existing'
         else:
             namespace.public_ip_type = 'new'
@@ -481,17 +583,18 @@ def _is_valid_ssh_rsa_public_key(openssh_pubkey):
 
 
 def process_vm_create_namespace(namespace):
-    validate_location(namespace)
-    _validate_vm_create_storage_profile(namespace)
-    if namespace.storage_profile in [StorageProfile.SACustomImage,
-                                     StorageProfile.SAPirImage]:
-        _validate_vm_create_storage_account(namespace)
-
-    _validate_vm_create_availability_set(namespace)
-    _validate_vm_create_vnet(namespace)
-    _validate_vm_create_nsg(namespace)
-    _validate_vm_create_public_ip(namespace)
-    _validate_vm_create_nics(namespace)
+    with _prefetched_lookups(namespace):
+        validate_location(namespace)
+        _validate_vm_create_storage_profile(namespace)
+        if namespace.storage_profile in [StorageProfile.SACustomImage,
+                                         StorageProfile.SAPirImage]:
+            _validate_vm_create_storage_account(namespace)
+
+        _validate_vm_create_availability_set(namespace)
+        _validate_vm_create_vnet(namespace)
+        _validate_vm_create_nsg(namespace)
+        _validate_vm_create_public_ip(namespace)
+        _validate_vm_create_nics(namespace)
     _validate_vm_create_auth(namespace)
 
 
@@ -514,8 +617,8 @@ def _validate_vmss_create_load_balancer(namespace):
         namespace.load_balancer = ''
 
     if namespace.load_balancer:
-        if check_existence(namespace.load_balancer, namespace.resource_group_name,
-                           'Microsoft.Network', 'loadBalancers'):
+        if _lookup(check_existence, namespace.load_balancer, namespace.resource_group_name,
+                   'Microsoft.Network', 'loadBalancers'):
             namespace.load_balancer_type = 'existing'
         else:
             namespace.load_balancer_type = 'new'
@@ -526,12 +629,13 @@ def _validate_vmss_create_load_balancer(namespace):
 
 
 def process_vmss_create_namespace(namespace):
-    validate_location(namespace)
-    _validate_vm_create_storage_profile(namespace, for_scale_set=True)
-    _validate_vmss_create_load_balancer(namespace)
-    _validate_vm_create_vnet(namespace, for_scale_set=True)
-    _validate_vmss_create_subnet(namespace)
-    _validate_vmss_create_public_ip(namespace)
+    with _prefetched_lookups(namespace, for_scale_set=True):
+        validate_location(namespace)
+        _validate_vm_create_storage_profile(namespace, for_scale_set=True)
+        _validate_vmss_create_load_balancer(namespace)
+        _validate_vm_create_vnet(namespace, for_scale_set=True)
+        _validate_vmss_create_subnet(namespace)
+        _validate_vmss_create_public_ip(namespace)
     _validate_vm_create_auth(namespace)
 
 # endregion
@@ -26,8 +26,8 @@ def load_json(string_or_file_path):
 
 def _resolve_api_version(provider_namespace, resource_type, parent_path):
     from azure.mgmt.resource.resources import ResourceManagementClient
-    from azure.cli.core.commands.client_factory import get_mgmt_service_client
-    client = get_mgmt_service_client(ResourceManagementClient)
+    from azure.cli.command_modules.vm._client_factory import get_mgmt_client
+    client = get_mgmt_client(ResourceManagementClient)
     provider = client.providers.get(provider_namespace)
 
     # If available, we will use parent resource's api-version
@@ -51,9 +51,9 @@ def check_existence(value, resource_group, provider_namespace, resource_type,
                     parent_name=None, parent_type=None):
     # check for name or ID and set the type flags
     from azure.mgmt.resource.resources import ResourceManagementClient
-    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    from azure.cli.command_modules.vm._client_factory import get_mgmt_client
     from msrestazure.azure_exceptions import CloudError
-    resource_client = get_mgmt_service_client(ResourceManagementClient).resources
+    resource_client = get_mgmt_client(ResourceManagementClient).resources
 
     id_parts = parse_resource_id(value)
 
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 import argparse
+import threading
 import unittest
 try:
     import unittest.mock as mock
@@ -14,10 +15,12 @@ from azure.mgmt.network import NetworkManagementClient
 from azure.mgmt.storage import StorageManagementClient
 from azure.mgmt.resource.resources import ResourceManagementClient
 
+from azure.cli.core._util import CLIError
 from azure.cli.command_modules.vm._validators import (_validate_vm_create_vnet,
                                                       _validate_vmss_create_subnet,
                                                       _validate_vm_create_storage_account,
-                                                      _validate_vm_create_auth)
+                                                      _validate_vm_create_auth,
+                                                      process_vm_create_namespace)
 
 # pylint: disable=method-hidden
 # pylint: disable=line-too-long
@@ -275,5 +278,125 @@ class TestVMDefaultAuthType(unittest.TestCase):
         self.assertTrue("incorrect usage for authentication-type 'password':" in str(context.exception))
 
 
+class TestVMCreatePrefetchedLookups(unittest.TestCase):
+
+    def setUp(self):
+        self.lookups = []
+        self.existing = set(['as1', 'nsg1'])
+        validators = 'azure.cli.command_modules.vm._validators.'
+        patches = [
+            mock.patch(validators + 'get_subscription_id', return_value='sub1'),
+            mock.patch(validators + 'get_shared_credentials',
+                       side_effect=self._record(lambda: ('creds', 'sub1'))),
+            mock.patch(validators + 'check_existence',
+                       side_effect=self._record(lambda name, *_: name in self.existing)),
+            mock.patch(validators + '_get_resource_group_location',
+                       side_effect=self._record(lambda _: 'westus')),
+            mock.patch(validators + '_list_vnets', side_effect=self._record(lambda _: [])),
+            mock.patch(validators + '_get_image', side_effect=self._record(self._missing_image)),
+            mock.patch('azure.cli.command_modules.vm._actions.load_images_from_aliases_doc',
+                       side_effect=self._record(lambda: [{
+                           'urnAlias': 'UbuntuLTS', 'publisher': 'Canonical',
+                           'offer': 'UbuntuServer', 'sku': '16.04-LTS', 'version': 'latest'}]))]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _record(self, func):
+        main_thread = threading.current_thread()
+
+        def _lookup(*args):
+            self.lookups.append((args, threading.current_thread() is main_thread))
+            return func(*args)
+        return _lookup
+
+    @staticmethod
+    def _missing_image(*_):
+        raise IOError('image not found')
+
+    @staticmethod
+    def _set_ns(**kwargs):
+        ns = argparse.Namespace(
+            resource_group_name='rg1', location=None, image='UbuntuLTS', managed_os_disk=None,
+            os_type=None, use_unmanaged_disk=False, storage_sku='Premium_LRS',
+            data_disk_sizes_gb=None, os_disk_name=None, storage_account=None,
+            availability_set='as1', vnet_name=None, subnet=None, nics=None, nsg='nsg1',
+            public_ip_address=None, authentication_type='password', admin_username='user12345',
+            admin_password='verySecret123', ssh_key_value=None, ssh_dest_key_path=None)
+        for name, value in kwargs.items():
+            setattr(ns, name, value)
+        return ns
+
+    def test_lookups_are_made_once_before_validation(self):
+        ns = self._set_ns()
+        process_vm_create_namespace(ns)
+        self.assertEqual('westus', ns.location)
+        self.assertEqual('Canonical', ns.os_publisher)
+        self.assertEqual('linux', ns.os_type)
+        self.assertEqual('/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/availabilitySets/as1', ns.availability_set)
+        self.assertEqual('new', ns.vnet_type)
+        self.assertEqual('existing', ns.nsg_type)
+        self.assertEqual('new', ns.public_ip_type)
+
+        # the credentials are acquired once, before the lookups; the image is an alias, so it
+        # isn't looked up as a custom image
+        self.assertEqual(((), True), self.lookups[0])
+        self.assertEqual(6, len(self.lookups))
+        self.assertFalse(any(in_main_thread for _, in_main_thread in self.lookups[1:]))
+
+    def test_custom_image_is_looked_up_when_not_an_alias(self):
+        image = mock.MagicMock()
+        image.storage_profile.os_disk.os_type.value = 'linux'
+        with mock.patch('azure.cli.command_modules.vm._validators._get_image',
+                        side_effect=self._record(lambda *_: image)):
+            ns = self._set_ns(image='MyImage')
+            process_vm_create_namespace(ns)
+        self.assertEqual('/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Compute/images/MyImage', ns.image)
+        self.assertEqual([True, True], [in_main_thread for args, in_main_thread in self.lookups
+                                        if args == ('rg1', 'MyImage')])
+
+    def test_lookups_depending_on_validation_are_made_when_asked_for(self):
+        ns = self._set_ns(image='Canonical:UbuntuServer:16.04-LTS:latest', nsg=None,
+                          availability_set=None, subnet='subnet1', vnet_name='vnet1',
+                          location='eastus')
+        process_vm_create_namespace(ns)
+        self.assertEqual('new', ns.vnet_type)
+        self.assertEqual([((), True),
+                          (('subnet1', 'rg1', 'Microsoft.Network', 'subnets', 'vnet1',
+                            'virtualNetworks'), False)], self.lookups)
+
+        self.lookups = []
+        _validate_vm_create_vnet(ns)
+        self.assertEqual([True], [in_main_thread for _, in_main_thread in self.lookups])
+
+    def test_failed_lookups_fail_validation(self):
+        self.existing.remove('as1')
+        with self.assertRaises(CLIError) as context:
+            process_vm_create_namespace(self._set_ns())
+        self.assertEqual("Availability set 'as1' does not exist.", str(context.exception))
+
+
+class TestSharedCredentials(unittest.TestCase):
+
+    @mock.patch('azure.cli.core.commands.client_factory.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.core.commands.client_factory.configure_common_settings', autospec=True)
+    def test_threads_make_clients_with_the_shared_credentials(self, _, get_client):
+        from concurrent.futures import ThreadPoolExecutor
+        from azure.cli.command_modules.vm._client_factory import (get_mgmt_client,
+                                                                  run_with_shared_credentials)
+        client_type = mock.MagicMock()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(
+                lambda _: run_with_shared_credentials(('creds', 'sub1'), get_mgmt_client,
+                                                      client_type), range(8)))
+        self.assertEqual(8, len(clients))
+        self.assertTrue(all(c[0][:2] == ('creds', 'sub1') for c in client_type.call_args_list))
+        self.assertFalse(get_client.called)
+
+        # without shared credentials, a client gets its own
+        get_mgmt_client(client_type)
+        get_client.assert_called_once_with(client_type)
+
+
 if __name__ == '__main__':
     unittest.main()